@@ -9,6 +9,7 @@ from datetime import time, timedelta
 from pydantic import AnyHttpUrl, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from encodapy.config.models import FileStorageMethod
+from encodapy.config.types import Interfaces, OverrunPolicies, QueuePolicies
 
 class BasicEnvVariables(BaseSettings):
     """
@@ -56,6 +57,126 @@ class BasicEnvVariables(BaseSettings):
     start_hold_time: Optional[float] = Field(
         default=0.0, description="Time in seconds to hold the start of the service"
     )
+    overrun_policy: OverrunPolicies = Field(
+        default=OverrunPolicies.COALESCE,
+        description=(
+            "Handling of missed ticks, if a cycle of the calculation or calibration takes "
+            "longer than the sampling time: 'skip' (wait for the next tick), 'immediate' "
+            "(run all missed ticks one after another) or 'coalesce' (run one cycle "
+            "immediately for all missed ticks)"
+        ),
+    )
+    concurrent_data_query: bool = Field(
+        default=False,
+        description=(
+            "If true, the timestamps of all output entities and the data of all input "
+            "entities are queried concurrently instead of one after another"
+        ),
+    )
+    max_concurrency: int = Field(
+        default=8,
+        gt=0,
+        description=(
+            "Maximum number of interface requests running at the same time "
+            "if a concurrent mode is enabled"
+        ),
+    )
+    concurrent_output: bool = Field(
+        default=False,
+        description=(
+            "If true, the output entities are sent concurrently, each in its own task, "
+            "instead of one after another (bounded by `max_concurrency`)"
+        ),
+    )
+    output_priority: list[Interfaces] = Field(
+        default=[],
+        description=(
+            "Order of the interfaces in which the output entities are sent "
+            "in the concurrent mode, e.g. '[\"mqtt\", \"fiware\"]' "
+            "(interfaces which are not listed are sent last)"
+        ),
+    )
+    output_timeout: float = Field(
+        default=0.0,
+        ge=0,
+        description=(
+            "Maximum time in seconds for sending an output entity in the concurrent mode "
+            "(0: no timeout)"
+        ),
+    )
+    output_change_only: bool = Field(
+        default=False,
+        description=(
+            "If true, output attributes and commands are only sent, if the value changed "
+            "since it was last sent (see `output_deadband` and `output_max_silence`)"
+        ),
+    )
+    output_deadband: float = Field(
+        default=0.0,
+        ge=0,
+        description=(
+            "Maximum absolute change of a numeric output value which is not sent "
+            "in the change-only mode (0: every change is sent)"
+        ),
+    )
+    output_max_silence: float = Field(
+        default=0.0,
+        ge=0,
+        description=(
+            "Time in seconds after which an unchanged output value is sent again "
+            "in the change-only mode (0: unchanged values are not sent again)"
+        ),
+    )
+    output_queue: bool = Field(
+        default=False,
+        description=(
+            "If true, the outputs are put into a bounded queue per interface "
+            "and sent by a background writer, so the calculation cycle "
+            "does not wait for the sending"
+        ),
+    )
+    output_queue_size: int = Field(
+        default=10,
+        gt=0,
+        description="Maximum number of output entities in the queue of each interface",
+    )
+    output_queue_policy: QueuePolicies = Field(
+        default=QueuePolicies.BLOCK,
+        description=(
+            "Handling of a full output queue: 'block' (wait for space), "
+            "'drop_oldest' (drop the oldest output) or 'coalesce' "
+            "(replace a queued output of the same entity)"
+        ),
+    )
+    cycle_timing_buffer_size: int = Field(
+        default=100,
+        gt=0,
+        description=(
+            "Number of cycles for which the durations of the phases "
+            "(e.g. data query, calculation, sending) are kept for the summaries"
+        ),
+    )
+    cycle_timing_log_interval: float = Field(
+        default=0.0,
+        ge=0,
+        description=(
+            "Time in seconds between the summaries of the durations of the phases "
+            "in the log (0: no summaries in the log)"
+        ),
+    )
+    metrics: bool = Field(
+        default=False,
+        description=(
+            "If true, the runtime metrics of the service (e.g. cycle durations, requests "
+            "to the interfaces) are published in the Prometheus text format via HTTP"
+        ),
+    )
+    metrics_host: str = Field(
+        default="0.0.0.0", description="Host (interface) of the metrics endpoint"
+    )
+    metrics_port: int = Field(
+        default=9100, ge=0, description="Port of the metrics endpoint"
+    )
 
 
 class FiwareEnvVariables(BaseSettings):
@@ -94,6 +215,79 @@ class FiwareEnvVariables(BaseSettings):
     service_path: str = Field(
         default="/", description="FIWARE Service Path for sub-tenant isolation"
     )
+    async_client: bool = Field(
+        default=False,
+        description=(
+            "If true, an asynchronous client with pooled keep-alive connections is used "
+            "for the requests to the Context Broker, so that the event loop is not blocked"
+        ),
+    )
+    timeout: float = Field(
+        default=10.0,
+        gt=0,
+        description="Timeout in seconds for a request of the asynchronous client",
+    )
+    max_connections: int = Field(
+        default=10,
+        gt=0,
+        description="Maximum number of connections of the asynchronous client",
+    )
+    timeseries_batch_size: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Number of timeseries values sent to the Context Broker in one batch request "
+            "(`/v2/op/update`). The batches are sent one after another in chronological "
+            "order. If 0, each value of a timeseries is sent in a single request. "
+            "Note: The size of a request is limited by the Context Broker (Orion: 1 MB)."
+        ),
+    )
+    bulk_query: bool = Field(
+        default=False,
+        description=(
+            "If true, all FIWARE input entities (and static data entities) are queried "
+            "together with paginated requests (`/v2/op/query`) "
+            "instead of a request for each entity"
+        ),
+    )
+    output_timestamp_refresh_interval: float = Field(
+        default=0.0,
+        ge=0,
+        description=(
+            "Time in seconds for which the timestamps of the outputs, which the service "
+            "has written, are used without reading them from the Context Broker. "
+            "They are read again after a failed write or after this time. "
+            "If 0, the timestamps are read from the Context Broker in each cycle"
+        ),
+    )
+    subscription: bool = Field(
+        default=False,
+        description=(
+            "If true, the FIWARE input entities are subscribed at the Context Broker. "
+            "The values are received with notifications and read from memory "
+            "instead of being queried in each cycle (`FIWARE_NOTIFICATION_URL` is required)"
+        ),
+    )
+    notification_url: Optional[AnyHttpUrl] = Field(
+        default=None,
+        description=(
+            "URL of the service for the notifications of the Context Broker "
+            "(must be reachable from the Context Broker)"
+        ),
+    )
+    notification_host: str = Field(
+        default="127.0.0.1",
+        description=(
+            "Host (interface) of the local receiver for the notifications "
+            "(e.g. `0.0.0.0` to receive the notifications of a Context Broker "
+            "on another host or in another container)"
+        ),
+    )
+    notification_port: int = Field(
+        default=8090,
+        ge=0,
+        description="Port of the local receiver for the notifications (0: a free port)",
+    )
 
     crate_db_url: AnyHttpUrl = Field(
         default=AnyHttpUrl("http://localhost:4200"),
@@ -106,6 +300,60 @@ class FiwareEnvVariables(BaseSettings):
     crate_db_ssl: bool = Field(
         default=False, description="Enables SSL for the connection to CrateDB"
     )
+    crate_db_pool_size: int = Field(
+        default=5,
+        gt=0,
+        description="Maximum number of reusable connections to CrateDB at the same time",
+    )
+    crate_db_idle_timeout: float = Field(
+        default=300.0,
+        gt=0,
+        description="Time in seconds after which an idle connection to CrateDB is closed",
+    )
+    crate_db_health_check_interval: float = Field(
+        default=30.0,
+        ge=0,
+        description=(
+            "Time in seconds after which an idle connection to CrateDB "
+            "is checked before it is reused"
+        ),
+    )
+    crate_db_schema_cache_ttl: float = Field(
+        default=300.0,
+        ge=0,
+        description=(
+            "Time in seconds for which the columns of a CrateDB table are cached. "
+            "The cache of a table is also cleared if a column is unknown. "
+            "If 0, the columns are queried for each request"
+        ),
+    )
+    crate_db_resampling: bool = Field(
+        default=False,
+        description=(
+            "If true, the timeseries are resampled in CrateDB (mean of each time step, "
+            "`DATE_BIN` from the epoch) and only the aggregated values are transferred. "
+            "Non-numeric attributes are not queried in this mode"
+        ),
+    )
+    crate_db_chunk_size: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Maximum number of rows queried from CrateDB in one request. If greater than 0, "
+            "the timeseries are queried in chunks and resampled incrementally, so that "
+            "long time ranges (e.g. for the calibration) do not need much memory. "
+            "Non-numeric attributes are not queried in this mode. "
+            "If 0, all rows are queried at once. Not used with `crate_db_resampling`"
+        ),
+    )
+    crate_db_window_cache: bool = Field(
+        default=False,
+        description=(
+            "If true, the resampled timeseries of the last cycle are cached for "
+            "calculations with an absolute timerange and only the new data is queried "
+            "from CrateDB in each cycle. Only used if the time step divides a day"
+        ),
+    )
 
 
 class MQTTEnvVariables(BaseSettings):
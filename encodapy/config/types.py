@@ -87,3 +87,39 @@ class MQTTFormatTypes(Enum):
     FIWARE_ATTR = "fiware-attr"
     FIWARE_CMDEXE = "fiware-cmdexe"
     TEMPLATE = "template"
+
+
+class OverrunPolicies(Enum):
+    """
+    Enum class for the handling of missed ticks of the cycle scheduler, \
+        if a cycle takes longer than the sampling time
+
+    Attributes:
+        SKIP (str): Missed ticks are skipped, the next cycle starts \
+            at the next tick "skip"
+        IMMEDIATE (str): Each missed tick is run immediately, one after another, \
+            until the schedule is caught up "immediate"
+        COALESCE (str): All missed ticks are combined into one cycle, \
+            which starts immediately "coalesce"
+    """
+
+    SKIP = "skip"
+    IMMEDIATE = "immediate"
+    COALESCE = "coalesce"
+
+
+class QueuePolicies(Enum):
+    """
+    Enum class for the handling of a full output queue (backpressure)
+
+    Attributes:
+        BLOCK (str): The service waits until there is space in the queue "block"
+        DROP_OLDEST (str): The oldest output in the queue is dropped "drop_oldest"
+        COALESCE (str): An output of an entity which is still in the queue \
+            is replaced with the new output, otherwise the service waits \
+            until there is space in the queue "coalesce"
+    """
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
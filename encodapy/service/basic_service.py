@@ -2,10 +2,14 @@
 Module for the basic service class for the data processing and transfer via different interfaces.
 Author: Martin Altenburger
 """
+import functools
 import sys
-from datetime import datetime
-from typing import Optional, Union
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Coroutine, Optional, Union
 import asyncio
+import pandas as pd
+from filip.models.ngsi_v2.context import ContextAttribute
 from loguru import logger
 from pydantic import ValidationError
 
@@ -14,6 +18,7 @@ from encodapy.config import (
     CommandModel,
     ConfigModel,
     DataQueryTypes,
+    InputModel,
     Interfaces,
     OutputModel,
     BasicEnvVariables
@@ -23,17 +28,36 @@ from encodapy.service.communication import (
     FiwareConnection,
     MqttConnection,
 )
-from encodapy.utils.error_handling import ConfigError, InterfaceNotActive
+from encodapy.utils.deduplication import OutputDeduplicator
+from encodapy.utils.error_handling import (
+    ConfigError,
+    InterfaceNotActive,
+    OutputSendingError,
+)
 from encodapy.utils.health import update_health_file
 from encodapy.utils.logging import LoggerControl
+from encodapy.utils.metrics import (
+    CYCLE_DURATION,
+    CYCLE_PHASE_DURATION,
+    METRICS,
+    MetricsExporter,
+    record_interface_request,
+)
+from encodapy.utils.output_queue import OutputQueue
+from encodapy.utils.scheduler import CycleScheduler
 from encodapy.utils.models import (
     DataTransferComponentModel,
     DataTransferModel,
+    InputDataEntityModel,
     InputDataModel,
     OutputDataEntityModel,
+    OutputAttributeRecord,
+    OutputCommandRecord,
     OutputDataModel,
+    PhaseTimingModel,
     StaticDataEntityModel,
 )
+from encodapy.utils.timings import CycleTimings
 from encodapy.utils.units import get_time_unit_seconds
 
 
@@ -59,9 +83,31 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
         )
 
         self.staticdata: Optional[list[StaticDataEntityModel]] = None
+        self._output_config_index: dict[
+            str,
+            tuple[OutputModel, dict[str, AttributeModel], dict[str, CommandModel]],
+        ] = {}
+        self._last_output_values: dict[tuple[str, str], Any] = {}
+        self._suppressed_output_timestamps: dict[tuple[str, str], datetime] = {}
+        self.output_deduplicator: Optional[OutputDeduplicator] = (
+            OutputDeduplicator(
+                deadband=self.env.output_deadband,
+                max_silence=self.env.output_max_silence,
+            )
+            if self.env.output_change_only
+            else None
+        )
 
         self.timestamp_health = None
 
+        self.cycle_timings = CycleTimings(
+            size=self.env.cycle_timing_buffer_size,
+            log_interval=self.env.cycle_timing_log_interval,
+        )
+        self.metrics_exporter: Optional[MetricsExporter] = None
+        self.schedulers: dict[str, CycleScheduler] = {}
+        self.output_writers: dict[Interfaces, tuple[OutputQueue, asyncio.Task]] = {}
+
         self.prepare_basic_start()
 
     def _load_config(self):
@@ -81,6 +127,8 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
             logger.error(f"Error loading configuration file: {e}")
             sys.exit(1)
 
+        self._index_output_config()
+
         if self.config.interfaces.fiware:
             self.load_fiware_params()
 
@@ -102,6 +150,8 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
 
         self._load_config()
 
+        self.start_metrics_exporter()
+
         interfaces = getattr(self.config, "interfaces", None)
         try:
             if interfaces:
@@ -140,6 +190,24 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
             self.cleanup_service()
             raise
 
+    def start_metrics_exporter(self):
+        """
+        Function to start the endpoint for the runtime metrics of the service, \
+            if it is enabled (`METRICS`)
+        """
+        if not self.env.metrics or self.metrics_exporter is not None:
+            return
+
+        metrics_exporter = MetricsExporter(
+            registry=METRICS, host=self.env.metrics_host, port=self.env.metrics_port
+        )
+        try:
+            metrics_exporter.start()
+        except OSError as e:
+            logger.error(f"Could not start the metrics endpoint: {e}")
+            return
+        self.metrics_exporter = metrics_exporter
+
     def prepare_start(self):
         """
         Function prepare the specific aspects of the start of the service \
@@ -167,6 +235,16 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
         if len(self.config.staticdata) == 0:
             return []
 
+        fiware_entities = {}
+        if self._use_fiware_bulk_query():
+            fiware_entities = self.get_fiware_entities(
+                entities=[
+                    static_entity
+                    for static_entity in self.config.staticdata
+                    if static_entity.interface == Interfaces.FIWARE
+                ]
+            )
+
         for static_entity in self.config.staticdata:
             if static_entity.interface == Interfaces.FIWARE:
                 staticdata.append(
@@ -175,6 +253,9 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
                             method=method,
                             entity=static_entity,
                             timestamp_latest_output=None,
+                            fiware_entity=fiware_entities.get(
+                                static_entity.id_interface
+                            ),
                         ).model_dump()
                     )
                 )
@@ -206,7 +287,6 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
 
         """
 
-        input_data = []
         output_timestamps = []
         output_latest_timestamps = []
 
@@ -218,31 +298,28 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
                 input_entities=[], output_entities=[], static_entities=[]
             )
 
-        for output_entity in self.config.outputs:
-            match output_entity.interface:
-                case Interfaces.FIWARE:
-                    entity_timestamps, output_latest_timestamp = (
-                        self._get_last_timestamp_for_fiware_output(output_entity)
-                    )
-                    output_timestamps.append(entity_timestamps)
-                    output_latest_timestamps.append(output_latest_timestamp)
+        record_timings = method is DataQueryTypes.CALCULATION
 
-                case Interfaces.FILE:
-                    entity_timestamps, output_latest_timestamp = (
-                        self._get_last_timestamp_for_file_output(output_entity)
+        with self.cycle_timings.phase("output_timestamps", enabled=record_timings):
+            output_results = await self._query_entities(
+                [
+                    self._observe_query(
+                        self._get_output_entity_timestamps(output_entity=output_entity),
+                        interface=output_entity.interface,
+                        operation="output_timestamps",
                     )
-                    output_timestamps.append(entity_timestamps)
-                    output_latest_timestamps.append(output_latest_timestamp)
-                    logger.debug("File interface, output_latest_timestamp is not defined.")
-
-                case Interfaces.MQTT:
-                    entity_timestamps, output_latest_timestamp = (
-                        self._get_last_timestamp_for_mqtt_output(output_entity)
-                    )
-                    output_timestamps.append(entity_timestamps)
-                    output_latest_timestamps.append(output_latest_timestamp)
-
-            await asyncio.sleep(0.01)
+                    for output_entity in self.config.outputs
+                ]
+            )
+        for entity_timestamps, output_latest_timestamp in output_results:
+            entity_timestamps, output_latest_timestamp = (
+                self._apply_suppressed_output_timestamps(
+                    entity_timestamps=entity_timestamps,
+                    latest_timestamp=output_latest_timestamp,
+                )
+            )
+            output_timestamps.append(entity_timestamps)
+            output_latest_timestamps.append(output_latest_timestamp)
 
         if None in output_latest_timestamps:
             output_latest_timestamp = None
@@ -252,34 +329,32 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
             else:
                 output_latest_timestamp = None
 
-        for input_entity in self.config.inputs:
-            match input_entity.interface:
-                case Interfaces.FIWARE:
-                    fiware_input = self.get_data_from_fiware(
+        with self.cycle_timings.phase("fiware_input_entities", enabled=record_timings):
+            fiware_entities = await self._get_fiware_input_entities()
+
+        input_results = await self._query_entities(
+            [
+                self._observe_query(
+                    self._get_input_entity_data(
                         method=method,
-                        entity=input_entity,
+                        input_entity=input_entity,
                         timestamp_latest_output=output_latest_timestamp,
-                    )
-                    if fiware_input is not None:
-                        input_data.append(fiware_input)
-
-                case Interfaces.FILE:
-                    file_input = self.get_data_from_file(method=method, entity=input_entity)
-                    if file_input is not None:
-                        input_data.append(file_input)
-
-                case Interfaces.MQTT:
-                    input_data.append(
-                        self.get_data_from_mqtt(
-                            method=method,
-                            entity=input_entity,
-                        )
-                    )
-
-            await asyncio.sleep(0.01)
+                        fiware_entity=fiware_entities.get(input_entity.id_interface),
+                    ),
+                    interface=input_entity.interface,
+                    operation="input",
+                    phase=f"input:{input_entity.id}" if record_timings else None,
+                )
+                for input_entity in self.config.inputs
+            ]
+        )
+        input_data = [
+            input_entity for input_entity in input_results if input_entity is not None
+        ]
 
         if self.env.reload_staticdata or self.staticdata is None:
-            self.staticdata = self.reload_static_data(method=method, staticdata=[])
+            with self.cycle_timings.phase("staticdata", enabled=record_timings):
+                self.staticdata = self.reload_static_data(method=method, staticdata=[])
 
         return InputDataModel(
             input_entities=input_data,
@@ -287,6 +362,251 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
             static_entities=self.staticdata,
         )
 
+    async def _get_fiware_input_entities(
+        self,
+    ) -> dict[str, tuple[str, dict[str, ContextAttribute]]]:
+        """
+        Function to get the FIWARE input entities from the store of the notifications \
+            (subscription) and / or with a bulk query. Entities which are not included \
+            are queried separately, this includes entities without a notification \
+            within the sampling time of the calculation.
+
+        Returns:
+            dict[str, tuple[str, dict[str, ContextAttribute]]]: Type and attributes \
+                of the available FIWARE input entities with the ID as key
+        """
+        if self.cb_client is None:
+            return {}
+
+        entities = [
+            input_entity
+            for input_entity in self.config.inputs
+            if input_entity.interface == Interfaces.FIWARE
+        ]
+        fiware_entities = self.get_fiware_entities_from_notifications(
+            entities=entities,
+            max_age=(
+                self.config.controller_settings.time_settings.calculation.sampling_time
+                * get_time_unit_seconds(
+                    self.config.controller_settings.time_settings.calculation.sampling_time_unit
+                )
+            ),
+        )
+
+        if self._use_fiware_bulk_query():
+            fiware_entities.update(
+                await self.get_fiware_entities_async(
+                    entities=[
+                        entity
+                        for entity in entities
+                        if entity.id_interface not in fiware_entities
+                    ]
+                )
+            )
+
+        return fiware_entities
+
+    def _use_fiware_bulk_query(self) -> bool:
+        """
+        Function to check if the FIWARE entities should be queried with bulk requests
+
+        Returns:
+            bool: True, if the FIWARE interface is active and the bulk query is enabled
+        """
+        return (
+            self.cb_client is not None
+            and self.fiware_conn_params.fiware_params.bulk_query
+        )
+
+    async def _query_entities(self, queries: list[Coroutine]) -> list:
+        """
+        Function to run the queries for the entities of the interfaces. If the concurrent \
+            data query is enabled, the queries run concurrently with a bounded number of \
+            parallel requests (`max_concurrency`), otherwise they run one after another.
+
+        Args:
+            queries (list[Coroutine]): Queries for the entities
+
+        Returns:
+            list: Results of the queries in the order of the queries
+        """
+        if not self.env.concurrent_data_query:
+            results = []
+            for query in queries:
+                results.append(await query)
+                await asyncio.sleep(0.01)
+            return results
+
+        semaphore = asyncio.Semaphore(self.env.max_concurrency)
+
+        async def run_bounded(query: Coroutine):
+            async with semaphore:
+                return await query
+
+        return await asyncio.gather(*(run_bounded(query) for query in queries))
+
+    async def _observe_query(
+        self,
+        query: Coroutine,
+        interface: Interfaces,
+        operation: str,
+        phase: Optional[str] = None,
+    ) -> Any:
+        """
+        Function to record the duration of a query of an interface in the metrics \
+            and as phase of the current cycle. With the concurrent data query, \
+            the duration is measured from the start of the query, \
+            not from the time waiting for a free slot.
+
+        A query which raises an exception or returns None (the interfaces log \
+            their errors and return no data) is recorded as failed request.
+
+        Args:
+            query (Coroutine): Query of the interface
+            interface (Interfaces): Interface of the query
+            operation (str): Operation of the query (e.g. `input`)
+            phase (Optional[str]): Name of the phase of the cycle (None: not recorded)
+
+        Returns:
+            Any: Result of the query
+        """
+        failed = True
+        start = time.perf_counter()
+        try:
+            result = await query
+            failed = result is None
+        finally:
+            duration = time.perf_counter() - start
+            if phase is not None:
+                self.cycle_timings.record(phase=phase, duration=duration)
+            record_interface_request(
+                interface=interface.value,
+                operation=operation,
+                duration=duration,
+                failed=failed,
+            )
+        return result
+
+    async def _call_interface(self, function: Callable, **kwargs: Any) -> Any:
+        """
+        Function to call a blocking function of an interface. If the concurrent data query \
+            is enabled, the function runs in a worker thread, so that the event loop \
+            is not blocked.
+
+        Args:
+            function (Callable): Function of the interface
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            Any: Result of the function
+        """
+        if self.env.concurrent_data_query:
+            return await asyncio.to_thread(function, **kwargs)
+        return function(**kwargs)
+
+    async def _get_output_entity_timestamps(
+        self, output_entity: OutputModel
+    ) -> tuple[OutputDataEntityModel, Union[datetime, None]]:
+        """
+        Function to get the latest timestamps of an output entity via its interface
+
+        Args:
+            output_entity (OutputModel): Output entity
+
+        Returns:
+            tuple[OutputDataEntityModel, Union[datetime, None]]:
+                - OutputDataEntityModel with timestamps for the attributes
+                - the latest timestamp of the output entity (None if not available)
+        """
+        match output_entity.interface:
+            case Interfaces.FIWARE:
+                if self.cb_client_async is not None:
+                    return await self._get_last_timestamp_for_fiware_output_async(
+                        output_entity=output_entity
+                    )
+                return await self._call_interface(
+                    self._get_last_timestamp_for_fiware_output,
+                    output_entity=output_entity,
+                )
+
+            case Interfaces.FILE:
+                logger.debug("File interface, output_latest_timestamp is not defined.")
+                return self._get_last_timestamp_for_file_output(output_entity)
+
+            case Interfaces.MQTT:
+                return self._get_last_timestamp_for_mqtt_output(output_entity)
+
+        return None
+
+    async def _get_input_entity_data(
+        self,
+        method: DataQueryTypes,
+        input_entity: InputModel,
+        timestamp_latest_output: Union[datetime, None],
+        fiware_entity: Optional[tuple[str, dict[str, ContextAttribute]]] = None,
+    ) -> Union[InputDataEntityModel, None]:
+        """
+        Function to get the data of an input entity via its interface
+
+        Args:
+            method (DataQueryTypes): Method for the data query
+            input_entity (InputModel): Input entity
+            timestamp_latest_output (Union[datetime, None]): Timestamp of the last output
+            fiware_entity (Optional[tuple[str, dict[str, ContextAttribute]]]): \
+                Type and attributes of a FIWARE entity from the bulk query, if available
+
+        Returns:
+            Union[InputDataEntityModel, None]: Model with the input data or None, \
+                if no data is available
+        """
+        match input_entity.interface:
+            case Interfaces.FIWARE:
+                if self.cb_client_async is not None:
+                    return await self.get_data_from_fiware_async(
+                        method=method,
+                        entity=input_entity,
+                        timestamp_latest_output=timestamp_latest_output,
+                        fiware_entity=fiware_entity,
+                    )
+                return await self._call_interface(
+                    self.get_data_from_fiware,
+                    method=method,
+                    entity=input_entity,
+                    timestamp_latest_output=timestamp_latest_output,
+                    fiware_entity=fiware_entity,
+                )
+
+            case Interfaces.FILE:
+                return await self._call_interface(
+                    self.get_data_from_file, method=method, entity=input_entity
+                )
+
+            case Interfaces.MQTT:
+                return self.get_data_from_mqtt(
+                    method=method,
+                    entity=input_entity,
+                )
+
+        return None
+
+    def _index_output_config(self) -> None:
+        """
+        Function to build the index of the configuration of the output entities \
+            with their attributes and commands, so that the configuration \
+            of an output is found without searching all outputs in each cycle.
+
+        The index has to be rebuilt, if the outputs of the configuration are changed.
+        """
+        self._output_config_index = {}
+        for entity in self.config.outputs:
+            _, attributes, commands = self._output_config_index.setdefault(
+                entity.id, (entity, {}, {})
+            )
+            for attribute in entity.attributes:
+                attributes.setdefault(attribute.id, attribute)
+            for command in entity.commands:
+                commands.setdefault(command.id, command)
+
     def _get_output_entity_config(
         self,
         output_entity_id: str,
@@ -301,11 +621,11 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
             - Union[OutputModel, None]: configuration of the output entity
             or None if the entity is not found
         """
-        for entity in self.config.outputs:
-            if entity.id == output_entity_id:
-                return entity
+        output_config = self._output_config_index.get(output_entity_id)
+        if output_config is None:
+            return None
 
-        return None
+        return output_config[0]
 
     def _get_output_attribute_config(
         self,
@@ -323,13 +643,11 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
             - Union[AttributeModel, None]: configuration of the output attribute
             or None if the attribute is not found
         """
-        for entity in self.config.outputs:
-            if entity.id == output_entity_id:
-                for attribute in entity.attributes:
-                    if attribute.id == output_attribute_id:
-                        return attribute
+        output_config = self._output_config_index.get(output_entity_id)
+        if output_config is None:
+            return None
 
-        return None
+        return output_config[1].get(output_attribute_id)
 
     def _get_output_command_config(
         self,
@@ -347,13 +665,11 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
             - Union[AttributeModel, None]: configuration of the output attribute
             or None if the attribute is not found
         """
-        for entity in self.config.outputs:
-            if entity.id == output_entity_id:
-                for commmand in entity.commands:
-                    if commmand.id == output_command_id:
-                        return commmand
+        output_config = self._output_config_index.get(output_entity_id)
+        if output_config is None:
+            return None
 
-        return None
+        return output_config[2].get(output_command_id)
 
     async def send_outputs(self, data_output: Union[OutputDataModel, None]):
         """
@@ -369,88 +685,638 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
             logger.debug("No data for sending out to  instance (FIWARE, MQTT, FILE)")
             return
 
+        output_sendings: list[
+            tuple[OutputModel, list[OutputAttributeRecord], list[OutputCommandRecord]]
+        ] = []
         for output in data_output.entities:
             output_entity = self._get_output_entity_config(output_entity_id=output.id)
-            output_attributes = []
-            output_commands = []
 
             if output_entity is None:
                 logger.debug(f"Output entity {output.id} not found in configuration.")
                 continue
 
-            for attribute in output.attributes:
-                output_attribute = self._get_output_attribute_config(
-                    output_entity_id=output.id, output_attribute_id=attribute.id
+            output_attributes, output_commands = self._get_output_records(output=output)
+
+            # the background writers filter the outputs when they are sent
+            if self.output_deduplicator is not None and not self.env.output_queue:
+                output_attributes, output_commands = self._filter_unchanged_outputs(
+                    output_entity=output_entity,
+                    output_attributes=output_attributes,
+                    output_commands=output_commands,
                 )
+                if len(output_attributes) == 0 and len(output_commands) == 0:
+                    logger.debug(f"No changed outputs for the entity {output_entity.id}")
+                    continue
+
+            output_sendings.append((output_entity, output_attributes, output_commands))
 
-                if output_attribute is None:
-                    logger.debug(
-                        f"Output attribute {attribute.id} not found in configuration."
+        if self.env.output_queue:
+            await self._enqueue_outputs(output_sendings=output_sendings)
+        elif self.env.concurrent_output:
+            await self._send_outputs_concurrently(output_sendings=output_sendings)
+        else:
+            for output_entity, output_attributes, output_commands in output_sendings:
+                try:
+                    await self._send_output_entity(
+                        output_entity=output_entity,
+                        output_attributes=output_attributes,
+                        output_commands=output_commands,
                     )
-                    continue
+                except OutputSendingError as e:
+                    # the error is already logged by the interface
+                    logger.debug(e)
+                await asyncio.sleep(0.01)
+
+        logger.debug("Finished sending output data")
+
+    def _get_output_records(
+        self, output: OutputDataEntityModel
+    ) -> tuple[list[OutputAttributeRecord], list[OutputCommandRecord]]:
+        """
+        Function to get the records of the output values of an output entity \
+            with the configuration of the attributes and commands \
+            (lightweight records for the sending, the configuration is not changed)
+
+        Args:
+            output (OutputDataEntityModel): Output entity with the output values
 
-                output_attribute.value = attribute.value
-                output_attribute.unit = attribute.unit
-                output_attribute.timestamp = attribute.timestamp
-                output_attributes.append(output_attribute)
+        Returns:
+            tuple[list[OutputAttributeRecord], list[OutputCommandRecord]]: \
+                Attributes and commands with the output values, \
+                which are available in the configuration
+        """
+        output_attributes = []
+        output_commands = []
 
-            for command in output.commands:
-                output_command = self._get_output_command_config(
-                    output_entity_id=output.id, output_command_id=command.id
+        for attribute in output.attributes:
+            output_attribute = self._get_output_attribute_config(
+                output_entity_id=output.id, output_attribute_id=attribute.id
+            )
+
+            if output_attribute is None:
+                logger.debug(
+                    f"Output attribute {attribute.id} not found in configuration."
                 )
+                continue
 
-                if output_command is None:
-                    logger.debug(
-                        f"Output attribute {command.id} not found in configuration."
-                    )
-                    continue
+            output_attributes.append(
+                OutputAttributeRecord(
+                    config=output_attribute,
+                    value=attribute.value,
+                    unit=attribute.unit,
+                    timestamp=attribute.timestamp,
+                )
+            )
 
-                output_command.value = command.value
-                output_commands.append(output_command)
+        for command in output.commands:
+            output_command = self._get_output_command_config(
+                output_entity_id=output.id, output_command_id=command.id
+            )
 
-            if output_entity.interface is Interfaces.FIWARE:
-                await self._send_data_to_fiware(
-                    output_entity=output_entity,
-                    output_attributes=output_attributes,
-                    output_commands=output_commands,
+            if output_command is None:
+                logger.debug(
+                    f"Output attribute {command.id} not found in configuration."
                 )
+                continue
+
+            output_commands.append(
+                OutputCommandRecord(config=output_command, value=command.value)
+            )
+
+        return output_attributes, output_commands
 
-            elif output_entity.interface is Interfaces.FILE:
-                self.send_data_to_json_file(
+    def _filter_unchanged_outputs(
+        self,
+        output_entity: OutputModel,
+        output_attributes: list[OutputAttributeRecord],
+        output_commands: list[OutputCommandRecord],
+    ) -> tuple[list[OutputAttributeRecord], list[OutputCommandRecord]]:
+        """
+        Function to remove the attributes and commands of an output entity, \
+            which did not change since they were last sent (change-only mode)
+
+        Args:
+            output_entity (OutputModel): Output entity
+            output_attributes (list[OutputAttributeRecord]): Attributes with the output values
+            output_commands (list[OutputCommandRecord]): Commands with the output values
+
+        Returns:
+            tuple[list[OutputAttributeRecord], list[OutputCommandRecord]]: \
+                Attributes and commands which have to be sent
+        """
+        # the timestamps of the unchanged attributes are remembered, \
+        # see `_apply_suppressed_output_timestamps`
+        interface = output_entity.interface.value
+        changed_attributes = []
+        for attribute in output_attributes:
+            if self.output_deduplicator.check(
+                key=(output_entity.id, attribute.id, interface),
+                value=attribute.value,
+                unit=attribute.unit,
+            ):
+                changed_attributes.append(attribute)
+            else:
+                self._remember_suppressed_output(
+                    output_entity=output_entity, output_attribute=attribute
+                )
+        return (
+            changed_attributes,
+            [
+                command
+                for command in output_commands
+                if self.output_deduplicator.check(
+                    key=(output_entity.id, command.id, interface), value=command.value
+                )
+            ],
+        )
+
+    def _commit_sent_outputs(
+        self,
+        output_entity: OutputModel,
+        output_attributes: list[OutputAttributeRecord],
+        output_commands: list[OutputCommandRecord],
+    ) -> None:
+        """
+        Function to remember the values of the attributes and commands \
+            of an output entity as sent (change-only mode). Values which could not \
+            be sent are not remembered, so they are sent again with the next cycle.
+
+        Args:
+            output_entity (OutputModel): Output entity
+            output_attributes (list[OutputAttributeRecord]): Sent attributes
+            output_commands (list[OutputCommandRecord]): Sent commands
+        """
+        interface = output_entity.interface.value
+        for attribute in output_attributes:
+            self.output_deduplicator.commit(
+                key=(output_entity.id, attribute.id, interface),
+                value=attribute.value,
+                unit=attribute.unit,
+            )
+            self._suppressed_output_timestamps.pop((output_entity.id, attribute.id), None)
+        for command in output_commands:
+            self.output_deduplicator.commit(
+                key=(output_entity.id, command.id, interface), value=command.value
+            )
+
+    def _remember_suppressed_output(
+        self,
+        output_entity: OutputModel,
+        output_attribute: OutputAttributeRecord,
+    ) -> None:
+        """
+        Function to remember the timestamp of an attribute, which is not sent \
+            because it did not change (change-only mode)
+
+        Args:
+            output_entity (OutputModel): Output entity
+            output_attribute (OutputAttributeRecord): Attribute with the unchanged value
+        """
+        timestamp = output_attribute.timestamp
+        if isinstance(output_attribute.value, pd.DataFrame) and isinstance(
+            output_attribute.value.index, pd.DatetimeIndex
+        ) and len(output_attribute.value) > 0:
+            timestamp = output_attribute.value.index.max().to_pydatetime()
+        if timestamp is None:
+            return
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        self._suppressed_output_timestamps[(output_entity.id, output_attribute.id)] = (
+            timestamp
+        )
+
+    def _apply_suppressed_output_timestamps(
+        self,
+        entity_timestamps: OutputDataEntityModel,
+        latest_timestamp: Union[datetime, None],
+    ) -> tuple[OutputDataEntityModel, Union[datetime, None]]:
+        """
+        Function to update the latest timestamps of an output entity from its interface \
+            with the timestamps of the attributes, which were not sent \
+            because they did not change (change-only mode)
+
+        The unchanged value is the output at this time, so the timerange \
+            of the input data moves on like the values were sent.
+
+        Args:
+            entity_timestamps (OutputDataEntityModel): Timestamps of the attributes
+            latest_timestamp (Union[datetime, None]): Latest timestamp of the output entity \
+                for the attribute with the oldest value (None if not available)
+
+        Returns:
+            tuple[OutputDataEntityModel, Union[datetime, None]]: \
+                Updated timestamps of the attributes and of the output entity
+        """
+        if (
+            len(self._suppressed_output_timestamps) == 0
+            or entity_timestamps is None
+            or latest_timestamp is None
+        ):
+            return entity_timestamps, latest_timestamp
+
+        attributes_status = []
+        for attribute_status in entity_timestamps.attributes_status or []:
+            suppressed_timestamp = self._suppressed_output_timestamps.get(
+                (entity_timestamps.id, attribute_status.id)
+            )
+            latest = attribute_status.latest_timestamp_output
+            if (
+                suppressed_timestamp is not None
+                and latest is not None
+                and suppressed_timestamp
+                > (latest if latest.tzinfo else latest.replace(tzinfo=timezone.utc))
+            ):
+                attribute_status = attribute_status.model_copy(
+                    update={"latest_timestamp_output": suppressed_timestamp}
+                )
+            attributes_status.append(attribute_status)
+
+        timestamps = [
+            attribute_status.latest_timestamp_output
+            for attribute_status in attributes_status
+            if attribute_status.latest_timestamp_output is not None
+        ]
+        if len(timestamps) == 0:
+            return entity_timestamps, latest_timestamp
+        return (
+            entity_timestamps.model_copy(update={"attributes_status": attributes_status}),
+            min(timestamps),
+        )
+
+    async def _dispatch_output_entity(
+        self,
+        output_entity: OutputModel,
+        output_attributes: list[OutputAttributeRecord],
+        output_commands: list[OutputCommandRecord],
+        in_thread: bool = False,
+    ) -> bool:
+        """
+        Function to send the output data of an output entity with the sender of its interface
+
+        Args:
+            output_entity (OutputModel): Output entity
+            output_attributes (list[OutputAttributeRecord]): Attributes with the output values
+            output_commands (list[OutputCommandRecord]): Commands with the output values
+            in_thread (bool): Run the blocking interfaces in a worker thread
+
+        Returns:
+            bool: True, if the interface sent the output data
+        """
+        if output_entity.interface is Interfaces.FIWARE and self.cb_client_async is not None:
+            return await self._send_data_to_fiware(
+                output_entity=output_entity,
+                output_attributes=output_attributes,
+                output_commands=output_commands,
+            )
+
+        if output_entity.interface is Interfaces.FIWARE:
+            send_function = functools.partial(
+                self._send_data_to_fiware_sync,
+                output_entity=output_entity,
+                output_attributes=output_attributes,
+                output_commands=output_commands,
+            )
+        elif output_entity.interface is Interfaces.FILE:
+            send_function = functools.partial(
+                self.send_data_to_json_file,
+                output_entity=output_entity,
+                output_attributes=output_attributes,
+                output_commands=output_commands,
+            )
+        elif output_entity.interface is Interfaces.MQTT:
+            send_function = functools.partial(
+                self.send_data_to_mqtt,
+                output_entity=output_entity,
+                output_attributes=output_attributes,
+            )
+        else:
+            return True
+
+        sent = await asyncio.to_thread(send_function) if in_thread else send_function()
+        # the file interface raises an exception if the data could not be written
+        return sent is not False
+
+    async def _send_output_entity(
+        self,
+        output_entity: OutputModel,
+        output_attributes: list[OutputAttributeRecord],
+        output_commands: list[OutputCommandRecord],
+        in_thread: bool = False,
+        record_timing: bool = True,
+    ) -> None:
+        """
+        Function to send the output data of an output entity via its interface
+
+        Args:
+            output_entity (OutputModel): Output entity
+            output_attributes (list[OutputAttributeRecord]): Attributes with the output values
+            output_commands (list[OutputCommandRecord]): Commands with the output values
+            in_thread (bool): Run the blocking interfaces (FILE, MQTT and FIWARE \
+                without the asynchronous client) in a worker thread, \
+                so that the other outputs are not blocked
+            record_timing (bool): Record the duration in the timings of the cycle \
+                (not for the sendings in the background)
+
+        Raises:
+            OutputSendingError: If the interface could not send the output data
+        """
+        sent = False
+        start = time.perf_counter()
+        try:
+            sent = await self._dispatch_output_entity(
+                output_entity=output_entity,
+                output_attributes=output_attributes,
+                output_commands=output_commands,
+                in_thread=in_thread,
+            )
+        finally:
+            if sent and self.output_deduplicator is not None:
+                self._commit_sent_outputs(
                     output_entity=output_entity,
                     output_attributes=output_attributes,
                     output_commands=output_commands,
                 )
+            duration = time.perf_counter() - start
+            if record_timing:
+                self.cycle_timings.record(
+                    phase=f"send:{output_entity.interface.value}", duration=duration
+                )
+            record_interface_request(
+                interface=output_entity.interface.value,
+                operation="send",
+                duration=duration,
+                failed=not sent,
+            )
+        if not sent:
+            raise OutputSendingError(
+                f"The output entity {output_entity.id} could not be sent "
+                f"via {output_entity.interface.value}"
+            )
 
-            elif output_entity.interface is Interfaces.MQTT:
-                self.send_data_to_mqtt(
-                    output_entity=output_entity,
-                    output_attributes=output_attributes,
+    async def _send_outputs_concurrently(
+        self,
+        output_sendings: list[
+            tuple[OutputModel, list[OutputAttributeRecord], list[OutputCommandRecord]]
+        ],
+    ) -> None:
+        """
+        Function to send the output entities concurrently, each in its own task \
+            with a bounded number of parallel sendings (`max_concurrency`).
+
+        The sendings start in the order of the interfaces in `output_priority`. \
+            A sending is cancelled after `output_timeout` seconds (0: no timeout), \
+            a blocking sending in a worker thread is not stopped, \
+            but no longer awaited. The errors of all sendings are logged together.
+
+        Args:
+            output_sendings (list[tuple[OutputModel, list[OutputAttributeRecord], \
+                list[OutputCommandRecord]]]): Output entities with the attributes \
+                and commands to send
+        """
+        priorities = {
+            interface: index for index, interface in enumerate(self.env.output_priority)
+        }
+        output_sendings = sorted(
+            output_sendings,
+            key=lambda sending: priorities.get(sending[0].interface, len(priorities)),
+        )
+        semaphore = asyncio.Semaphore(self.env.max_concurrency)
+        timeout = self.env.output_timeout or None
+
+        async def send_bounded(
+            output_entity: OutputModel,
+            output_attributes: list[OutputAttributeRecord],
+            output_commands: list[OutputCommandRecord],
+        ) -> None:
+            async with semaphore:
+                await asyncio.wait_for(
+                    self._send_output_entity(
+                        output_entity=output_entity,
+                        output_attributes=output_attributes,
+                        output_commands=output_commands,
+                        in_thread=True,
+                    ),
+                    timeout=timeout,
                 )
 
-            await asyncio.sleep(0.01)
+        results = await asyncio.gather(
+            *(send_bounded(*sending) for sending in output_sendings),
+            return_exceptions=True,
+        )
 
-        logger.debug("Finished sending output data")
+        errors = []
+        for (output_entity, _, _), result in zip(output_sendings, results):
+            if isinstance(result, asyncio.TimeoutError):
+                errors.append(
+                    f"{output_entity.id} ({output_entity.interface.value}): "
+                    f"timeout after {timeout} s"
+                )
+            elif isinstance(result, OutputSendingError):
+                errors.append(
+                    f"{output_entity.id} ({output_entity.interface.value}): not sent"
+                )
+            elif isinstance(result, BaseException):
+                errors.append(
+                    f"{output_entity.id} ({output_entity.interface.value}): "
+                    f"{type(result).__name__}: {result}"
+                )
+        if len(errors) > 0:
+            logger.error(
+                f"Sending of {len(errors)} of {len(output_sendings)} output entities "
+                f"failed: {'; '.join(errors)}"
+            )
+
+    async def _enqueue_outputs(
+        self,
+        output_sendings: list[
+            tuple[OutputModel, list[OutputAttributeRecord], list[OutputCommandRecord]]
+        ],
+    ) -> None:
+        """
+        Function to put the output entities into the queues of their interfaces, \
+            the background writers of the interfaces send them.
+
+        If a queue is full, the output is handled with the `output_queue_policy` \
+            (the service waits, drops the oldest output or merges the output \
+            into the queued output of the same entity).
+
+        Args:
+            output_sendings (list[tuple[OutputModel, list[OutputAttributeRecord], \
+                list[OutputCommandRecord]]]): Output entities with the attributes \
+                and commands to send
+        """
+        for sending in output_sendings:
+            output_entity = sending[0]
+            if output_entity.interface not in self.output_writers:
+                queue = OutputQueue(
+                    maxsize=self.env.output_queue_size,
+                    policy=self.env.output_queue_policy,
+                    name=output_entity.interface.value,
+                    merge=self._merge_output_sendings,
+                )
+                self.output_writers[output_entity.interface] = (
+                    queue,
+                    asyncio.create_task(self._run_output_writer(queue=queue)),
+                )
+            queue, _ = self.output_writers[output_entity.interface]
+            await queue.put(key=output_entity.id, item=sending)
+
+    @staticmethod
+    def _merge_output_sendings(
+        queued_sending: tuple[
+            OutputModel, list[OutputAttributeRecord], list[OutputCommandRecord]
+        ],
+        sending: tuple[OutputModel, list[OutputAttributeRecord], list[OutputCommandRecord]],
+    ) -> tuple[OutputModel, list[OutputAttributeRecord], list[OutputCommandRecord]]:
+        """
+        Function to merge a new output of an entity into the queued output \
+            of the entity, the new values replace the queued values \
+            of the same attributes and commands
+
+        Args:
+            queued_sending (tuple[OutputModel, list[OutputAttributeRecord], \
+                list[OutputCommandRecord]]): Queued output of the entity
+            sending (tuple[OutputModel, list[OutputAttributeRecord], \
+                list[OutputCommandRecord]]): New output of the entity
+
+        Returns:
+            tuple[OutputModel, list[OutputAttributeRecord], list[OutputCommandRecord]]: \
+                Merged output of the entity
+        """
+        attributes = {attribute.id: attribute for attribute in queued_sending[1]}
+        attributes.update({attribute.id: attribute for attribute in sending[1]})
+        commands = {command.id: command for command in queued_sending[2]}
+        commands.update({command.id: command for command in sending[2]})
+        return sending[0], list(attributes.values()), list(commands.values())
+
+    async def _run_output_writer(self, queue: OutputQueue) -> None:
+        """
+        Function to send the outputs of a queue one after another in the background, \
+            until the task is cancelled (see `stop_output_writers`)
+
+        In the change-only mode, the unchanged values are removed when the output \
+            is sent, so that values of dropped or merged outputs are compared \
+            with the last sent values.
+
+        Args:
+            queue (OutputQueue): Queue with the outputs of an interface
+        """
+        timeout = self.env.output_timeout or None
+        while True:
+            _, (output_entity, output_attributes, output_commands) = await queue.get()
+            try:
+                if self.output_deduplicator is not None:
+                    output_attributes, output_commands = self._filter_unchanged_outputs(
+                        output_entity=output_entity,
+                        output_attributes=output_attributes,
+                        output_commands=output_commands,
+                    )
+                    if len(output_attributes) == 0 and len(output_commands) == 0:
+                        logger.debug(f"No changed outputs for the entity {output_entity.id}")
+                        continue
+                await asyncio.wait_for(
+                    self._send_output_entity(
+                        output_entity=output_entity,
+                        output_attributes=output_attributes,
+                        output_commands=output_commands,
+                        in_thread=True,
+                        record_timing=False,
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"Sending of the output entity {output_entity.id} "
+                    f"({output_entity.interface.value}) failed: timeout after {timeout} s"
+                )
+            except OutputSendingError as e:
+                # the error is already logged by the interface
+                logger.debug(e)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # the writer has to keep running for the next outputs
+                logger.error(
+                    f"Sending of the output entity {output_entity.id} "
+                    f"({output_entity.interface.value}) failed: {type(e).__name__}: {e}"
+                )
+            finally:
+                await queue.task_done()
+
+    async def stop_output_writers(self, timeout: Optional[float] = None) -> None:
+        """
+        Function to send the remaining outputs of the queues and stop the background writers
+
+        Args:
+            timeout (Optional[float]): Maximum time in seconds to wait for the remaining \
+                outputs (None: no limit), the outputs which are not sent are dropped
+        """
+        if len(self.output_writers) == 0:
+            return
+        queues = [queue for queue, _ in self.output_writers.values()]
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in queues)), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"{sum(len(queue) for queue in queues)} outputs in the queues "
+                "could not be sent before the service stopped"
+            )
+        for _, writer in self.output_writers.values():
+            writer.cancel()
+        await asyncio.gather(
+            *(writer for _, writer in self.output_writers.values()),
+            return_exceptions=True,
+        )
+        self.output_writers = {}
 
     async def _hold_sampling_time(
-        self, start_time: datetime, hold_time: Union[int, float]
-    ):
+        self,
+        start_time: float,
+        hold_time: Union[int, float],
+    ) -> float:
         """
         Wait in each cycle until the sampling time (or cycle time) is up. If the algorithm takes
         more time than the sampling time, a warning will be given.
+
+        The wait ends at the deadline (`start_time + hold_time`) or when the service \
+            is stopped. The deadline is the start time of the next cycle, \
+            so that the cycles stay on the grid of the sampling time without drift.
         Args:
-            start_time: datetime, start time of the cycle
+            start_time: float, start time of the cycle (`time.monotonic()`)
             hold_time: int or float, sampling time in seconds
+        Returns:
+            float: start time of the next cycle (`time.monotonic()`), \
+                the deadline or the actual time, if the cycle took too long
         """
-        if ((datetime.now() - start_time).total_seconds()) > hold_time:
-            logger.warning(
-                "The processing time is longer than the sampling time."
-                " The sampling time must be increased!"
-            )
-        while ((datetime.now() - start_time).total_seconds()) < hold_time:
-            if self.shutdown_event.is_set():
-                break
-            await asyncio.sleep(0.01)
+        deadline = start_time + hold_time
+        now = time.monotonic()
+        if now > deadline:
+            if hold_time > 0:
+                logger.warning(
+                    "The processing time is longer than the sampling time."
+                    " The sampling time must be increased!"
+                )
+            return now
+
+        await self._wait_for_shutdown(timeout=deadline - now)
+        return deadline
+
+    async def _wait_for_shutdown(self, timeout: float) -> bool:
+        """
+        Function to wait until the service is stopped or the timeout is up \
+            (without polling)
+
+        Args:
+            timeout (float): Maximum time to wait in seconds
+
+        Returns:
+            bool: True, if the service is stopped
+        """
+        try:
+            await asyncio.wait_for(self.shutdown_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
 
     async def calculation(
         self,
@@ -510,10 +1376,10 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
             return output_data
 
         for component in data_output.components:
-            for output in self.config.outputs:
-                if output.id == component.entity_id:
-                    self._process_attributes(component, output, output_attrs)
-                    self._process_commands(component, output, output_cmds)
+            output = self._get_output_entity_config(output_entity_id=component.entity_id)
+            if output is not None:
+                self._process_attributes(component, output, output_attrs)
+                self._process_commands(component, output, output_cmds)
 
         for output in self.config.outputs:
             attributes = output_attrs.get(output.id, [])
@@ -533,24 +1399,25 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
         output_attrs: dict,
     ) -> dict:
         """Helper function to process attributes."""
-        for attribute in output.attributes:
-            if attribute.id == component.attribute_id:
-                if output.id not in output_attrs:
-                    output_attrs[output.id] = []
-
-                attribute.value = (
-                    component.value if component.value is not None else attribute.value
-                )
-
-                output_attrs[output.id].append(
-                    AttributeModel(
-                        id=attribute.id,
-                        value=attribute.value,
-                        unit=component.unit,
-                        timestamp=component.timestamp,
-                    )
+        attribute = self._get_output_attribute_config(
+            output_entity_id=output.id, output_attribute_id=component.attribute_id
+        )
+        if attribute is not None:
+            if output.id not in output_attrs:
+                output_attrs[output.id] = []
+
+            output_attrs[output.id].append(
+                AttributeModel(
+                    id=attribute.id,
+                    value=self._get_output_value(
+                        key=(output.id, attribute.id),
+                        value=component.value,
+                        default=attribute.value,
+                    ),
+                    unit=component.unit,
+                    timestamp=component.timestamp,
                 )
-                break
+            )
         return output_attrs
 
     def _process_commands(
@@ -560,30 +1427,58 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
         output_cmds: dict,
     ) -> dict:
         """Helper function to process commands."""
-        for command in output.commands:
-            if command.id == component.attribute_id:
-                if output.id not in output_cmds:
-                    output_cmds[output.id] = []
-
-                # TODO: type checking necessary? Dataframes and bools not allowed for commands
-                command.value = (
-                    component.value if component.value is not None else command.value
-                )
-
-                output_cmds[output.id].append(
-                    CommandModel(id=command.id, value=command.value)
+        command = self._get_output_command_config(
+            output_entity_id=output.id, output_command_id=component.attribute_id
+        )
+        if command is not None:
+            if output.id not in output_cmds:
+                output_cmds[output.id] = []
+
+            # TODO: type checking necessary? Dataframes and bools not allowed for commands
+            output_cmds[output.id].append(
+                CommandModel(
+                    id=command.id,
+                    value=self._get_output_value(
+                        key=(output.id, command.id),
+                        value=component.value,
+                        default=command.value,
+                    ),
                 )
-                break
+            )
         return output_cmds
 
+    def _get_output_value(self, key: tuple[str, str], value: Any, default: Any) -> Any:
+        """
+        Function to get the value of an output: the value of the calculation \
+            or, if there is no value, the last value of the output
+
+        Args:
+            key (tuple[str, str]): ID of the output entity and the attribute / command
+            value (Any): Value of the calculation (None: no value)
+            default (Any): Value of the configuration, if there is no last value
+
+        Returns:
+            Any: Value of the output
+        """
+        if value is not None:
+            self._last_output_values[key] = value
+            return value
+        return self._last_output_values.get(key, default)
+
     def cleanup_service(self):
         """
         Cleanup the service resources:
             - MQTT Client
+            - FIWARE Clients
+            - Metrics endpoint
         If more resources are added in the future, make sure to clean them up here.
         """
 
         self.stop_mqtt_client()
+        self.stop_fiware_client()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
         logger.debug("Service stopped, cleanup finished.")
 
     async def start_service(self):
@@ -599,35 +1494,34 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
         )
 
         logger.info("Start the Service")
-        # Hold the service for a time at the beginning,
-        await self._hold_sampling_time(
-            start_time=datetime.now(),
-            hold_time=self.env.start_hold_time,
-        )
+        # Hold the service for a time at the beginning (first tick of the scheduler)
+        scheduler = self._create_scheduler(period=sampling_time, name="calculation")
 
-        while not self.shutdown_event.is_set():
+        while not await scheduler.wait_for_tick(stop_event=self.shutdown_event):
             logger.debug("Start the Process")
-            start_time = datetime.now()
+            self.cycle_timings.start_cycle()
 
             if self.config.interfaces.fiware:
-                self.update_authentication()
+                with self.cycle_timings.phase("auth"):
+                    self.update_authentication()
 
             data_input = await self.get_data(method=DataQueryTypes.CALCULATION)
 
             if data_input is not None:
-                data_output = await self.calculation(data=data_input)
+                with self.cycle_timings.phase("calculation"):
+                    data_output = await self.calculation(data=data_input)
 
-                data_output = self.prepare_output(data_output=data_output)
+                with self.cycle_timings.phase("prepare_output"):
+                    data_output = self.prepare_output(data_output=data_output)
 
                 await self.send_outputs(data_output=data_output)
 
+            self._record_cycle_metrics(cycle_timings=self.cycle_timings.end_cycle())
             await self._set_health_timestamp()
 
-            await self._hold_sampling_time(
-                start_time=start_time, hold_time=sampling_time
-            )
-
         logger.debug("Service will be stopped, running cleanup")
+        await self.stop_output_writers(timeout=sampling_time)
+        await self.stop_fiware_client_async()
         self.cleanup_service()
 
     async def start_calibration(self):
@@ -648,29 +1542,42 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
                 self.config.controller_settings.time_settings.calibration.sampling_time_unit
             )
         )
-        await self._hold_sampling_time(
-            start_time=datetime.now(),
-            hold_time=self.env.start_hold_time,
-        )
+        scheduler = self._create_scheduler(period=sampling_time, name="calibration")
 
-        while not self.shutdown_event.is_set():
+        while not await scheduler.wait_for_tick(stop_event=self.shutdown_event):
             logger.debug("Start Calibration")
-            start_time = datetime.now()
             data_input = await self.get_data(method=DataQueryTypes.CALIBRATION)
             await self.calibration(data=data_input)
-
-            await self._hold_sampling_time(
-                start_time=start_time, hold_time=sampling_time
-            )
         logger.debug("Calibration was stopped")
 
+    def _create_scheduler(self, period: float, name: str) -> CycleScheduler:
+        """
+        Function to create the scheduler of a loop, which starts \
+            after the hold time at the beginning (`start_hold_time`)
+
+        Args:
+            period (float): Sampling time of the loop in seconds
+            name (str): Name of the loop (e.g. `calculation`)
+
+        Returns:
+            CycleScheduler: Scheduler of the loop, also available in `schedulers`
+        """
+        scheduler = CycleScheduler(
+            period=period,
+            policy=self.env.overrun_policy,
+            start_time=time.monotonic() + (self.env.start_hold_time or 0.0),
+            name=name,
+        )
+        self.schedulers[name] = scheduler
+        return scheduler
+
     async def check_health_status(self):
         """
         Function to check the health-status of the service
         """
         logger.debug("Start the Health-Check")
+        start_time = time.monotonic()
         while not self.shutdown_event.is_set():
-            start_time = datetime.now()
             sampling_time = (
                 self.config.controller_settings.time_settings.calculation.sampling_time
                 * get_time_unit_seconds(
@@ -681,10 +1588,42 @@ class ControllerBasicService(FiwareConnection, FileConnection, MqttConnection):
             await update_health_file(
                 time_cycle=sampling_time,
                 timestamp_health=self.timestamp_health,
-                timestamp_now=start_time,
+                timestamp_now=datetime.now(),
             )
 
-            await self._hold_sampling_time(start_time=start_time, hold_time=10)
+            start_time = await self._hold_sampling_time(
+                start_time=start_time, hold_time=10
+            )
+
+    def _record_cycle_metrics(self, cycle_timings: dict[str, float]) -> None:
+        """
+        Function to record the durations of a calculation cycle in the metrics
+
+        Args:
+            cycle_timings (dict[str, float]): Durations of the phases of the cycle \
+                in seconds, the duration of the whole cycle as `cycle`
+        """
+        for phase, duration in cycle_timings.items():
+            if phase == "cycle":
+                METRICS.observe(CYCLE_DURATION, duration)
+            else:
+                METRICS.observe(CYCLE_PHASE_DURATION, duration, phase=phase)
+
+    def get_cycle_timings(self) -> dict[str, PhaseTimingModel]:
+        """
+        Function to get the summary of the durations of the phases of the last cycles \
+            (number of cycles: `cycle_timing_buffer_size`)
+
+        The phases are `auth`, `output_timestamps`, `fiware_input_entities`, \
+            `input:<entity id>`, `staticdata`, `calculation`, `prepare_output`, \
+            `send:<interface>` and `cycle` for the whole cycle \
+            (without the waiting for the sampling time).
+
+        Returns:
+            dict[str, PhaseTimingModel]: Summary (count, p50, p95, max in seconds) \
+                with the name of the phase as key
+        """
+        return self.cycle_timings.summary()
 
     async def _set_health_timestamp(self):
         """
@@ -27,10 +27,13 @@ from encodapy.config.models import DataFileEntity, FileStorageMethod
 from encodapy.utils.models import (
     InputDataAttributeModel,
     InputDataEntityModel,
+    OutputAttributeRecord,
+    OutputCommandRecord,
     OutputDataAttributeModel,
     OutputDataEntityModel,
     StaticDataEntityModel,
 )
+from encodapy.utils.timestamps import parse_timestamp
 from encodapy.utils.error_handling import NotSupportedError
 
 
@@ -207,7 +210,7 @@ class FileConnection:
             return time_string
 
         try:
-            time = datetime.fromisoformat(time_string)
+            time = parse_timestamp(time_string)
             if time.tzinfo is None:
                 logger.debug(
                     f"Time string '{time_string}' has no timezone info. "
@@ -446,15 +449,16 @@ class FileConnection:
     def send_data_to_json_file(
         self,
         output_entity: OutputModel,
-        output_attributes: list[AttributeModel],
-        output_commands: list[CommandModel],
+        output_attributes: list[Union[AttributeModel, OutputAttributeRecord]],
+        output_commands: list[Union[CommandModel, OutputCommandRecord]],
     ) -> None:
         """_Function to create a json_file in result-folder
 
         Args:
             output_entity (OutputModel): _description_
-            output_attributes (list[AttributeModel]): _description_
-            output_commands (list[CommandModel]): _description_
+            output_attributes (list[Union[AttributeModel, OutputAttributeRecord]]): \
+                _description_
+            output_commands (list[Union[CommandModel, OutputCommandRecord]]): _description_
 
         Out: Json-file
 
@@ -3,9 +3,12 @@ Description: This file contains the class FiwareConnections,
 which is used to store the connection parameters for the Fiware and CrateDB connections.
 Author: Martin Altenburger
 """
+import asyncio
+import time
 from asyncio import sleep
 from datetime import datetime, timedelta, timezone
-from typing import Union, Optional
+from typing import Awaitable, Callable, Iterator, Optional, Union
+from urllib.parse import urljoin
 import concurrent.futures
 import multiprocessing
 from loguru import logger
@@ -15,12 +18,22 @@ import requests
 from dateutil import tz
 from filip.clients.ngsi_v2 import ContextBrokerClient
 from filip.models.base import DataType, FiwareHeaderSecure
-from filip.models.ngsi_v2.base import NamedMetadata
+from filip.models.ngsi_v2.base import EntityPattern, NamedMetadata
+from filip.models.ngsi_v2.subscriptions import (
+    Condition,
+    Http,
+    Notification,
+    Subject,
+    Subscription,
+)
 from filip.models.ngsi_v2.context import (
+    ActionType,
     ContextAttribute,
     ContextEntity,
     NamedCommand,
     NamedContextAttribute,
+    PropertyFormat,
+    Query,
 )
 from filip.clients.exceptions import BaseHttpClientException
 from encodapy.config import (
@@ -29,17 +42,23 @@ from encodapy.config import (
     CommandModel,
     DataQueryTypes,
     InputModel,
+    Interfaces,
     OutputModel,
     TimerangeTypes,
     ConfigModel,
 )
-from encodapy.utils.error_handling import NoCredentials, InterfaceNotActive
+from encodapy.utils.error_handling import ConfigError, NoCredentials, InterfaceNotActive
 from encodapy.utils.cratedb import CrateDBConnection
 from encodapy.utils.fiware_auth import BaererToken
+from encodapy.utils.fiware_client import AsyncContextBrokerClient
+from encodapy.utils.fiware_notifications import FiwareNotificationReceiver
+from encodapy.utils.timestamps import parse_timestamp
 from encodapy.utils.models import (
     InputDataAttributeModel,
     InputDataEntityModel,
     MetaDataModel,
+    OutputAttributeRecord,
+    OutputCommandRecord,
     OutputDataAttributeModel,
     OutputDataEntityModel,
     FiwareDatapointParameter,
@@ -55,6 +74,9 @@ from encodapy.utils.units import (
 )
 from encodapy.config.env_values import FiwareEnvVariables
 
+SECONDS_PER_DAY = 86400
+FIWARE_REQUEST_ATTEMPTS = 3
+FIWARE_REQUEST_RETRY_DELAY = 0.1
 
 class FiwareConnection:
     """
@@ -68,7 +90,22 @@ class FiwareConnection:
         self.fiware_token_client: BaererToken = None
         self.fiware_header: FiwareHeaderSecure = None
         self.cb_client: ContextBrokerClient = None
+        self.cb_client_async: Optional[AsyncContextBrokerClient] = None
+        self._cb_client_async_closing: Optional[asyncio.Task] = None
         self.crate_db_client: CrateDBConnection = None
+        self._fiware_entity_types: dict[str, str] = {}
+        self.fiware_notification_receiver: Optional[FiwareNotificationReceiver] = None
+        self.fiware_notification_store: dict[
+            str, tuple[str, dict[str, ContextAttribute]]
+        ] = {}
+        self._fiware_notification_times: dict[str, float] = {}
+        self._fiware_subscription_id: Optional[str] = None
+        self._fiware_output_timestamps: dict[
+            str, tuple[float, dict[str, datetime]]
+        ] = {}
+        self._timeseries_window_cache: dict[
+            tuple[str, str, tuple[str, ...]], tuple[pd.Timestamp, pd.DataFrame]
+        ] = {}
         self.config: ConfigModel
 
     def load_fiware_params(self)->None:
@@ -104,13 +141,41 @@ class FiwareConnection:
             service=fiware_env.service,
             service_path=fiware_env.service_path,
             authentication=fiware_auth,
+            async_client=fiware_env.async_client,
+            timeout=fiware_env.timeout,
+            max_connections=fiware_env.max_connections,
+            timeseries_batch_size=fiware_env.timeseries_batch_size,
+            bulk_query=fiware_env.bulk_query,
+            output_timestamp_refresh_interval=(
+                fiware_env.output_timestamp_refresh_interval
+            ),
+            subscription=fiware_env.subscription,
+            notification_url=(
+                str(fiware_env.notification_url)
+                if fiware_env.notification_url is not None
+                else None
+            ),
+            notification_host=fiware_env.notification_host,
+            notification_port=fiware_env.notification_port,
         )
+        if fiware_params.subscription and fiware_params.notification_url is None:
+            raise ConfigError(
+                "The URL for the notifications (FIWARE_NOTIFICATION_URL) is required "
+                "for the subscription of the input entities"
+            )
 
         database_params = DatabaseParameter(
             crate_db_url=str(fiware_env.crate_db_url),
             crate_db_user=fiware_env.crate_db_user,
             crate_db_pw=fiware_env.crate_db_pw,
             crate_db_ssl=fiware_env.crate_db_ssl,
+            crate_db_pool_size=fiware_env.crate_db_pool_size,
+            crate_db_idle_timeout=fiware_env.crate_db_idle_timeout,
+            crate_db_health_check_interval=fiware_env.crate_db_health_check_interval,
+            crate_db_schema_cache_ttl=fiware_env.crate_db_schema_cache_ttl,
+            crate_db_resampling=fiware_env.crate_db_resampling,
+            crate_db_chunk_size=fiware_env.crate_db_chunk_size,
+            crate_db_window_cache=fiware_env.crate_db_window_cache,
         )
 
         self.fiware_conn_params = FiwareConnectionParameter(
@@ -146,6 +211,10 @@ class FiwareConnection:
                     client_secret=fiware_auth.client_secret,
                     token_url=fiware_auth.token_url,
                 )
+                self.fiware_token_client.check_token()
+                self.fiware_token_client.start_refresh(
+                    on_refresh=self._set_fiware_authorization
+                )
             self.fiware_header = FiwareHeaderSecure(
                 service=self.fiware_conn_params.fiware_params.service,
                 service_path=self.fiware_conn_params.fiware_params.service_path,
@@ -163,252 +232,959 @@ class FiwareConnection:
         )
         self.check_fiware_connection()
 
+        if self.fiware_conn_params.fiware_params.async_client:
+            self.cb_client_async = AsyncContextBrokerClient(
+                url=self.fiware_conn_params.fiware_params.cb_url,
+                fiware_header=self.fiware_header,
+                timeout=self.fiware_conn_params.fiware_params.timeout,
+                max_connections=self.fiware_conn_params.fiware_params.max_connections,
+            )
+
+        if self.fiware_conn_params.fiware_params.subscription:
+            self.start_fiware_subscription()
+
         self.crate_db_client = CrateDBConnection(
             crate_db_url=self.fiware_conn_params.database_params.crate_db_url,
             crate_db_user=self.fiware_conn_params.database_params.crate_db_user,
             crate_db_pw=self.fiware_conn_params.database_params.crate_db_pw,
             crate_db_ssl=self.fiware_conn_params.database_params.crate_db_ssl,
+            pool_size=self.fiware_conn_params.database_params.crate_db_pool_size,
+            idle_timeout=self.fiware_conn_params.database_params.crate_db_idle_timeout,
+            health_check_interval=(
+                self.fiware_conn_params.database_params.crate_db_health_check_interval
+            ),
+            schema_cache_ttl=(
+                self.fiware_conn_params.database_params.crate_db_schema_cache_ttl
+            ),
         )
 
-    def update_authentication(self):
+    def start_fiware_subscription(self) -> None:
         """
-        Update the authentication.
+        Function to subscribe the configured attributes of the FIWARE input entities \
+            at the Context Broker and to start the receiver for the notifications
+
+        The received entities are stored in the `fiware_notification_store`. \
+            If the receiver cannot be started (e.g. the port is in use) \
+            or the subscription fails, the input entities are queried in each cycle.
         """
-        if self.fiware_conn_params.fiware_params.authentication is not None and (
-            self.fiware_token_client.check_token() is False
-        ):
-            self.fiware_header.__dict__["authorization"] = (
-                self.fiware_token_client.baerer_token
+        entities = [
+            entity
+            for entity in self.config.inputs
+            if entity.interface == Interfaces.FIWARE
+        ]
+        if len(entities) == 0:
+            return
+
+        notification_receiver = FiwareNotificationReceiver(
+            callback=self._handle_fiware_notification,
+            host=self.fiware_conn_params.fiware_params.notification_host,
+            port=self.fiware_conn_params.fiware_params.notification_port,
+        )
+        try:
+            notification_receiver.start()
+        except OSError as err:
+            logger.error(
+                "Could not start the receiver for the FIWARE notifications, "
+                f"the input entities are queried instead: {err}"
             )
+            return
+        self.fiware_notification_receiver = notification_receiver
 
-    def _get_last_timestamp_for_fiware_output(
-        self, output_entity: OutputModel
-    ) -> tuple[OutputDataEntityModel, Union[datetime, None]]:
+        query = self._get_fiware_entities_query(entities=entities)
+        try:
+            self._fiware_subscription_id = self.cb_client.post_subscription(
+                subscription=Subscription(
+                    description="Subscription of the input entities of an encodapy service",
+                    subject=Subject(
+                        entities=query.entities,
+                        condition=Condition(attrs=query.attrs or []),
+                    ),
+                    notification=Notification(
+                        http=Http(
+                            url=self.fiware_conn_params.fiware_params.notification_url
+                        ),
+                        attrs=query.attrs or [],
+                    ),
+                ),
+                update=True,
+            )
+        except (requests.exceptions.ConnectionError, BaseHttpClientException) as err:
+            logger.error(
+                f"Could not subscribe the input entities, they are queried instead: {err}"
+            )
+            self.fiware_notification_receiver.stop()
+            self.fiware_notification_receiver = None
+            return
+
+        logger.info(
+            f"Input entities subscribed at the Context Broker "
+            f"(subscription {self._fiware_subscription_id})"
+        )
+
+    def _handle_fiware_notification(self, entities: list[dict]) -> None:
         """
-        Function to get the latest timestamps of the output entity from the FIWARE platform
+        Function to update the store with the entities of a notification
 
-        Args:
-            output_entity (OutputModel): Output entity
+        Each entry of the store is replaced as a whole, so that the store can be read \
+            without a lock while the receiver updates it. The time of the notification \
+            is stored to detect outdated entries.
 
-        Returns:
-            tuple[OutputDataEntityModel, Union[datetime, None]]:
-                - OutputDataEntityModel with timestamps for the attributes
-                - the latest timestamp of the output entity for the attribute
-                with the oldest value (None if no timestamp is available)
+        Args:
+            entities (list[dict]): Entities of the notification (normalized format)
         """
-        try:
-            output_attributes_entity = self.cb_client.get_entity_attributes(
-                entity_id=output_entity.id_interface
+        for entity in entities:
+            entity_type, attributes = self._get_type_and_attributes_of_fiware_entity(
+                ContextEntity(**entity)
             )
+            stored_entity = self.fiware_notification_store.get(entity["id"])
+            if stored_entity is not None:
+                attributes = {**stored_entity[1], **attributes}
+            self.fiware_notification_store[entity["id"]] = (entity_type, attributes)
+            self._fiware_notification_times[entity["id"]] = time.monotonic()
+
+    def get_fiware_entities_from_notifications(
+        self, entities: list[InputModel], max_age: Optional[float] = None
+    ) -> dict[str, tuple[str, dict[str, ContextAttribute]]]:
+        """
+        Function to get the types and the attributes of the entities \
+            from the store of the received notifications
 
-            output_attributes_controller = {
-                item.id_interface: item.id for item in output_entity.attributes
-            }
-        except requests.exceptions.ConnectionError as err:
-            logger.error(f"""No connection to platform (ConnectionError): {err}""")
+        Args:
+            entities (list[InputModel]): Entities to get
+            max_age (Optional[float]): Maximum age of the last notification of an entity \
+                in seconds (None: no limit), older entities are not included \
+                and have to be queried
 
-            return None
-        except BaseHttpClientException as err:
-            logger.error(f"Could not get entity from FIWARE platform: {err}")
-            return None
+        Returns:
+            dict[str, tuple[str, dict[str, ContextAttribute]]]: Type and attributes \
+                for each entity with a received notification, with the ID as key
+        """
+        if self.fiware_notification_receiver is None:
+            return {}
 
-        timestamps = []
-        for attr in list(output_attributes_entity.keys()):
-            if attr not in list(output_attributes_controller.keys()):
+        now = time.monotonic()
+        fiware_entities = {}
+        for entity in entities:
+            if entity.id_interface not in self.fiware_notification_store:
                 continue
             if (
-                output_attributes_entity[attr].metadata.get("TimeInstant") is not None
-                and output_attributes_entity[attr].metadata.get("TimeInstant").value
-                is not None
+                max_age is not None
+                and now - self._fiware_notification_times[entity.id_interface] > max_age
             ):
-                timestamps.append(
-                    OutputDataAttributeModel(
-                        id=output_attributes_controller[attr],
-                        latest_timestamp_output=datetime.strptime(
-                            output_attributes_entity[attr]
-                            .metadata.get("TimeInstant")
-                            .value,
-                            "%Y-%m-%dT%H:%M:%S.%f%z",
-                        ),
-                    )
+                logger.debug(
+                    f"No notification for the entity {entity.id_interface} "
+                    f"within {max_age} s, the entity is queried"
+                )
+                continue
+            fiware_entities[entity.id_interface] = self.fiware_notification_store[
+                entity.id_interface
+            ]
+        return fiware_entities
+
+    def stop_fiware_subscription(self) -> None:
+        """
+        Function to delete the subscription of the input entities \
+            and to stop the receiver for the notifications
+        """
+        if self._fiware_subscription_id is not None and self.cb_client is not None:
+            try:
+                self.cb_client.delete_subscription(
+                    subscription_id=self._fiware_subscription_id
                 )
+            except (requests.exceptions.ConnectionError, BaseHttpClientException) as err:
+                logger.warning(f"Could not delete the subscription: {err}")
+            self._fiware_subscription_id = None
 
-        if len(timestamps) > 0:
-            timestamp_latest_output = min(
-                item.latest_timestamp_output for item in timestamps
-            )
-        else:
-            timestamp_latest_output = None
+        if self.fiware_notification_receiver is not None:
+            self.fiware_notification_receiver.stop()
+            self.fiware_notification_receiver = None
 
-        return (
-            OutputDataEntityModel(id=output_entity.id, attributes_status=timestamps),
-            timestamp_latest_output,
-        )
+    async def stop_fiware_client_async(self) -> None:
+        """
+        Function to close the clients for the Context Broker and the CrateDB \
+            in a running event loop, the asynchronous client is closed with `await`
 
-    def _get_metadata_from_fiware(
-        self, fiware_attribute: ContextAttribute
-    ) -> MetaDataModel:
-        """Function to get the metadata from the fiware attribute
+        A close of the asynchronous client, which was started by `stop_fiware_client` \
+            in the event loop, is also awaited.
+        """
+        if self.cb_client_async is not None:
+            await self.cb_client_async.close()
+            self.cb_client_async = None
+
+        self.stop_fiware_client()
+
+        if self._cb_client_async_closing is not None:
+            await self._cb_client_async_closing
+            self._cb_client_async_closing = None
+
+    def stop_fiware_client(self) -> None:
+        """
+        Function to close the clients for the Context Broker and the CrateDB
+
+        In a running event loop, the asynchronous client should be closed \
+            with `stop_fiware_client_async`. Here, it is only closed in a task, \
+            which is awaited by `stop_fiware_client_async` during the shutdown.
+        """
+        self.stop_fiware_subscription()
+
+        if self.fiware_token_client is not None:
+            self.fiware_token_client.stop_refresh()
+
+        if self.cb_client is not None:
+            self.cb_client.close()
+
+        if self.crate_db_client is not None:
+            self.crate_db_client.close()
+
+        if self.cb_client_async is not None:
+            try:
+                self._cb_client_async_closing = asyncio.get_running_loop().create_task(
+                    self.cb_client_async.close()
+                )
+            except RuntimeError:
+                asyncio.run(self.cb_client_async.close())
+            self.cb_client_async = None
+
+    def _get_fiware_entity_with_attributes(
+        self, entity_id: str, attrs: Optional[list[str]] = None
+    ) -> tuple[str, dict[str, ContextAttribute]]:
+        """
+        Function to get the type and the attributes of an entity \
+            from the Context Broker with a single request
+
+        The type of the entity is cached after the first request, \
+            because the type of an entity can not change.
 
         Args:
-            fiware_attribute (ContextAttribute): Fiware attribute
+            entity_id (str): ID of the entity
+            attrs (Optional[list[str]]): Names of the attributes to retrieve (default: all)
 
         Returns:
-            MetaDataModel: Model with the metadata (timestamp, unit) of the attribute if available
+            tuple[str, dict[str, ContextAttribute]]: Type and attributes of the entity
         """
-        metadata_lowercase = {
-            k.lower(): v for k, v in fiware_attribute.metadata.items()
-        }
+        try:
+            fiware_entity = self.cb_client.get_entity(
+                entity_id=entity_id,
+                entity_type=self._fiware_entity_types.get(entity_id),
+                attrs=attrs or None,
+            )
+        except BaseHttpClientException:
+            self._fiware_entity_types.pop(entity_id, None)
+            raise
 
-        metadata_model = MetaDataModel()
+        return self._get_type_and_attributes_of_fiware_entity(fiware_entity)
 
-        if metadata_lowercase.get("timeinstant") is not None:
-            metadata_model.timestamp = datetime.strptime(
-                metadata_lowercase.get("timeinstant").value, "%Y-%m-%dT%H:%M:%S.%f%z"
+    async def _get_fiware_entity_with_attributes_async(
+        self, entity_id: str, attrs: Optional[list[str]] = None
+    ) -> tuple[str, dict[str, ContextAttribute]]:
+        """
+        Function to get the type and the attributes of an entity \
+            from the Context Broker with a single request \
+            (see `_get_fiware_entity_with_attributes`), \
+            with the asynchronous client if it is enabled
+
+        Args:
+            entity_id (str): ID of the entity
+            attrs (Optional[list[str]]): Names of the attributes to retrieve (default: all)
+
+        Returns:
+            tuple[str, dict[str, ContextAttribute]]: Type and attributes of the entity
+        """
+        if self.cb_client_async is None:
+            return self._get_fiware_entity_with_attributes(
+                entity_id=entity_id, attrs=attrs
             )
 
         try:
-            if metadata_lowercase.get("unitcode") is not None:
-                metadata_model.unit = DataUnits(
-                    metadata_lowercase.get("unitcode").value
-                )
-            elif metadata_lowercase.get("unittext") is not None:
-                metadata_model.unit = DataUnits(
-                    metadata_lowercase.get("unittext").value
-                )
-            elif metadata_lowercase.get("unit") is not None:
-                metadata_model.unit = DataUnits(metadata_lowercase.get("unit").value)
-        except ValueError as err:
-            logger.error(
-                f"Unit code {metadata_lowercase.get('unitcode').value} not available: {err}"
+            fiware_entity = await self.cb_client_async.get_entity(
+                entity_id=entity_id,
+                entity_type=self._fiware_entity_types.get(entity_id),
+                attrs=attrs,
             )
+        except BaseHttpClientException:
+            self._fiware_entity_types.pop(entity_id, None)
+            raise
 
-        return metadata_model
+        return self._get_type_and_attributes_of_fiware_entity(fiware_entity)
 
-    def get_data_from_fiware(
-        self,
-        method: DataQueryTypes,
-        entity: InputModel,
-        timestamp_latest_output: Union[datetime, None],
-    ) -> Union[InputDataEntityModel, None]:
+    def _get_type_and_attributes_of_fiware_entity(
+        self, fiware_entity: ContextEntity
+    ) -> tuple[str, dict[str, ContextAttribute]]:
         """
-        Function fetches the data for evaluation which have not yet been evaluated.
-            First get the last timestamp of the output entity. Then get the data from
-            the entity since the last timestamp of the output entity from cratedb.
+        Function to cache the type of an entity and to get its attributes
+
         Args:
-            - method (DataQueryTypes): Keyword for type of query
-            - entity (InputModel): Input entity
-            - timestamp_latest_output (datetime): Timestamp of the last output
+            fiware_entity (ContextEntity): Entity from the Context Broker
 
         Returns:
-            - InputDataEntityModel: Model with the input data or None
-            if the connection to the platform is not available
+            tuple[str, dict[str, ContextAttribute]]: Type and attributes of the entity
+        """
+        self._fiware_entity_types[fiware_entity.id] = fiware_entity.type
 
+        return fiware_entity.type, fiware_entity.get_attributes(
+            response_format=PropertyFormat.DICT, strict_data_type=False
+        )
+
+    def _get_fiware_entities_query(self, entities: list[InputModel]) -> Query:
         """
+        Function to create the query for the configured attributes of several entities
 
-        attributes_timeseries = {}
-        attributes_values = []
+        Args:
+            entities (list[InputModel]): Entities to query
+
+        Returns:
+            Query: Query with the entities (and their cached types) and the attributes
+        """
+        entity_ids = list(dict.fromkeys(entity.id_interface for entity in entities))
+        attributes = list(
+            dict.fromkeys(
+                attribute.id_interface
+                for entity in entities
+                for attribute in entity.attributes
+            )
+        )
+        return Query(
+            entities=[
+                EntityPattern(
+                    id=entity_id, type=self._fiware_entity_types.get(entity_id)
+                )
+                for entity_id in entity_ids
+            ],
+            attrs=attributes or None,
+        )
+
+    def get_fiware_entities(
+        self, entities: list[InputModel]
+    ) -> dict[str, tuple[str, dict[str, ContextAttribute]]]:
+        """
+        Function to get the types and the attributes of several entities \
+            from the Context Broker with paginated bulk requests (POST /v2/op/query)
+
+        Args:
+            entities (list[InputModel]): Entities to query (input or static data entities)
 
+        Returns:
+            dict[str, tuple[str, dict[str, ContextAttribute]]]: Type and attributes \
+                for each found entity with the ID of the entity as key \
+                (empty if the query failed)
+        """
         if self.cb_client is None:
             raise InterfaceNotActive
+        if len(entities) == 0:
+            return {}
         try:
-
-            fiware_input_entity_type = self.cb_client.get_entity(
-                entity_id=entity.id_interface
-            ).type
-            fiware_input_entity_attributes = self.cb_client.get_entity_attributes(
-                entity_id=entity.id_interface, entity_type=fiware_input_entity_type
+            fiware_entities = self.cb_client.query(
+                query=self._get_fiware_entities_query(entities=entities)
             )
         except requests.exceptions.ConnectionError as err:
             logger.error(f"""No connection to platform (ConnectionError): {err}""")
-
-            return None
+            return {}
         except BaseHttpClientException as err:
-            logger.error(f"Could not get entity from FIWARE platform: {err}")
-            return None
-
-        for attribute in entity.attributes:
-
-            if attribute.id_interface not in fiware_input_entity_attributes:
-                logger.error(
-                    f"Attribute {attribute.id_interface} not found in entity {entity.id_interface}"
-                )
-                attributes_values.append(
-                    InputDataAttributeModel(
-                        id=attribute.id,
-                        data=None,
-                        data_type=attribute.type,
-                        data_available=False,
-                        latest_timestamp_input=None,
-                        unit=None,
-                    )
-                )
-
-                continue
-
-            if attribute.type == AttributeTypes.TIMESERIES:
-                attributes_timeseries[attribute.id] = {
-                    "id_interface": attribute.id_interface,
-                    "metadata": self._get_metadata_from_fiware(
-                        fiware_input_entity_attributes[attribute.id_interface]
-                    ),
-                }
+            logger.error(f"Could not query entities from FIWARE platform: {err}")
+            return {}
 
-            elif attribute.type == AttributeTypes.VALUE:
+        return {
+            fiware_entity.id: self._get_type_and_attributes_of_fiware_entity(
+                fiware_entity
+            )
+            for fiware_entity in fiware_entities
+        }
 
-                metadata = self._get_metadata_from_fiware(
-                    fiware_input_entity_attributes[attribute.id_interface]
-                )
-                attributes_values.append(
-                    InputDataAttributeModel(
-                        id=attribute.id,
-                        data=fiware_input_entity_attributes[
-                            attribute.id_interface
-                        ].value,
-                        data_type=AttributeTypes.VALUE,
-                        data_available=(
-                            fiware_input_entity_attributes[attribute.id_interface].value
-                            is not None
-                        ),
-                        latest_timestamp_input=metadata.timestamp,
-                        unit=metadata.unit,
-                    )
-                )
-            else:
-                logger.warning(
-                    f"Attribute type {attribute.type} for attribute {attribute.id}"
-                    f"of entity {entity.id} not supported."
-                )
-                raise NotImplementedError
+    async def get_fiware_entities_async(
+        self, entities: list[InputModel]
+    ) -> dict[str, tuple[str, dict[str, ContextAttribute]]]:
+        """
+        Function to get the types and the attributes of several entities \
+            like `get_fiware_entities`, with the asynchronous client if it is enabled
 
-        if len(attributes_timeseries) > 0:
+        Args:
+            entities (list[InputModel]): Entities to query (input or static data entities)
 
-            attributes_values.extend(
-                self.get_data_from_datebase(
-                    entity=ContextEntity(
-                        id=entity.id_interface, type=fiware_input_entity_type
-                    ),
-                    entity_attributes=attributes_timeseries,
-                    method=method,
-                    timestamp_latest_output=timestamp_latest_output,
-                )
+        Returns:
+            dict[str, tuple[str, dict[str, ContextAttribute]]]: Type and attributes \
+                for each found entity with the ID of the entity as key \
+                (empty if the query failed)
+        """
+        if self.cb_client_async is None:
+            return self.get_fiware_entities(entities=entities)
+        if len(entities) == 0:
+            return {}
+        try:
+            fiware_entities = await self.cb_client_async.query(
+                query=self._get_fiware_entities_query(entities=entities)
             )
+        except BaseHttpClientException as err:
+            logger.error(f"Could not query entities from FIWARE platform: {err}")
+            return {}
 
-        return InputDataEntityModel(id=entity.id, attributes=attributes_values)
+        return {
+            fiware_entity.id: self._get_type_and_attributes_of_fiware_entity(
+                fiware_entity
+            )
+            for fiware_entity in fiware_entities
+        }
 
-    def _calculate_timerange(
+    async def _update_fiware_entity_attributes(
         self,
-        time_now: datetime,
-        last_timestamp: Union[datetime, None],
-        timerange_value: int,
-        timerange_type: Union[TimerangeTypes, None],
-    ) -> tuple[str, str]:
-        """Function to calculate the timerange for the input data query based on
-        a fixed timerange from the configuration
+        entity_id: str,
+        entity_type: str,
+        attrs: list[NamedContextAttribute],
+    ) -> None:
+        """
+        Function to update or append attributes of an entity in the Context Broker, \
+            with the asynchronous client if it is enabled
 
         Args:
-            time_now (datetime): Time now
-            last_timestamp (datetime): Timestamp of the last output
+            entity_id (str): ID of the entity
+            entity_type (str): Type of the entity
+            attrs (list[NamedContextAttribute]): Attributes to update or append
+        """
+        if self.cb_client_async is not None:
+            await self.cb_client_async.update_or_append_entity_attributes(
+                entity_id=entity_id, entity_type=entity_type, attrs=attrs
+            )
+            return
+        self.cb_client.update_or_append_entity_attributes(
+            entity_id=entity_id, entity_type=entity_type, attrs=attrs
+        )
+
+    async def _update_fiware_entity_commands(
+        self,
+        entity_id: str,
+        entity_type: str,
+        cmds: list[NamedCommand],
+    ) -> None:
+        """
+        Function to update existing commands of an entity in the Context Broker, \
+            with the asynchronous client if it is enabled
+
+        Args:
+            entity_id (str): ID of the entity
+            entity_type (str): Type of the entity
+            cmds (list[NamedCommand]): Commands to update
+        """
+        if self.cb_client_async is not None:
+            await self.cb_client_async.update_existing_entity_attributes(
+                entity_id=entity_id, entity_type=entity_type, attrs=cmds
+            )
+            return
+        self.cb_client.update_existing_entity_attributes(
+            entity_id=entity_id, entity_type=entity_type, attrs=cmds
+        )
+
+    def update_authentication(self):
+        """
+        Update the authentication.
+
+        The token is refreshed in the background before it expires, \
+            so this is only a local check of the expiry (no request to the token endpoint).
+        """
+        if self.fiware_conn_params.fiware_params.authentication is not None and (
+            self.fiware_token_client.check_token() is False
+        ):
+            self._set_fiware_authorization(self.fiware_token_client.baerer_token)
+
+    def _set_fiware_authorization(self, baerer_token: str) -> None:
+        """
+        Function to set a new baerer-token in the FIWARE header, \
+            which is used by the clients for the Context Broker
+
+        Args:
+            baerer_token (str): The new baerer-token
+        """
+        if self.fiware_header is not None:
+            self.fiware_header.__dict__["authorization"] = baerer_token
+
+    def _get_last_timestamp_for_fiware_output(
+        self, output_entity: OutputModel
+    ) -> tuple[OutputDataEntityModel, Union[datetime, None]]:
+        """
+        Function to get the latest timestamps of the output entity from the FIWARE platform
+
+        Args:
+            output_entity (OutputModel): Output entity
+
+        Returns:
+            tuple[OutputDataEntityModel, Union[datetime, None]]:
+                - OutputDataEntityModel with timestamps for the attributes
+                - the latest timestamp of the output entity for the attribute
+                with the oldest value (None if no timestamp is available)
+        """
+        cached_timestamps = self._get_cached_output_timestamps(output_entity)
+        if cached_timestamps is not None:
+            return cached_timestamps
+
+        try:
+            _, output_attributes_entity = self._get_fiware_entity_with_attributes(
+                entity_id=output_entity.id_interface,
+                attrs=[item.id_interface for item in output_entity.attributes],
+            )
+        except requests.exceptions.ConnectionError as err:
+            logger.error(f"""No connection to platform (ConnectionError): {err}""")
+
+            return None
+        except BaseHttpClientException as err:
+            logger.error(f"Could not get entity from FIWARE platform: {err}")
+            return None
+
+        return self._get_output_timestamps_from_fiware_attributes(
+            output_entity=output_entity,
+            output_attributes_entity=output_attributes_entity,
+        )
+
+    async def _get_last_timestamp_for_fiware_output_async(
+        self, output_entity: OutputModel
+    ) -> tuple[OutputDataEntityModel, Union[datetime, None]]:
+        """
+        Function to get the latest timestamps of the output entity from the FIWARE platform \
+            without blocking the event loop, if the asynchronous client is enabled
+
+        Args:
+            output_entity (OutputModel): Output entity
+
+        Returns:
+            tuple[OutputDataEntityModel, Union[datetime, None]]:
+                - OutputDataEntityModel with timestamps for the attributes
+                - the latest timestamp of the output entity for the attribute
+                with the oldest value (None if no timestamp is available)
+        """
+        cached_timestamps = self._get_cached_output_timestamps(output_entity)
+        if cached_timestamps is not None:
+            return cached_timestamps
+
+        try:
+            _, output_attributes_entity = (
+                await self._get_fiware_entity_with_attributes_async(
+                    entity_id=output_entity.id_interface,
+                    attrs=[item.id_interface for item in output_entity.attributes],
+                )
+            )
+        except requests.exceptions.ConnectionError as err:
+            logger.error(f"""No connection to platform (ConnectionError): {err}""")
+
+            return None
+        except BaseHttpClientException as err:
+            logger.error(f"Could not get entity from FIWARE platform: {err}")
+            return None
+
+        return self._get_output_timestamps_from_fiware_attributes(
+            output_entity=output_entity,
+            output_attributes_entity=output_attributes_entity,
+        )
+
+    def _get_output_timestamps_from_fiware_attributes(
+        self,
+        output_entity: OutputModel,
+        output_attributes_entity: dict[str, ContextAttribute],
+    ) -> tuple[OutputDataEntityModel, Union[datetime, None]]:
+        """
+        Function to get the latest timestamps of the output entity \
+            from the attributes of the FIWARE entity
+
+        The timestamps are cached, if the refresh interval \
+            for the output timestamps is set.
+
+        Args:
+            output_entity (OutputModel): Output entity
+            output_attributes_entity (dict[str, ContextAttribute]): \
+                Attributes of the FIWARE entity
+
+        Returns:
+            tuple[OutputDataEntityModel, Union[datetime, None]]:
+                - OutputDataEntityModel with timestamps for the attributes
+                - the latest timestamp of the output entity for the attribute
+                with the oldest value (None if no timestamp is available)
+        """
+        output_attributes_controller = {
+            item.id_interface: item.id for item in output_entity.attributes
+        }
+
+        timestamps = {}
+        for attr in list(output_attributes_entity.keys()):
+            if attr not in list(output_attributes_controller.keys()):
+                continue
+            if (
+                output_attributes_entity[attr].metadata.get("TimeInstant") is not None
+                and output_attributes_entity[attr].metadata.get("TimeInstant").value
+                is not None
+            ):
+                timestamps[attr] = parse_timestamp(
+                    output_attributes_entity[attr].metadata.get("TimeInstant").value,
+                    default_timezone=timezone.utc,
+                )
+
+        if self.fiware_conn_params.fiware_params.output_timestamp_refresh_interval > 0:
+            self._fiware_output_timestamps[output_entity.id_interface] = (
+                time.monotonic(),
+                timestamps,
+            )
+
+        return self._get_output_timestamps_model(
+            output_entity=output_entity, timestamps=timestamps
+        )
+
+    @staticmethod
+    def _get_output_timestamps_model(
+        output_entity: OutputModel,
+        timestamps: dict[str, datetime],
+    ) -> tuple[OutputDataEntityModel, Union[datetime, None]]:
+        """
+        Function to create the model of the latest timestamps of an output entity
+
+        Args:
+            output_entity (OutputModel): Output entity
+            timestamps (dict[str, datetime]): Latest timestamps of the attributes \
+                with the IDs of the attributes on the interface as keys
+
+        Returns:
+            tuple[OutputDataEntityModel, Union[datetime, None]]:
+                - OutputDataEntityModel with timestamps for the attributes
+                - the latest timestamp of the output entity for the attribute
+                with the oldest value (None if no timestamp is available)
+        """
+        output_attributes_controller = {
+            item.id_interface: item.id for item in output_entity.attributes
+        }
+        attributes_status = [
+            OutputDataAttributeModel(
+                id=output_attributes_controller[attr],
+                latest_timestamp_output=timestamp,
+            )
+            for attr, timestamp in timestamps.items()
+            if attr in output_attributes_controller
+        ]
+
+        if len(attributes_status) > 0:
+            timestamp_latest_output = min(
+                item.latest_timestamp_output for item in attributes_status
+            )
+        else:
+            timestamp_latest_output = None
+
+        return (
+            OutputDataEntityModel(
+                id=output_entity.id, attributes_status=attributes_status
+            ),
+            timestamp_latest_output,
+        )
+
+    def _get_cached_output_timestamps(
+        self, output_entity: OutputModel
+    ) -> Optional[tuple[OutputDataEntityModel, Union[datetime, None]]]:
+        """
+        Function to get the latest timestamps of the output entity from the cache, \
+            if they were read from the Context Broker within the refresh interval
+
+        Args:
+            output_entity (OutputModel): Output entity
+
+        Returns:
+            Optional[tuple[OutputDataEntityModel, Union[datetime, None]]]: \
+                Timestamps like `_get_output_timestamps_from_fiware_attributes` \
+                or None, if they have to be read from the Context Broker
+        """
+        refresh_interval = (
+            self.fiware_conn_params.fiware_params.output_timestamp_refresh_interval
+        )
+        cached = self._fiware_output_timestamps.get(output_entity.id_interface)
+        if (
+            refresh_interval <= 0
+            or cached is None
+            or time.monotonic() - cached[0] > refresh_interval
+        ):
+            return None
+
+        return self._get_output_timestamps_model(
+            output_entity=output_entity, timestamps=cached[1]
+        )
+
+    def _update_cached_output_timestamps(
+        self, entity_id: str, attrs: list[NamedContextAttribute]
+    ) -> None:
+        """
+        Function to update the cached timestamps of an output entity \
+            with the timestamps of the successfully written attributes
+
+        Args:
+            entity_id (str): ID of the entity on the Context Broker
+            attrs (list[NamedContextAttribute]): Written attributes
+        """
+        cached = self._fiware_output_timestamps.get(entity_id)
+        if cached is None:
+            return
+
+        timestamps = dict(cached[1])
+        for attr in attrs:
+            if attr is None or attr.metadata.get("TimeInstant") is None:
+                continue
+            timestamps[attr.name] = parse_timestamp(
+                attr.metadata.get("TimeInstant").value, default_timezone=timezone.utc
+            )
+        self._fiware_output_timestamps[entity_id] = (cached[0], timestamps)
+
+    def _get_metadata_from_fiware(
+        self, fiware_attribute: ContextAttribute
+    ) -> MetaDataModel:
+        """Function to get the metadata from the fiware attribute
+
+        Args:
+            fiware_attribute (ContextAttribute): Fiware attribute
+
+        Returns:
+            MetaDataModel: Model with the metadata (timestamp, unit) of the attribute if available
+        """
+        metadata_lowercase = {
+            k.lower(): v for k, v in fiware_attribute.metadata.items()
+        }
+
+        metadata_model = MetaDataModel()
+
+        if metadata_lowercase.get("timeinstant") is not None:
+            metadata_model.timestamp = parse_timestamp(
+                metadata_lowercase.get("timeinstant").value,
+                default_timezone=timezone.utc,
+            )
+
+        try:
+            if metadata_lowercase.get("unitcode") is not None:
+                metadata_model.unit = DataUnits(
+                    metadata_lowercase.get("unitcode").value
+                )
+            elif metadata_lowercase.get("unittext") is not None:
+                metadata_model.unit = DataUnits(
+                    metadata_lowercase.get("unittext").value
+                )
+            elif metadata_lowercase.get("unit") is not None:
+                metadata_model.unit = DataUnits(metadata_lowercase.get("unit").value)
+        except ValueError as err:
+            logger.error(
+                f"Unit code {metadata_lowercase.get('unitcode').value} not available: {err}"
+            )
+
+        return metadata_model
+
+    def get_data_from_fiware(
+        self,
+        method: DataQueryTypes,
+        entity: InputModel,
+        timestamp_latest_output: Union[datetime, None],
+        fiware_entity: Optional[tuple[str, dict[str, ContextAttribute]]] = None,
+    ) -> Union[InputDataEntityModel, None]:
+        """
+        Function fetches the data for evaluation which have not yet been evaluated.
+            First get the last timestamp of the output entity. Then get the data from
+            the entity since the last timestamp of the output entity from cratedb.
+        Args:
+            - method (DataQueryTypes): Keyword for type of query
+            - entity (InputModel): Input entity
+            - timestamp_latest_output (datetime): Timestamp of the last output
+            - fiware_entity (Optional[tuple[str, dict[str, ContextAttribute]]]): \
+                Type and attributes of the entity, if they are already queried \
+                (e.g. with `get_fiware_entities`)
+
+        Returns:
+            - InputDataEntityModel: Model with the input data or None
+            if the connection to the platform is not available
+
+        """
+
+        if self.cb_client is None:
+            raise InterfaceNotActive
+        try:
+            fiware_input_entity_type, fiware_input_entity_attributes = (
+                fiware_entity
+                or self._get_fiware_entity_with_attributes(
+                    entity_id=entity.id_interface,
+                    attrs=[attribute.id_interface for attribute in entity.attributes],
+                )
+            )
+        except requests.exceptions.ConnectionError as err:
+            logger.error(f"""No connection to platform (ConnectionError): {err}""")
+
+            return None
+        except BaseHttpClientException as err:
+            logger.error(f"Could not get entity from FIWARE platform: {err}")
+            return None
+
+        return self._prepare_fiware_input_data(
+            method=method,
+            entity=entity,
+            fiware_input_entity_type=fiware_input_entity_type,
+            fiware_input_entity_attributes=fiware_input_entity_attributes,
+            timestamp_latest_output=timestamp_latest_output,
+        )
+
+    async def get_data_from_fiware_async(
+        self,
+        method: DataQueryTypes,
+        entity: InputModel,
+        timestamp_latest_output: Union[datetime, None],
+        fiware_entity: Optional[tuple[str, dict[str, ContextAttribute]]] = None,
+    ) -> Union[InputDataEntityModel, None]:
+        """
+        Function fetches the data for evaluation like `get_data_from_fiware`, \
+            but without blocking the event loop: The requests to the Context Broker \
+            use the asynchronous client and the database query runs in a worker thread.
+
+        Args:
+            - method (DataQueryTypes): Keyword for type of query
+            - entity (InputModel): Input entity
+            - timestamp_latest_output (datetime): Timestamp of the last output
+            - fiware_entity (Optional[tuple[str, dict[str, ContextAttribute]]]): \
+                Type and attributes of the entity, if they are already queried \
+                (e.g. with `get_fiware_entities_async`)
+
+        Returns:
+            - InputDataEntityModel: Model with the input data or None
+            if the connection to the platform is not available
+        """
+        if self.cb_client is None:
+            raise InterfaceNotActive
+        try:
+            fiware_input_entity_type, fiware_input_entity_attributes = (
+                fiware_entity
+                or await self._get_fiware_entity_with_attributes_async(
+                    entity_id=entity.id_interface,
+                    attrs=[attribute.id_interface for attribute in entity.attributes],
+                )
+            )
+        except requests.exceptions.ConnectionError as err:
+            logger.error(f"""No connection to platform (ConnectionError): {err}""")
+
+            return None
+        except BaseHttpClientException as err:
+            logger.error(f"Could not get entity from FIWARE platform: {err}")
+            return None
+
+        if any(
+            attribute.type is AttributeTypes.TIMESERIES
+            for attribute in entity.attributes
+        ):
+            return await asyncio.to_thread(
+                self._prepare_fiware_input_data,
+                method=method,
+                entity=entity,
+                fiware_input_entity_type=fiware_input_entity_type,
+                fiware_input_entity_attributes=fiware_input_entity_attributes,
+                timestamp_latest_output=timestamp_latest_output,
+            )
+
+        return self._prepare_fiware_input_data(
+            method=method,
+            entity=entity,
+            fiware_input_entity_type=fiware_input_entity_type,
+            fiware_input_entity_attributes=fiware_input_entity_attributes,
+            timestamp_latest_output=timestamp_latest_output,
+        )
+
+    def _prepare_fiware_input_data(
+        self,
+        method: DataQueryTypes,
+        entity: InputModel,
+        fiware_input_entity_type: str,
+        fiware_input_entity_attributes: dict[str, ContextAttribute],
+        timestamp_latest_output: Union[datetime, None],
+    ) -> InputDataEntityModel:
+        """
+        Function to prepare the input data from the attributes of the FIWARE entity. \
+            The timeseries data is queried from the database.
+
+        Args:
+            - method (DataQueryTypes): Keyword for type of query
+            - entity (InputModel): Input entity
+            - fiware_input_entity_type (str): Type of the FIWARE entity
+            - fiware_input_entity_attributes (dict[str, ContextAttribute]): \
+                Attributes of the FIWARE entity
+            - timestamp_latest_output (datetime): Timestamp of the last output
+
+        Returns:
+            - InputDataEntityModel: Model with the input data
+        """
+        attributes_timeseries = {}
+        attributes_values = []
+
+        for attribute in entity.attributes:
+
+            if attribute.id_interface not in fiware_input_entity_attributes:
+                logger.error(
+                    f"Attribute {attribute.id_interface} not found in entity {entity.id_interface}"
+                )
+                attributes_values.append(
+                    InputDataAttributeModel(
+                        id=attribute.id,
+                        data=None,
+                        data_type=attribute.type,
+                        data_available=False,
+                        latest_timestamp_input=None,
+                        unit=None,
+                    )
+                )
+
+                continue
+
+            if attribute.type == AttributeTypes.TIMESERIES:
+                attributes_timeseries[attribute.id] = {
+                    "id_interface": attribute.id_interface,
+                    "metadata": self._get_metadata_from_fiware(
+                        fiware_input_entity_attributes[attribute.id_interface]
+                    ),
+                }
+
+            elif attribute.type == AttributeTypes.VALUE:
+
+                metadata = self._get_metadata_from_fiware(
+                    fiware_input_entity_attributes[attribute.id_interface]
+                )
+                attributes_values.append(
+                    InputDataAttributeModel(
+                        id=attribute.id,
+                        data=fiware_input_entity_attributes[
+                            attribute.id_interface
+                        ].value,
+                        data_type=AttributeTypes.VALUE,
+                        data_available=(
+                            fiware_input_entity_attributes[attribute.id_interface].value
+                            is not None
+                        ),
+                        latest_timestamp_input=metadata.timestamp,
+                        unit=metadata.unit,
+                    )
+                )
+            else:
+                logger.warning(
+                    f"Attribute type {attribute.type} for attribute {attribute.id}"
+                    f"of entity {entity.id} not supported."
+                )
+                raise NotImplementedError
+
+        if len(attributes_timeseries) > 0:
+
+            attributes_values.extend(
+                self.get_data_from_datebase(
+                    entity=ContextEntity(
+                        id=entity.id_interface, type=fiware_input_entity_type
+                    ),
+                    entity_attributes=attributes_timeseries,
+                    method=method,
+                    timestamp_latest_output=timestamp_latest_output,
+                )
+            )
+
+        return InputDataEntityModel(id=entity.id, attributes=attributes_values)
+
+    def _calculate_timerange(
+        self,
+        time_now: datetime,
+        last_timestamp: Union[datetime, None],
+        timerange_value: int,
+        timerange_type: Union[TimerangeTypes, None],
+    ) -> tuple[str, str]:
+        """Function to calculate the timerange for the input data query based on
+        a fixed timerange from the configuration
+
+        Args:
+            time_now (datetime): Time now
+            last_timestamp (datetime): Timestamp of the last output
             timerange_value (int): Value of the timerange in the configuration
             timerange_type (str): Type of the timerange (absolute or relative)
 
@@ -616,6 +1392,183 @@ class FiwareConnection:
 
         return from_date, to_date
 
+    def _query_timeseries_from_database(  # pylint: disable=too-many-arguments
+        self,
+        entity: ContextEntity,
+        attributes: list[str],
+        from_date: str,
+        to_date: str,
+        time_step_seconds: int,
+        *,
+        excluded_range: Optional[tuple[str, str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Function to query the timeseries of an entity from the database (crateDB) \
+            and to resample it with the configured time step size. \
+            Depending on the configuration, the data is resampled in the database \
+            or queried in chunks.
+
+        Args:
+            - entity: entity with id and type
+            - attributes: names of the attributes in the database
+            - from_date: timestamp from which data is to be retrieved
+            - to_date: timestamp up to which data is to be retrieved
+            - time_step_seconds: size of the time steps for the resampling in seconds
+            - excluded_range: start and end of a time range, which is not queried \
+                (the time steps in this range are missing or NaN)
+
+        Returns:
+            - pd.DataFrame: resampled timeseries with the attribute names of the database
+        """
+        database_params = self.fiware_conn_params.database_params
+
+        if database_params.crate_db_chunk_size > 0 and not database_params.crate_db_resampling:
+            return self.crate_db_client.get_resampled_data(
+                service=self.fiware_conn_params.fiware_params.service,
+                entity=entity,
+                attributes=attributes,
+                from_date=from_date,
+                to_date=to_date,
+                resample_seconds=time_step_seconds,
+                chunk_size=database_params.crate_db_chunk_size,
+                limit=1000000,
+                excluded_range=excluded_range,
+            )
+
+        df = self.crate_db_client.get_data(
+            service=self.fiware_conn_params.fiware_params.service,
+            entity=entity,
+            attributes=attributes,
+            from_date=from_date,
+            to_date=to_date,
+            limit=1000000,
+            resample_seconds=(
+                time_step_seconds if database_params.crate_db_resampling else None
+            ),
+            excluded_range=excluded_range,
+        )
+
+        if df.empty or database_params.crate_db_resampling:
+            return df
+
+        # resample the time series with configured time step size
+        df.fillna(value=np.nan, inplace=True)
+        return df.resample(f"""{time_step_seconds}s""").mean(numeric_only=True)
+
+    @staticmethod
+    def _get_cached_time_range(
+        first_time_step: pd.Timestamp,
+        last_time_step: pd.Timestamp,
+    ) -> Optional[tuple[str, str]]:
+        """
+        Function to get the time range of the complete cached time steps, \
+            which does not have to be queried again
+
+        Args:
+            - first_time_step: start of the first complete cached time step
+            - last_time_step: start of the last cached time step (could be incomplete)
+
+        Returns:
+            - start and end of the time range or None, if there is no complete time step
+        """
+        if last_time_step <= first_time_step:
+            return None
+        return (
+            first_time_step.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            last_time_step.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        )
+
+    def _query_timeseries_with_window_cache(
+        self,
+        entity: ContextEntity,
+        attributes: list[str],
+        from_date: str,
+        to_date: str,
+        time_step_seconds: int,
+    ) -> pd.DataFrame:
+        """
+        Function to get the resampled timeseries of an entity for a rolling time window \
+            (absolute timerange) with a cache of the previous query
+
+        The window is queried with a single request, which excludes the complete \
+            cached time steps. So only the first time step of the window \
+            (it is only partly in the window) and the data since the start \
+            of the last cached time step (it could have been incomplete) are queried. \
+            The time steps before the window are removed. \
+            The result is the same as the result of a query of the whole window.
+
+        Args:
+            - entity: entity with id and type
+            - attributes: names of the attributes in the database
+            - from_date: timestamp from which data is to be retrieved (start of the window)
+            - to_date: timestamp up to which data is to be retrieved
+            - time_step_seconds: size of the time steps for the resampling in seconds
+
+        Returns:
+            - pd.DataFrame: resampled timeseries with the attribute names of the database
+        """
+        key = (entity.id, entity.type, tuple(attributes))
+        time_step = f"{time_step_seconds}s"
+        window_start = pd.Timestamp(from_date).tz_convert("UTC").floor(time_step)
+        cached_window_start, cached_df = self._timeseries_window_cache.get(
+            key, (None, None)
+        )
+
+        if (
+            cached_df is None
+            or cached_df.empty
+            or cached_window_start > window_start
+            or cached_df.index[-1] < window_start
+        ):
+            df = self._query_timeseries_from_database(
+                entity=entity,
+                attributes=attributes,
+                from_date=from_date,
+                to_date=to_date,
+                time_step_seconds=time_step_seconds,
+            )
+        else:
+            last_time_step = cached_df.index[-1]
+            df_new = self._query_timeseries_from_database(
+                entity=entity,
+                attributes=attributes,
+                from_date=from_date,
+                to_date=to_date,
+                time_step_seconds=time_step_seconds,
+                excluded_range=self._get_cached_time_range(
+                    first_time_step=window_start + pd.Timedelta(seconds=time_step_seconds),
+                    last_time_step=last_time_step,
+                ),
+            )
+            if df_new.empty:
+                df_new = cached_df.iloc[:0]
+            # the first time step of the window is only taken from the new data, \
+            # even if it is the last cached time step (e.g. of a quiet sensor)
+            df_tail = df_new[
+                (df_new.index >= last_time_step) & (df_new.index > window_start)
+            ]
+            if df_tail.empty and last_time_step > window_start:
+                df_tail = cached_df.iloc[-1:]
+            df = pd.concat(
+                [
+                    df_new[df_new.index == window_start],
+                    cached_df[
+                        (cached_df.index > window_start)
+                        & (cached_df.index < last_time_step)
+                    ],
+                    df_tail,
+                ]
+            )
+            df = df[~df.index.duplicated(keep="first")]
+            df = df[df.index >= window_start].asfreq(time_step)
+            if df.first_valid_index() is None:
+                df = pd.DataFrame()
+            else:
+                df = df.loc[df.first_valid_index() : df.last_valid_index()]
+
+        self._timeseries_window_cache[key] = (window_start, df)
+        return df.copy()
+
     def get_data_from_datebase(
         self,
         entity: ContextEntity,
@@ -647,30 +1600,41 @@ class FiwareConnection:
             method=method, last_timestamp=timestamp_latest_output
         )
 
-        df = self.crate_db_client.get_data(
-            service=self.fiware_conn_params.fiware_params.service,
-            entity=entity,
-            attributes=[
-                attribute["id_interface"] for attribute in entity_attributes.values()
-            ],
-            from_date=from_date,
-            to_date=to_date,
-            limit=1000000,
-        )
-
-        if df.empty:
-            logger.debug("Service has not received data from CrateDB")
-            return []
-
-        # resample the time series with configured time step size
-        df.fillna(value=np.nan, inplace=True)
         time_step_seconds = int(
             self.config.controller_settings.time_settings.calculation.timestep
             * get_time_unit_seconds(
                 self.config.controller_settings.time_settings.calculation.timestep_unit
             )
         )
-        df = df.resample(f"""{time_step_seconds}s""").mean(numeric_only=True)
+        attributes = [
+            attribute["id_interface"] for attribute in entity_attributes.values()
+        ]
+        if (
+            self.fiware_conn_params.database_params.crate_db_window_cache
+            and method is DataQueryTypes.CALCULATION
+            and self.config.controller_settings.time_settings.calculation.timerange_type
+            is TimerangeTypes.ABSOLUTE
+            and SECONDS_PER_DAY % time_step_seconds == 0
+        ):
+            df = self._query_timeseries_with_window_cache(
+                entity=entity,
+                attributes=attributes,
+                from_date=from_date,
+                to_date=to_date,
+                time_step_seconds=time_step_seconds,
+            )
+        else:
+            df = self._query_timeseries_from_database(
+                entity=entity,
+                attributes=attributes,
+                from_date=from_date,
+                to_date=to_date,
+                time_step_seconds=time_step_seconds,
+            )
+
+        if df.empty:
+            logger.debug("Service has not received data from CrateDB")
+            return []
 
         input_attributes = []
 
@@ -711,64 +1675,372 @@ class FiwareConnection:
 
         return input_attributes
 
-    def update_fiware_entity(
+    def update_fiware_entity(
+        self,
+        entity_id: str,
+        entity_type: str,
+        attrs: list[NamedContextAttribute],
+    ) -> None:
+        """
+        Function to update the entity in the FIWARE platform with filip
+
+        Args:
+            entity_id (str): ID of the entity
+            entity_type (str): Type of the entity
+            attrs (list[NamedContextAttribute]): List with the attributes to update
+        """
+
+        self.cb_client.update_or_append_entity_attributes(
+            entity_id=entity_id, entity_type=entity_type, attrs=attrs
+        )
+
+    def _post_to_context_broker(
+        self,
+        path: str,
+        payload: Union[dict, list],
+        error_message: str,
+        params: Optional[dict] = None,
+    ) -> None:
+        """
+        Function to send a prepared JSON payload to the Context Broker \
+            with the synchronous client (POST request)
+
+        Args:
+            path (str): Path of the request (e.g. `v2/op/update`)
+            payload (Union[dict, list]): JSON payload of the request
+            error_message (str): Message of the exception, if the request fails
+            params (Optional[dict]): Query parameters of the request
+
+        Raises:
+            BaseHttpClientException: If the request fails
+        """
+        try:
+            response = self.cb_client.post(
+                url=urljoin(self.cb_client.base_url, path),
+                params=params,
+                json=payload,
+            )
+            response.raise_for_status()
+        except requests.RequestException as err:
+            raise BaseHttpClientException(
+                message=error_message, response=err.response
+            ) from err
+
+    async def _send_timeseries_to_fiware(
+        self,
+        entity_id: str,
+        entity_type: str,
+        attribute_name: str,
+        timeseries: list[dict],
+    ) -> bool:
+        """
+        Function to send the timeseries data to the FIWARE platform in async mode
+        and parallel processing
+
+        With the asynchronous client, the number of parallel requests is limited \
+            to the connections of the pool (`max_connections`). \
+            The synchronous client is used in a worker thread \
+            (see `_send_timeseries_to_fiware_sync`).
+
+        Args:
+            entity_id (str): ID of the entity
+            entity_type (str): Type of the entity
+            attribute_name (str): Name of the attribute in the FIWARE platform
+            timeseries (list[dict]): List with the payloads of the timeseries values
+
+        Returns:
+            bool: True, if all values were sent
+        TODO:
+            - Is there a better way to send the data from dataframes to the FIWARE platform?
+        """
+        if self.cb_client_async is None:
+            return await asyncio.to_thread(
+                self._send_timeseries_to_fiware_sync,
+                entity_id=entity_id,
+                entity_type=entity_type,
+                attribute_name=attribute_name,
+                timeseries=timeseries,
+            )
+
+        batch_size = self.fiware_conn_params.fiware_params.timeseries_batch_size
+        if batch_size > 0:
+            return await self._send_timeseries_batches_to_fiware(
+                entity_id=entity_id,
+                entity_type=entity_type,
+                attribute_name=attribute_name,
+                timeseries=timeseries,
+                batch_size=batch_size,
+            )
+
+        # no more requests than connections in the pool, to avoid pool timeouts
+        semaphore = asyncio.Semaphore(
+            self.fiware_conn_params.fiware_params.max_connections
+        )
+
+        async def send_value(payload: dict) -> None:
+            async with semaphore:
+                await self.cb_client_async.update_or_append_entity_attributes(
+                    entity_id=entity_id,
+                    entity_type=entity_type,
+                    attrs={attribute_name: payload},
+                )
+
+        results = await asyncio.gather(
+            *(send_value(payload) for payload in timeseries),
+            return_exceptions=True,
+        )
+        return self._check_timeseries_errors(
+            entity_id=entity_id,
+            number_of_values=len(timeseries),
+            errors=[result for result in results if isinstance(result, BaseException)],
+        )
+
+    @staticmethod
+    def _check_timeseries_errors(
+        entity_id: str, number_of_values: int, errors: list[BaseException]
+    ) -> bool:
+        """
+        Function to log the errors of the requests of the timeseries values
+
+        Args:
+            entity_id (str): ID of the entity
+            number_of_values (int): Number of the sent values
+            errors (list[BaseException]): Errors of the failed requests
+
+        Returns:
+            bool: True, if there are no errors
+        """
+        if len(errors) == 0:
+            return True
+        logger.error(
+            f"Error while sending {len(errors)} of {number_of_values} timeseries "
+            f"values of entity {entity_id} to the FIWARE platform: {errors[0]}"
+        )
+        return False
+
+    def _send_timeseries_to_fiware_sync(
+        self,
+        entity_id: str,
+        entity_type: str,
+        attribute_name: str,
+        timeseries: list[dict],
+    ) -> bool:
+        """
+        Function to send the timeseries data to the FIWARE platform \
+            with the synchronous client (parallel requests in a thread pool \
+            or batch requests)
+
+        Args:
+            entity_id (str): ID of the entity
+            entity_type (str): Type of the entity
+            attribute_name (str): Name of the attribute in the FIWARE platform
+            timeseries (list[dict]): List with the payloads of the timeseries values
+
+        Returns:
+            bool: True, if all values were sent
+        """
+        batch_size = self.fiware_conn_params.fiware_params.timeseries_batch_size
+        if batch_size > 0:
+            sent = True
+            for start, batch in self._get_timeseries_batches(
+                entity_id=entity_id,
+                entity_type=entity_type,
+                attribute_name=attribute_name,
+                timeseries=timeseries,
+                batch_size=batch_size,
+            ):
+                try:
+                    self._post_to_context_broker(
+                        path="v2/op/update",
+                        payload={"actionType": ActionType.APPEND, "entities": batch},
+                        error_message="Update operation 'append' failed",
+                    )
+                except BaseHttpClientException as err:
+                    self._log_timeseries_batch_error(
+                        entity_id=entity_id, start=start, batch=batch, err=err
+                    )
+                    sent = False
+            return sent
+
+        max_workers = multiprocessing.cpu_count()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._post_to_context_broker,
+                    path=f"v2/entities/{entity_id}/attrs",
+                    payload={attribute_name: payload},
+                    error_message=(
+                        f"Could not update or append attributes of entity {entity_id}"
+                    ),
+                    params={"type": entity_type} if entity_type else None,
+                )
+                for payload in timeseries
+            ]
+            concurrent.futures.wait(futures)
+
+        return self._check_timeseries_errors(
+            entity_id=entity_id,
+            number_of_values=len(timeseries),
+            errors=[
+                future.exception()
+                for future in futures
+                if future.exception() is not None
+            ],
+        )
+
+    async def _send_timeseries_batches_to_fiware(
         self,
         entity_id: str,
         entity_type: str,
-        attrs: list[NamedContextAttribute],
-    ) -> None:
+        attribute_name: str,
+        timeseries: list[dict],
+        batch_size: int,
+    ) -> bool:
         """
-        Function to update the entity in the FIWARE platform with filip
+        Function to send the timeseries data to the FIWARE platform in batch requests \
+            (`/v2/op/update` with the action type `append`) with the asynchronous client
+
+        Each value is an own entity update in the batch with its own `TimeInstant`. \
+            The Context Broker processes the updates of a batch in the given order, \
+            so the batches are sent one after another to keep the chronological order.
 
         Args:
             entity_id (str): ID of the entity
             entity_type (str): Type of the entity
-            attrs (list[NamedContextAttribute]): List with the attributes to update
-        """
+            attribute_name (str): Name of the attribute in the FIWARE platform
+            timeseries (list[dict]): List with the payloads of the timeseries values, \
+                sorted by time
+            batch_size (int): Maximum number of values in one request
 
-        self.cb_client.update_or_append_entity_attributes(
-            entity_id=entity_id, entity_type=entity_type, attrs=attrs
-        )
+        Returns:
+            bool: True, if all batches were sent
+        """
+        sent = True
+        for start, batch in self._get_timeseries_batches(
+            entity_id=entity_id,
+            entity_type=entity_type,
+            attribute_name=attribute_name,
+            timeseries=timeseries,
+            batch_size=batch_size,
+        ):
+            try:
+                await self.cb_client_async.update(
+                    entities=batch, action_type=ActionType.APPEND
+                )
+            except BaseHttpClientException as err:
+                self._log_timeseries_batch_error(
+                    entity_id=entity_id, start=start, batch=batch, err=err
+                )
+                sent = False
+        return sent
 
-    async def _send_timeseries_to_fiware(
-        self,
+    @staticmethod
+    def _get_timeseries_batches(
         entity_id: str,
         entity_type: str,
-        attrs_timeseries: list[NamedContextAttribute],
-    ) -> None:
+        attribute_name: str,
+        timeseries: list[dict],
+        batch_size: int,
+    ) -> Iterator[tuple[int, list[dict]]]:
         """
-        Function to send the timeseries data to the FIWARE platform in async mode
-        and parallel processing
+        Function to split the timeseries values into the entity updates of batch requests
 
         Args:
             entity_id (str): ID of the entity
             entity_type (str): Type of the entity
-            attrs_timeseries (list[NamedContextAttribute]): List with the timeseries data
-        TODO:
-            - Is there a better way to send the data from dataframes to the FIWARE platform?
+            attribute_name (str): Name of the attribute in the FIWARE platform
+            timeseries (list[dict]): List with the payloads of the timeseries values, \
+                sorted by time
+            batch_size (int): Maximum number of values in one request
+
+        Yields:
+            tuple[int, list[dict]]: Position of the first value and the entity updates \
+                of a batch
         """
-        max_workers = multiprocessing.cpu_count()
+        entities = [
+            {"id": entity_id, "type": entity_type, attribute_name: payload}
+            for payload in timeseries
+        ]
+        for start in range(0, len(entities), batch_size):
+            yield start, entities[start : start + batch_size]
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-            for attribute in attrs_timeseries:
-                future = executor.submit(
-                    self.update_fiware_entity, entity_id, entity_type, [attribute]
-                )
-                futures.append(future)
+    @staticmethod
+    def _log_timeseries_batch_error(
+        entity_id: str, start: int, batch: list[dict], err: Exception
+    ) -> None:
+        """
+        Function to log the error of a batch request of timeseries values
+
+        Args:
+            entity_id (str): ID of the entity
+            start (int): Position of the first value of the batch
+            batch (list[dict]): Entity updates of the batch
+            err (Exception): Error of the request
+        """
+        logger.error(
+            f"Error while sending the timeseries values {start} to "
+            f"{start + len(batch) - 1} of entity {entity_id} "
+            f"to the FIWARE platform: {err}"
+        )
 
-                await sleep(0.01)
+    @staticmethod
+    def _serialize_timeseries_for_fiware(
+        timeseries: pd.Series,
+        datatype: Union[DataType, str],
+        factor_unit_adjustment: float,
+        metadata: list[NamedMetadata],
+    ) -> list[dict]:
+        """
+        Function to convert a timeseries to the payloads of NGSI v2 attributes
 
-            concurrent.futures.wait(futures)
+        The timestamps are formatted and the unit is adjusted for the whole series at once, \
+            without a validation of each value with pydantic.
 
-    async def prepare_timeseries_for_fiware(
+        Args:
+            timeseries (pd.Series): Timeseries with a DatetimeIndex
+            datatype (Union[DataType, str]): Datatype of the attribute
+            factor_unit_adjustment (float): Factor to adjust the unit
+            metadata (list[NamedMetadata]): Metadata for all values (without `TimeInstant`)
+
+        Returns:
+            list[dict]: Payloads of the attribute (type, value, metadata) for each value
+        """
+        if pd.api.types.is_numeric_dtype(timeseries) and factor_unit_adjustment != 1.0:
+            timeseries = timeseries * factor_unit_adjustment
+        values = timeseries.astype(object).where(timeseries.notna(), None).tolist()
+        timestamps = timeseries.index.strftime("%Y-%m-%dT%H:%M:%S%z").tolist()
+
+        attribute_type = datatype.value if isinstance(datatype, DataType) else datatype
+        static_metadata = {
+            item.name: item.model_dump(mode="json", exclude={"name"}, exclude_none=True)
+            for item in metadata
+        }
+
+        return [
+            {
+                "type": attribute_type,
+                "value": value,
+                "metadata": {
+                    **static_metadata,
+                    "TimeInstant": {
+                        "type": DataType.DATETIME,
+                        "value": timestamp,
+                    },
+                },
+            }
+            for value, timestamp in zip(values, timestamps)
+        ]
+
+    def _prepare_timeseries_for_fiware(
         self,
         fiware_datapoint: FiwareDatapointParameter,
         datatype: DataType,
         factor_unit_adjustment: float,
-    ) -> list[NamedContextAttribute]:
+    ) -> Optional[tuple[NamedContextAttribute, list[dict]]]:
         """
-        Function to prepare the timeseries data for the FIWARE platform
+        Function to prepare the timeseries data for the FIWARE platform without sending it: \
+            the last value is the attribute, the other values are the timeseries payloads
 
         Args:
             fiware_datapoint (FiwareDatapointParameter): Fiware datapoint parameter
@@ -776,10 +2048,11 @@ class FiwareConnection:
             factor_unit_adjustment (float): Factor to adjust the unit
 
         Returns:
-            list: List with the attributes (NamedContextAttribute) for the FIWARE platform
+            Optional[tuple[NamedContextAttribute, list[dict]]]: Attribute with the last value \
+                and the payloads of the other values, None if there is no data
         """
         if len(fiware_datapoint.attribute.value) == 0:
-            return
+            return None
         if (
             fiware_datapoint.attribute.id
             not in fiware_datapoint.attribute.value.columns
@@ -787,9 +2060,8 @@ class FiwareConnection:
             logger.error(
                 f"Attribute {fiware_datapoint.attribute.id} not in the dataframe."
             )
-            return
+            return None
         df = fiware_datapoint.attribute.value.sort_index()
-        attrs_timeseries = []
 
         meta_data_row = fiware_datapoint.metadata + [
             NamedMetadata(
@@ -806,211 +2078,497 @@ class FiwareConnection:
             metadata=meta_data_row,
         )
 
-        for index, row in fiware_datapoint.attribute.value.iterrows():
-            if index == df.index[-1]:
-                continue
+        timeseries = self._serialize_timeseries_for_fiware(
+            timeseries=df.loc[
+                df.index != df.index[-1], fiware_datapoint.attribute.id
+            ],
+            datatype=datatype,
+            factor_unit_adjustment=factor_unit_adjustment,
+            metadata=fiware_datapoint.metadata,
+        )
+        return attr, timeseries
 
-            meta_data_row = fiware_datapoint.metadata + [
-                NamedMetadata(
-                    name="TimeInstant",
-                    type=DataType.DATETIME,
-                    value=index.strftime("%Y-%m-%dT%H:%M:%S%z"),
-                )
-            ]
+    async def prepare_timeseries_for_fiware(
+        self,
+        fiware_datapoint: FiwareDatapointParameter,
+        datatype: DataType,
+        factor_unit_adjustment: float,
+    ) -> list[NamedContextAttribute]:
+        """
+        Function to prepare the timeseries data for the FIWARE platform
 
-            attrs_timeseries.append(
-                NamedContextAttribute(
-                    name=fiware_datapoint.attribute.id_interface,
-                    value=row[fiware_datapoint.attribute.id] * factor_unit_adjustment,
-                    type=datatype,
-                    metadata=meta_data_row,
-                )
-            )
-        if len(attrs_timeseries) > 0:
+        Args:
+            fiware_datapoint (FiwareDatapointParameter): Fiware datapoint parameter
+            datatype (DataType): Datatype of the attribute
+            factor_unit_adjustment (float): Factor to adjust the unit
+
+        Returns:
+            list: List with the attributes (NamedContextAttribute) for the FIWARE platform
+        """
+        prepared = self._prepare_timeseries_for_fiware(
+            fiware_datapoint=fiware_datapoint,
+            datatype=datatype,
+            factor_unit_adjustment=factor_unit_adjustment,
+        )
+        if prepared is None:
+            return None
+        attr, timeseries = prepared
+
+        if len(timeseries) > 0:
             await self._send_timeseries_to_fiware(
                 entity_id=fiware_datapoint.entity.id,
                 entity_type=fiware_datapoint.entity.type,
-                attrs_timeseries=attrs_timeseries,
+                attribute_name=fiware_datapoint.attribute.id_interface,
+                timeseries=timeseries,
             )
 
         return attr
 
-    async def _send_data_to_fiware(
+    def _get_fiware_attribute_settings(
         self,
         output_entity: OutputModel,
-        output_attributes: list[AttributeModel],
-        output_commands: list[CommandModel],
-    ) -> None:
+        attribute: Union[AttributeModel, OutputAttributeRecord],
+        entity_attributes: dict[str, ContextAttribute],
+    ) -> tuple[Union[DataType, str], list[NamedMetadata], Optional[float]]:
         """
-        Function to send the output data to the FIWARE platform
+        Function to get the datatype, the metadata and the factor of the unit adjustment \
+            of an output attribute for the FIWARE platform
 
         Args:
-            - output_entity: OutputModel with the output entity
-            - output_attributes: list with the output attributes
-            - output_commands: list with the output commands
+            output_entity (OutputModel): Output entity of the attribute
+            attribute (Union[AttributeModel, OutputAttributeRecord]): Output attribute
+            entity_attributes (dict[str, ContextAttribute]): Attributes of the entity \
+                in the Context Broker
 
-        TODO:
-            - Is there a better way to send the data from dataframes to the FIWARE platform?
+        Returns:
+            tuple[Union[DataType, str], list[NamedMetadata], Optional[float]]: \
+                Datatype, metadata (without `TimeInstant`) and factor of the unit adjustment
         """
+        fiware_unit = None
+        factor_unit_adjustment: Optional[float] = 1.0
+
+        if attribute.id_interface in entity_attributes:
+            datatype = entity_attributes[attribute.id_interface].type
+            if (
+                entity_attributes[attribute.id_interface].metadata.get("unitCode")
+                is not None
+            ):
+                fiware_unit = DataUnits(
+                    entity_attributes[attribute.id_interface]
+                    .metadata.get("unitCode")
+                    .value
+                )
+        else:
+            datatype = attribute.datatype
 
-        fiware_entity = self.cb_client.get_entity(output_entity.id_interface)
+        meta_data = []
 
-        entity_attributes = self.cb_client.get_entity_attributes(
-            entity_id=fiware_entity.id, entity_type=fiware_entity.type
-        )
+        if attribute.unit is not None and fiware_unit is None:
+            meta_data.append(
+                NamedMetadata(
+                    name="unitCode", type=DataType.TEXT, value=attribute.unit.value
+                )
+            )
+        elif attribute.unit is None:
+            logger.debug(
+                f"No information about the unit of the attribute {attribute.id} "
+                f"from entity {output_entity.id} available!"
+            )
+        elif fiware_unit is not attribute.unit:
+            factor_unit_adjustment = get_unit_adjustment_factor(
+                unit_actual=attribute.unit, unit_target=fiware_unit
+            )
 
-        attrs = []
-        for attribute in output_attributes:
+        return datatype, meta_data, factor_unit_adjustment
 
-            fiware_unit = None
-            factor_unit_adjustment: Optional[float] = 1.0
-
-            if attribute.id_interface in entity_attributes:
-                datatype = entity_attributes[attribute.id_interface].type
-                if (
-                    entity_attributes[attribute.id_interface].metadata.get("unitCode")
-                    is not None
-                ):
-                    fiware_unit = DataUnits(
-                        entity_attributes[attribute.id_interface]
-                        .metadata.get("unitCode")
-                        .value
-                    )
-            else:
-                datatype = attribute.datatype
+    def _prepare_fiware_attribute(
+        self,
+        output_entity: OutputModel,
+        attribute: Union[AttributeModel, OutputAttributeRecord],
+        datatype: Union[DataType, str],
+        meta_data: list[NamedMetadata],
+        factor_unit_adjustment: Optional[float],
+    ) -> Optional[NamedContextAttribute]:
+        """
+        Function to prepare a single value of an output attribute for the FIWARE platform
 
-            meta_data = []
+        Args:
+            output_entity (OutputModel): Output entity of the attribute
+            attribute (Union[AttributeModel, OutputAttributeRecord]): Output attribute
+            datatype (Union[DataType, str]): Datatype of the attribute
+            meta_data (list[NamedMetadata]): Metadata of the attribute
+            factor_unit_adjustment (Optional[float]): Factor to adjust the unit
 
-            if attribute.unit is not None and fiware_unit is None:
-                meta_data.append(
-                    NamedMetadata(
-                        name="unitCode", type=DataType.TEXT, value=attribute.unit.value
-                    )
-                )
-                factor_unit_adjustment = 1.0
-            elif attribute.unit is None:
-                logger.debug(
-                    f"No information about the unit of the attribute {attribute.id} "
-                    f"from entity {output_entity.id} available!"
-                )
-                factor_unit_adjustment = 1.0
+        Returns:
+            Optional[NamedContextAttribute]: Attribute for the FIWARE platform \
+                or None, if it could not be prepared
+        """
+        meta_data = meta_data + [
+            NamedMetadata(
+                name="TimeInstant",
+                type=DataType.DATETIME,
+                value=attribute.timestamp.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            )
+        ]
+
+        try:
+            if factor_unit_adjustment is not None \
+                and isinstance(attribute.value, (int, float)):
+                value = attribute.value * factor_unit_adjustment \
+                    if attribute.value is not None else None
+            elif factor_unit_adjustment != 1.0 and factor_unit_adjustment is not None:
+                raise TypeError("Unsupported type for unit adjustment: "
+                                f"{type(attribute.value)}")
+            else:
+                value = attribute.value
+        except TypeError as e:
+            logger.error(
+                f"Error while adjusting unit for attribute {attribute.id} of entity "
+                f"{output_entity.id} for FIWARE: {e}"
+            )
+            value = attribute.value
+        try:
+            return NamedContextAttribute(
+                name=attribute.id_interface,
+                value=value,
+                type=datatype,
+                metadata=meta_data,
+            )
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.error(
+                f"Error while preparing attribute {attribute.id} of entity "
+                f"{output_entity.id} for FIWARE: {e}"
+            )
+        return None
+
+    def _prepare_fiware_output(
+        self,
+        output_entity: OutputModel,
+        output_attributes: list[Union[AttributeModel, OutputAttributeRecord]],
+        output_commands: list[Union[CommandModel, OutputCommandRecord]],
+        fiware_entity: ContextEntity,
+        entity_attributes: dict[str, ContextAttribute],
+    ) -> tuple[
+        list[NamedContextAttribute], list[NamedCommand], list[tuple[str, list[dict]]]
+    ]:
+        """
+        Function to prepare the output data of an entity for the FIWARE platform \
+            (without requests)
 
-            elif fiware_unit is not attribute.unit:
+        Args:
+            output_entity (OutputModel): Output entity
+            output_attributes (list[Union[AttributeModel, OutputAttributeRecord]]): \
+                Output attributes
+            output_commands (list[Union[CommandModel, OutputCommandRecord]]): \
+                Output commands
+            fiware_entity (ContextEntity): Entity in the Context Broker (id and type)
+            entity_attributes (dict[str, ContextAttribute]): Attributes of the entity \
+                in the Context Broker
 
-                factor_unit_adjustment = get_unit_adjustment_factor(
-                    unit_actual=attribute.unit, unit_target=fiware_unit
+        Returns:
+            tuple[list[NamedContextAttribute], list[NamedCommand], \
+                list[tuple[str, list[dict]]]]: Attributes, commands and the payloads \
+                of the timeseries with the name of their attribute
+        """
+        attrs = []
+        timeseries = []
+        for attribute in output_attributes:
+            datatype, meta_data, factor_unit_adjustment = (
+                self._get_fiware_attribute_settings(
+                    output_entity=output_entity,
+                    attribute=attribute,
+                    entity_attributes=entity_attributes,
                 )
+            )
 
             if isinstance(attribute.value, pd.DataFrame):
-
-                attrs.append(
-                    await self.prepare_timeseries_for_fiware(
-                        fiware_datapoint=FiwareDatapointParameter(
-                            entity=ContextEntity(
-                                id=fiware_entity.id, type=fiware_entity.type
-                            ),
-                            attribute=attribute,
-                            metadata=meta_data,
+                prepared = self._prepare_timeseries_for_fiware(
+                    fiware_datapoint=FiwareDatapointParameter(
+                        entity=ContextEntity(
+                            id=fiware_entity.id, type=fiware_entity.type
                         ),
-                        datatype=datatype,
-                        factor_unit_adjustment=factor_unit_adjustment,
-                    )
+                        attribute=attribute,
+                        metadata=meta_data,
+                    ),
+                    datatype=datatype,
+                    factor_unit_adjustment=factor_unit_adjustment,
                 )
+                if prepared is not None:
+                    attrs.append(prepared[0])
+                    if len(prepared[1]) > 0:
+                        timeseries.append((attribute.id_interface, prepared[1]))
                 continue
-            meta_data.append(
-                NamedMetadata(
-                    name="TimeInstant",
-                    type=DataType.DATETIME,
-                    value=attribute.timestamp.strftime("%Y-%m-%dT%H:%M:%S%z"),
-                )
+
+            attr = self._prepare_fiware_attribute(
+                output_entity=output_entity,
+                attribute=attribute,
+                datatype=datatype,
+                meta_data=meta_data,
+                factor_unit_adjustment=factor_unit_adjustment,
             )
+            if attr is not None:
+                attrs.append(attr)
+
+        cmds = [
+            NamedCommand(
+                name=command.id_interface,
+                value=command.value,
+                type=DataType.COMMAND,
+            )
+            for command in output_commands
+        ]
+
+        return attrs, cmds, timeseries
+
+    @staticmethod
+    def _log_fiware_request_error(description: str, attempt: int, err: Exception) -> bool:
+        """
+        Function to log the error of a request to the FIWARE platform, \
+            if it was the last attempt
+
+        Args:
+            description (str): Description of the sent data (e.g. `attributes`)
+            attempt (int): Number of the attempt (starting with 0)
+            err (Exception): Error of the request
+
+        Returns:
+            bool: True, if the request should be repeated
+        """
+        if attempt < FIWARE_REQUEST_ATTEMPTS - 1:
+            return True
+        logger.error(f"HTTPError while sending {description} to FIWARE platform: {err}")
+        return False
+
+    async def _request_fiware_with_retries(
+        self, request: Callable[[], Awaitable[None]], description: str
+    ) -> bool:
+        """
+        Function to send a request to the FIWARE platform with retries
+
+        Args:
+            request (Callable[[], Awaitable[None]]): Function for the request
+            description (str): Description of the sent data (e.g. `attributes`)
 
+        Returns:
+            bool: True, if the request was successful
+        """
+        for attempt in range(FIWARE_REQUEST_ATTEMPTS):
             try:
-                if factor_unit_adjustment is not None \
-                    and isinstance(attribute.value, (int, float)):
-                    value = attribute.value * factor_unit_adjustment \
-                        if attribute.value is not None else None
-                elif factor_unit_adjustment != 1.0 and factor_unit_adjustment is not None:
-                    raise TypeError("Unsupported type for unit adjustment: "
-                                    f"{type(attribute.value)}")
-                else:
-                    value = attribute.value
-            except TypeError as e:
-                logger.error(
-                    f"Error while adjusting unit for attribute {attribute.id} of entity "
-                    f"{output_entity.id} for FIWARE: {e}"
-                )
-                value = attribute.value
+                await request()
+                return True
+            except (requests.exceptions.HTTPError, BaseHttpClientException) as err:
+                if not self._log_fiware_request_error(description, attempt, err):
+                    return False
+                await sleep(FIWARE_REQUEST_RETRY_DELAY)
+        return False
+
+    def _request_fiware_with_retries_sync(
+        self, request: Callable[[], None], description: str
+    ) -> bool:
+        """
+        Function to send a request to the FIWARE platform with retries \
+            (see `_request_fiware_with_retries`) and the synchronous client
+
+        Args:
+            request (Callable[[], None]): Function for the request
+            description (str): Description of the sent data (e.g. `attributes`)
+
+        Returns:
+            bool: True, if the request was successful
+        """
+        for attempt in range(FIWARE_REQUEST_ATTEMPTS):
             try:
-                attrs.append(
-                    NamedContextAttribute(
-                        name=attribute.id_interface,
-                        value=value,
-                        type=datatype,
-                        metadata=meta_data,
-                    )
-                )
-            except (ValueError, TypeError, AttributeError) as e:
-                logger.error(
-                    f"Error while preparing attribute {attribute.id} of entity "
-                    f"{output_entity.id} for FIWARE: {e}"
-                )
+                request()
+                return True
+            except (requests.exceptions.HTTPError, BaseHttpClientException) as err:
+                if not self._log_fiware_request_error(description, attempt, err):
+                    return False
+                time.sleep(FIWARE_REQUEST_RETRY_DELAY)
+        return False
+
+    def _handle_sent_fiware_attributes(
+        self, entity_id: str, attrs: list[NamedContextAttribute], sent: bool
+    ) -> None:
+        """
+        Function to update the cached timestamps of the outputs after the sending \
+            of the attributes
 
-        cmds = []
-        for command in output_commands:
-            cmds.append(
-                NamedCommand(
-                    name=command.id_interface,
-                    value=command.value,
-                    type=DataType.COMMAND,
-                )
-            )
+        Args:
+            entity_id (str): ID of the entity
+            attrs (list[NamedContextAttribute]): Sent attributes
+            sent (bool): True, if the attributes were sent
+        """
+        if sent:
+            self._update_cached_output_timestamps(entity_id=entity_id, attrs=attrs)
+        else:
+            self._fiware_output_timestamps.pop(entity_id, None)
+
+    async def _send_data_to_fiware(
+        self,
+        output_entity: OutputModel,
+        output_attributes: list[Union[AttributeModel, OutputAttributeRecord]],
+        output_commands: list[Union[CommandModel, OutputCommandRecord]],
+    ) -> bool:
+        """
+        Function to send the output data to the FIWARE platform
+
+        Args:
+            - output_entity: OutputModel with the output entity
+            - output_attributes: list with the output attributes
+            - output_commands: list with the output commands
+
+        Returns:
+            - bool: True, if the attributes and commands were sent, \
+                False if a request failed after all retries
+
+        TODO:
+            - Is there a better way to send the data from dataframes to the FIWARE platform?
+        """
 
-        output_points = attrs + cmds
+        fiware_entity_type, entity_attributes = (
+            await self._get_fiware_entity_with_attributes_async(
+                entity_id=output_entity.id_interface,
+                attrs=[attribute.id_interface for attribute in output_attributes],
+            )
+        )
+        fiware_entity = ContextEntity(
+            id=output_entity.id_interface, type=fiware_entity_type
+        )
+        attrs, cmds, timeseries = self._prepare_fiware_output(
+            output_entity=output_entity,
+            output_attributes=output_attributes,
+            output_commands=output_commands,
+            fiware_entity=fiware_entity,
+            entity_attributes=entity_attributes,
+        )
 
-        if len(output_points) == 0:
+        if len(attrs) + len(cmds) == 0:
             logger.debug(
                 "There is no output data available to send to the FIWARE platform "
                 f"for the entity {fiware_entity.id}."
             )
-            return
+            return True
+
+        sent = True
+        for attribute_name, payloads in timeseries:
+            sent = (
+                await self._send_timeseries_to_fiware(
+                    entity_id=fiware_entity.id,
+                    entity_type=fiware_entity.type,
+                    attribute_name=attribute_name,
+                    timeseries=payloads,
+                )
+                and sent
+            )
 
         if len(attrs) > 0:
-            i = 0
-            while i < 3:
-                try:
-                    self.cb_client.update_or_append_entity_attributes(
+            attrs_sent = await self._request_fiware_with_retries(
+                request=lambda: self._update_fiware_entity_attributes(
+                    entity_id=fiware_entity.id,
+                    entity_type=fiware_entity.type,
+                    attrs=attrs,
+                ),
+                description="attributes",
+            )
+            self._handle_sent_fiware_attributes(
+                entity_id=fiware_entity.id, attrs=attrs, sent=attrs_sent
+            )
+            sent = attrs_sent and sent
+
+        if len(cmds) > 0:
+            sent = (
+                await self._request_fiware_with_retries(
+                    request=lambda: self._update_fiware_entity_commands(
                         entity_id=fiware_entity.id,
                         entity_type=fiware_entity.type,
-                        attrs=attrs,
-                    )
-                    break
-                except requests.exceptions.HTTPError as err:
-                    if i < 3:
-                        await sleep(0.1)
-                    else:
-                        logger.error(
-                            f"HTTPError while sending attributes to FIWARE platform: {err}"
-                        )
+                        cmds=cmds,
+                    ),
+                    description="commands",
+                )
+                and sent
+            )
 
-                i += 1
+        return sent
+
+    def _send_data_to_fiware_sync(
+        self,
+        output_entity: OutputModel,
+        output_attributes: list[Union[AttributeModel, OutputAttributeRecord]],
+        output_commands: list[Union[CommandModel, OutputCommandRecord]],
+    ) -> bool:
+        """
+        Function to send the output data to the FIWARE platform \
+            with the synchronous client (see `_send_data_to_fiware`), \
+            e.g. in a worker thread without an own event loop
+
+        Args:
+            - output_entity: OutputModel with the output entity
+            - output_attributes: list with the output attributes
+            - output_commands: list with the output commands
+
+        Returns:
+            - bool: True, if the attributes and commands were sent, \
+                False if a request failed after all retries
+        """
+        fiware_entity_type, entity_attributes = self._get_fiware_entity_with_attributes(
+            entity_id=output_entity.id_interface,
+            attrs=[attribute.id_interface for attribute in output_attributes],
+        )
+        fiware_entity = ContextEntity(
+            id=output_entity.id_interface, type=fiware_entity_type
+        )
+        attrs, cmds, timeseries = self._prepare_fiware_output(
+            output_entity=output_entity,
+            output_attributes=output_attributes,
+            output_commands=output_commands,
+            fiware_entity=fiware_entity,
+            entity_attributes=entity_attributes,
+        )
+
+        if len(attrs) + len(cmds) == 0:
+            logger.debug(
+                "There is no output data available to send to the FIWARE platform "
+                f"for the entity {fiware_entity.id}."
+            )
+            return True
+
+        sent = True
+        for attribute_name, payloads in timeseries:
+            sent = (
+                self._send_timeseries_to_fiware_sync(
+                    entity_id=fiware_entity.id,
+                    entity_type=fiware_entity.type,
+                    attribute_name=attribute_name,
+                    timeseries=payloads,
+                )
+                and sent
+            )
+
+        if len(attrs) > 0:
+            attrs_sent = self._request_fiware_with_retries_sync(
+                request=lambda: self.update_fiware_entity(
+                    entity_id=fiware_entity.id,
+                    entity_type=fiware_entity.type,
+                    attrs=attrs,
+                ),
+                description="attributes",
+            )
+            self._handle_sent_fiware_attributes(
+                entity_id=fiware_entity.id, attrs=attrs, sent=attrs_sent
+            )
+            sent = attrs_sent and sent
 
         if len(cmds) > 0:
-            i = 0
-            while i < 3:
-                try:
-                    self.cb_client.update_existing_entity_attributes(
+            sent = (
+                self._request_fiware_with_retries_sync(
+                    request=lambda: self.cb_client.update_existing_entity_attributes(
                         entity_id=fiware_entity.id,
                         entity_type=fiware_entity.type,
                         attrs=cmds,
-                    )
-                    break
-                except requests.exceptions.HTTPError as err:
-                    if i < 3:
-                        await sleep(0.1)
-                    else:
-                        logger.error(
-                            f"HTTPError while sending commands to FIWARE platform: {err}"
-                        )
-
-                i += 1
+                    ),
+                    description="commands",
+                )
+                and sent
+            )
+
+        return sent
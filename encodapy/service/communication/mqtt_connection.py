@@ -25,12 +25,15 @@ from encodapy.config import (
     OutputModel,
 )
 from encodapy.utils.error_handling import ConfigError, NotSupportedError
+from encodapy.utils.metrics import METRICS, MQTT_MESSAGES_RECEIVED
 from encodapy.utils.models import (
     AttributeModel,
     InputDataAttributeModel,
     InputDataEntityModel,
+    OutputAttributeRecord,
     OutputDataEntityModel,
 )
+from encodapy.utils.timestamps import parse_timestamp
 
 
 class MqttConnection:
@@ -372,6 +375,7 @@ class MqttConnection:
             )
 
         self._last_message_received = datetime.now(timezone.utc)
+        METRICS.inc(MQTT_MESSAGES_RECEIVED, topic=message.topic)
 
         debug_message = (
             f"MQTT connection received message on {message.topic} "
@@ -481,10 +485,8 @@ class MqttConnection:
                 # try to extract the timestamp from MQTT_timestamp_key
                 if self.mqtt_params.timestamp_key in parsed:
                     try:
-                        timestamp = datetime.fromisoformat(
-                            parsed[self.mqtt_params.timestamp_key].replace(
-                                "Z", "+00:00"
-                            )
+                        timestamp = parse_timestamp(
+                            parsed[self.mqtt_params.timestamp_key]
                         )
                     except ValueError as e:
                         logger.warning(
@@ -673,13 +675,16 @@ class MqttConnection:
         return InputDataEntityModel(id=entity.id, attributes=attributes_values)
 
     def _prepare_mqtt_payload(
-        self, output_entity: OutputModel, output_attribute: AttributeModel
+        self,
+        output_entity: OutputModel,
+        output_attribute: Union[AttributeModel, OutputAttributeRecord],
     ) -> Union[str, float, int, bool, dict, list, DataFrame, None]:
         """
         Function to prepare the MQTT payload based on the output attribute's mqtt_format.
         Args:
             output_entity (OutputModel): The output entity.
-            output_attribute (AttributeModel): The output attribute.
+            output_attribute (Union[AttributeModel, OutputAttributeRecord]): \
+                The output attribute.
         Returns:
             Union[str, float, int, bool, dict, list, DataFrame, None]: The prepared payload.
         """
@@ -786,15 +791,20 @@ class MqttConnection:
     def send_data_to_mqtt(
         self,
         output_entity: OutputModel,
-        output_attributes: list[AttributeModel],
+        output_attributes: list[Union[AttributeModel, OutputAttributeRecord]],
         # output_commands: list[CommandModel],
-    ) -> None:
+    ) -> bool:
         """
         Function to send the output data to MQTT (publish the data to the MQTT broker).
 
         Args:
             output_entity (OutputModel): OutputModel with the output entity
-            output_attributes (list[AttributeModel]): list with the output attributes
+            output_attributes (list[Union[AttributeModel, OutputAttributeRecord]]): \
+                list with the output attributes
+
+        Returns:
+            bool: True, if all attributes were published, \
+                False if the client is not connected or an attribute could not be published
         """
         # check if the config is set
         if self.config is None:
@@ -810,9 +820,10 @@ class MqttConnection:
                 "MQTT client is not connected to the broker. "
                 "Skipping publish; no data will be sent until the connection is established."
             )
-            return
+            return False
 
         # publish the data to the MQTT broker
+        published = True
         for attribute in output_attributes:
             try:
                 self.publish(
@@ -830,8 +841,11 @@ class MqttConnection:
                     f"Failed to publish data for attribute {attribute.id} "
                     f"of entity {output_entity.id}: {e}"
                 )
+                published = False
                 continue
 
+        return published
+
     def _get_last_timestamp_for_mqtt_output(
         self, output_entity: OutputModel
     ) -> tuple[OutputDataEntityModel, Union[datetime, None]]:
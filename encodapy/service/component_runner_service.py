@@ -4,10 +4,12 @@ Description: This module contains the definition of a service to run
 Author: Martin Altenburger
 """
 
+import time
 from typing import Optional
 import asyncio
 from loguru import logger
 from encodapy.service import ControllerBasicService
+from encodapy.utils.metrics import COMPONENT_RUN_DURATION, METRICS
 from encodapy.utils.models import (
     InputDataModel,
     InputDataEntityModel,
@@ -144,6 +146,7 @@ class ComponentRunnerService(ControllerBasicService):
 
         all_component_results: list[DataTransferComponentModel] = []
         for component in self.components:
+            start = time.perf_counter()
             try:
                 component_results = component.run(data)
 
@@ -153,6 +156,17 @@ class ComponentRunnerService(ControllerBasicService):
                     f"{component.component_config.id}: {e}"
                 )
                 continue
+            finally:
+                duration = time.perf_counter() - start
+                METRICS.observe(
+                    COMPONENT_RUN_DURATION,
+                    duration,
+                    component=component.component_config.id,
+                )
+                self.cycle_timings.record(
+                    phase=f"component:{component.component_config.id}",
+                    duration=duration,
+                )
             all_component_results.extend(component_results)
             if component != self.components[-1]:
                 self.add_results_to_input(data, component_results)
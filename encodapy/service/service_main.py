@@ -13,6 +13,41 @@ from encodapy.service.basic_service import ControllerBasicService
 from encodapy.service.component_runner_service import ComponentRunnerService
 
 
+def register_shutdown_signals(shutdown_event: asyncio.Event) -> None:
+    """
+    Function to register the handlers for SIGTERM and SIGINT, \
+        which set the shutdown event in the running event loop
+
+    The handlers are registered in the event loop, so the loop is woken up \
+        and the tasks waiting for the shutdown event continue immediately. \
+        If this is not supported (e.g. on Windows), the signal module is used \
+        and the event is set thread-safe in the event loop.
+
+    Args:
+        shutdown_event (asyncio.Event): Event to stop the service
+    """
+    loop = asyncio.get_running_loop()
+
+    def signal_handler():
+        """Handler for SIGTERM and SIGINT signals"""
+        logger.debug("Shutdown signal received, end service properly...")
+        shutdown_event.set()
+
+    for signal_name in ("SIGINT", "SIGTERM"):
+        signal_number = getattr(signal, signal_name, None)
+        if signal_number is None:
+            logger.debug(f"No {signal_name} handler registered: not supported")
+            continue
+        try:
+            loop.add_signal_handler(signal_number, signal_handler)
+        except NotImplementedError:
+            signal.signal(
+                signal_number, lambda s, f: loop.call_soon_threadsafe(signal_handler)
+            )
+        except (OSError, RuntimeError, ValueError) as e:
+            logger.debug(f"No {signal_name} handler registered: {e}")
+
+
 async def service_main(service_class: Type[ControllerBasicService] = ComponentRunnerService):
     """
     Main function to start the example service
@@ -44,18 +79,7 @@ async def service_main(service_class: Type[ControllerBasicService] = ComponentRu
     task_for_check_health = asyncio.create_task(service.check_health_status())
     task_for_start_service = asyncio.create_task(service.start_service())
 
-    def signal_handler():
-        """Handler for SIGTERM and SIGINT signals"""
-        logger.debug("Shutdown signal received, end service properly...")
-        shutdown_event.set()
-
-    try:
-        signal.signal(signal.SIGINT, lambda s, f: signal_handler())
-
-        signal.signal(signal.SIGTERM, lambda s, f: signal_handler())
-    except (OSError, AttributeError) as e:
-        signal.signal(signal.SIGINT, lambda s, f: signal_handler())
-        logger.debug(f"Only SIGINT handler registered: {e}")
+    register_shutdown_signals(shutdown_event=shutdown_event)
 
     try:
         service_tasks: list[asyncio.Task] = [
@@ -93,6 +117,8 @@ async def service_main(service_class: Type[ControllerBasicService] = ComponentRu
                 logger.error(f"Error when exiting the service: {e}")
                 raise
 
+        # await a close of the FIWARE clients, which was started without the event loop
+        await service.stop_fiware_client_async()
         logger.info("Service successfully stopped")
 
     except Exception as e:
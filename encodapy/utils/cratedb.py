@@ -3,9 +3,349 @@ Description: Class to connect to a CrateDB and query data from it
 Author: Martin Altenburger
 """
 
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
 import crate.client
+from crate.client.connection import Connection
+from crate.client.exceptions import Error as CrateDBError
+import numpy as np
 import pandas as pd
 from filip.models.ngsi_v2.context import ContextEntity
+from loguru import logger
+from encodapy.utils.metrics import CRATEDB_ROWS_FETCHED, METRICS
+from encodapy.utils.resampling import IncrementalMeanResampler
+
+# Errors of the CrateDB if a cached column or table does not exist (anymore)
+SCHEMA_CHANGE_ERRORS = ("ColumnUnknownException", "RelationUnknown")
+# Data types of the CrateDB which can be aggregated with AVG
+NUMERIC_DATA_TYPES = (
+    "byte",
+    "smallint",
+    "integer",
+    "bigint",
+    "real",
+    "double precision",
+    "numeric",
+)
+
+
+class CrateDBConnectionPool:
+    """
+    Pool of reusable connections to a CrateDB
+
+    The connections are created on demand up to the size of the pool. \
+        Idle connections are reused, so that the connection setup is only needed once. \
+        A connection which was idle for longer than `idle_timeout` is closed, \
+        a connection which was idle for longer than `health_check_interval` \
+        is checked with a simple query before it is reused.
+
+    Args:
+        - connection_factory: Function to create a new connection
+        - pool_size: Maximum number of connections at the same time
+        - idle_timeout: Time in seconds after which an idle connection is closed
+        - health_check_interval: Time in seconds after which an idle connection \
+            is checked before it is reused
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], Connection],
+        pool_size: int = 5,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+    ) -> None:
+        self.connection_factory = connection_factory
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle_connections: queue.LifoQueue[tuple[Connection, float]] = (
+            queue.LifoQueue()
+        )
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    @staticmethod
+    def _close_connection(connection: Connection) -> None:
+        """
+        Function to close a connection without raising an error
+        """
+        try:
+            connection.close()
+        except CrateDBError as err:
+            logger.debug(f"Error while closing a connection to the CrateDB: {err}")
+
+    @staticmethod
+    def _check_connection(connection: Connection) -> bool:
+        """
+        Function to check if a connection is still usable
+
+        Returns:
+            bool: True, if the connection is usable
+        """
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except CrateDBError as err:
+            logger.debug(f"Connection to the CrateDB is not usable anymore: {err}")
+            return False
+        return True
+
+    def _get_idle_connection(self) -> Optional[Connection]:
+        """
+        Function to get a usable idle connection from the pool
+
+        Returns:
+            Optional[Connection]: An idle connection or None, if no usable connection is available
+        """
+        while True:
+            try:
+                connection, last_used = self._idle_connections.get_nowait()
+            except queue.Empty:
+                return None
+
+            idle_time = time.monotonic() - last_used
+            if idle_time > self.idle_timeout:
+                self._close_connection(connection)
+                continue
+            if idle_time > self.health_check_interval and not self._check_connection(
+                connection
+            ):
+                self._close_connection(connection)
+                continue
+            return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """
+        Context manager to borrow a connection from the pool
+
+        Waits for a free slot, if all connections of the pool are in use. \
+            The connection is returned to the pool afterwards, \
+            or closed if an error of the connection occurred.
+
+        Yields:
+            Connection: Connection to the CrateDB
+        """
+        self._slots.acquire()
+        connection = None
+        try:
+            connection = self._get_idle_connection()
+            if connection is None:
+                connection = self.connection_factory()
+            yield connection
+        except crate.client.exceptions.ConnectionError:
+            if connection is not None:
+                self._close_connection(connection)
+                connection = None
+            raise
+        finally:
+            if connection is not None:
+                self._idle_connections.put((connection, time.monotonic()))
+            self._slots.release()
+
+    def close(self) -> None:
+        """
+        Function to close all idle connections of the pool
+        """
+        while True:
+            try:
+                connection, _ = self._idle_connections.get_nowait()
+            except queue.Empty:
+                return
+            self._close_connection(connection)
+
+
+class CrateDBQueryBuilder:
+    """
+    Builder for the statements to query the data of an entity type from a CrateDB
+
+    The statements use bound parameters (`?`) for the entity id, the time bounds \
+        and the limit. The text of a statement is only generated once for each \
+        service, entity type and set of attributes and then reused, so the CrateDB \
+        can reuse the parsed statement and no statement is assembled for each query.
+
+    Parameters of the statements (in this order):
+        - `select`, `select_resampled`: entity id, from date, to date, limit
+        - `select_chunk`: entity id, from date, to date, (start of the chunk,) limit
+    """
+
+    COLUMNS_STATEMENT = (
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_name = ? AND table_schema = ?"
+    )
+
+    def __init__(self) -> None:
+        self._statements: dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    def _get_statement(self, key: tuple, build: Callable[[], str]) -> str:
+        """
+        Function to get a cached statement or to build and cache it
+
+        Args:
+            - key: key of the statement in the cache
+            - build: function to build the statement
+
+        Return:
+            - text of the statement
+        """
+        with self._lock:
+            statement = self._statements.get(key)
+        if statement is None:
+            statement = build()
+            with self._lock:
+                self._statements[key] = statement
+        return statement
+
+    @staticmethod
+    def _get_conditions(
+        attributes: tuple[str, ...], with_excluded_range: bool = False
+    ) -> str:
+        """
+        Function to get the conditions of a statement for the entity, the time bounds \
+            and the values (at least one of the attributes is not null)
+
+        Args:
+            - attributes: names of the attributes
+            - with_excluded_range: if true, the statement has parameters for the start \
+                and the end of a time range, which is not queried
+
+        Return:
+            - WHERE clause of the statement
+        """
+        conditions = "WHERE entity_id = ? AND time_index > ? AND time_index < ? "
+        attrs_not_null = " OR ".join(
+            f'"{attribute}" IS NOT NULL'
+            for attribute in attributes
+            if attribute != "time_index"
+        )
+        if attrs_not_null:
+            conditions += f"AND ({attrs_not_null}) "
+        if with_excluded_range:
+            conditions += "AND NOT (time_index >= ? AND time_index < ?) "
+        return conditions
+
+    def select(
+        self,
+        service: str,
+        entity_type: str,
+        attributes: tuple[str, ...],
+        with_excluded_range: bool = False,
+    ) -> str:
+        """
+        Function to get the statement to query the values of the attributes
+
+        Args:
+            - service: Name of the Fiware Service
+            - entity_type: type of the entity
+            - attributes: names of the existing attributes (with `time_index`)
+            - with_excluded_range: if true, the statement has parameters \
+                for a time range, which is not queried
+
+        Return:
+            - text of the statement
+        """
+        return self._get_statement(
+            ("select", service, entity_type, attributes, with_excluded_range),
+            lambda: (
+                "SELECT "
+                + ", ".join(f'"{attribute}"' for attribute in attributes)
+                + f" FROM mt{service}.et{entity_type} "
+                + self._get_conditions(attributes, with_excluded_range)
+                + "limit ?"
+            ),
+        )
+
+    def select_resampled(
+        self,
+        service: str,
+        entity_type: str,
+        attributes: tuple[str, ...],
+        resample_seconds: int,
+        with_excluded_range: bool = False,
+    ) -> str:
+        """
+        Function to get the statement to query the mean values of the attributes \
+            for each time step
+
+        Args:
+            - service: Name of the Fiware Service
+            - entity_type: type of the entity
+            - attributes: names of the numeric attributes (without `time_index`)
+            - resample_seconds: size of the time steps in seconds
+            - with_excluded_range: if true, the statement has parameters \
+                for a time range, which is not queried
+
+        Return:
+            - text of the statement
+        """
+        return self._get_statement(
+            (
+                "select_resampled",
+                service,
+                entity_type,
+                attributes,
+                resample_seconds,
+                with_excluded_range,
+            ),
+            lambda: (
+                f"SELECT DATE_BIN(INTERVAL '{int(resample_seconds)} seconds', "
+                "time_index, 0) AS time_index, "
+                + ", ".join(
+                    f'AVG("{attribute}") AS "{attribute}"' for attribute in attributes
+                )
+                + f" FROM mt{service}.et{entity_type} "
+                + self._get_conditions(attributes, with_excluded_range)
+                + "GROUP BY 1 ORDER BY 1 limit ?"
+            ),
+        )
+
+    def select_chunk(
+        self,
+        service: str,
+        entity_type: str,
+        attributes: tuple[str, ...],
+        with_start: bool,
+        with_excluded_range: bool = False,
+    ) -> str:
+        """
+        Function to get the statement to query a chunk of the values of the attributes \
+            ordered by the time index
+
+        Args:
+            - service: Name of the Fiware Service
+            - entity_type: type of the entity
+            - attributes: names of the numeric attributes (without `time_index`)
+            - with_start: if true, the statement has a parameter for the first \
+                timestamp of the chunk
+            - with_excluded_range: if true, the statement has parameters \
+                for a time range, which is not queried
+
+        Return:
+            - text of the statement
+        """
+        return self._get_statement(
+            (
+                "select_chunk",
+                service,
+                entity_type,
+                attributes,
+                with_start,
+                with_excluded_range,
+            ),
+            lambda: (
+                "SELECT time_index, "
+                + ", ".join(f'"{attribute}"' for attribute in attributes)
+                + f" FROM mt{service}.et{entity_type} "
+                + self._get_conditions(attributes, with_excluded_range)
+                + ("AND time_index >= ? " if with_start else "")
+                + "ORDER BY time_index limit ?"
+            ),
+        )
 
 
 class CrateDBConnection:
@@ -17,6 +357,12 @@ class CrateDBConnection:
         - crate_db_user: Name of the User of CrateDB
         - crate_db_pw: Password of the User of CrateDB
         - crate_db_ssl: Verify the SSL-Cert?
+        - pool_size: Maximum number of connections to the CrateDB at the same time
+        - idle_timeout: Time in seconds after which an idle connection is closed
+        - health_check_interval: Time in seconds after which an idle connection \
+            is checked before it is reused
+        - schema_cache_ttl: Time in seconds for which the columns of a table are cached \
+            (0: no cache)
     """
 
     def __init__(
@@ -25,11 +371,25 @@ class CrateDBConnection:
         crate_db_user: str = None,
         crate_db_pw: str = None,
         crate_db_ssl: bool = False,
+        pool_size: int = 5,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+        schema_cache_ttl: float = 300.0,
     ) -> None:
         self.crate_db_url = crate_db_url
         self.crate_db_user = crate_db_user
         self.crate_db_pw = crate_db_pw
         self.crate_db_ssl = crate_db_ssl
+        self.pool = CrateDBConnectionPool(
+            connection_factory=self.get_database_connection,
+            pool_size=pool_size,
+            idle_timeout=idle_timeout,
+            health_check_interval=health_check_interval,
+        )
+        self.schema_cache_ttl = schema_cache_ttl
+        self._schema_cache: dict[tuple[str, str], tuple[float, dict[str, str]]] = {}
+        self._schema_cache_lock = threading.Lock()
+        self.query_builder = CrateDBQueryBuilder()
 
     def get_database_connection(self) -> crate.client.connection:
         """
@@ -49,6 +409,60 @@ class CrateDBConnection:
 
         return connection
 
+    def get_table_columns(
+        self,
+        service: str,
+        entity_type: str,
+    ) -> dict[str, str]:
+        """
+        Function to get the columns of the table of an entity type \
+            (cached for the time `schema_cache_ttl`)
+
+        Args:
+            service (str): Name of the Fiware Service
+            entity_type (str): type of the entity
+        Return:
+            dict[str, str]: names of the columns with their data types
+        """
+        key = (service, entity_type)
+        with self._schema_cache_lock:
+            cached = self._schema_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.schema_cache_ttl:
+            return cached[1]
+
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                CrateDBQueryBuilder.COLUMNS_STATEMENT,
+                (f"et{entity_type}", f"mt{service}"),
+            )
+            columns = {column[0]: column[1] for column in cursor.fetchall()}
+            cursor.close()
+
+        if self.schema_cache_ttl > 0:
+            with self._schema_cache_lock:
+                self._schema_cache[key] = (time.monotonic(), columns)
+
+        return columns
+
+    def invalidate_schema_cache(
+        self,
+        service: Optional[str] = None,
+        entity_type: Optional[str] = None,
+    ) -> None:
+        """
+        Function to remove the cached columns of a table or of all tables
+
+        Args:
+            service (Optional[str]): Name of the Fiware Service (None: all tables)
+            entity_type (Optional[str]): type of the entity (None: all tables)
+        """
+        with self._schema_cache_lock:
+            if service is None or entity_type is None:
+                self._schema_cache.clear()
+            else:
+                self._schema_cache.pop((service, entity_type), None)
+
     def query_existing_attributes(
         self,
         service: str,
@@ -64,27 +478,28 @@ class CrateDBConnection:
         Return:
             list: list of existing attributes
         """
-        connection = self.get_database_connection()
-
-        cursor = connection.cursor()
+        columns = self.get_table_columns(service=service, entity_type=entity_type)
 
-        attrs = "'time_index'"
-        for attribute in list(attributes):
-            attrs += ", '" + str(attribute) + "'"
+        return self._get_existing_attributes(columns=columns, attributes=attributes)
 
-        # check which column exists
-        cursor.execute(
-            f"SELECT column_name FROM information_schema.columns "
-            f"WHERE table_name = 'et{entity_type}' "
-            f"AND table_schema = 'mt{service}' "
-            f"AND column_name IN ({attrs})"
-        )
-        attributes_db = list({column[0] for column in cursor.fetchall()})
+    @staticmethod
+    def _get_existing_attributes(columns: dict[str, str], attributes: list) -> list:
+        """
+        Function to get the existing attributes (with the time index) \
+            of the columns of a table
 
-        cursor.close()
-        connection.close()
+        Args:
+            - columns: names of the columns with their data types
+            - attributes: list of attribute names
 
-        return attributes_db
+        Return:
+            - list of existing attributes
+        """
+        return [
+            attribute
+            for attribute in dict.fromkeys(["time_index", *map(str, attributes)])
+            if attribute in columns
+        ]
 
     def get_data(
         self,
@@ -94,10 +509,17 @@ class CrateDBConnection:
         from_date: str,
         to_date: str,
         limit: int = 100000,
+        resample_seconds: Optional[int] = None,
+        excluded_range: Optional[tuple[str, str]] = None,
     ):
         """
         Function to query data from cratedb
 
+        If `resample_seconds` is set, the data is resampled in the CrateDB: \
+            The mean of each numeric attribute is calculated for time steps of this size \
+            (`DATE_BIN` from the epoch, labeled with the start of the time step). \
+            Only time steps with data are returned, non-numeric attributes are ignored.
+
         Args:
             - service: Name of the Fiware Service
             - entity (ContextEntity): Fiware Entity
@@ -107,46 +529,195 @@ class CrateDBConnection:
             - to_date: timestamp up to which data is to be retrieved\
                 (Milliseconds or Datetime (%Y-%m-%dT%H:%M:%S%z))
             - limit: maximal number of datapoints
+            - resample_seconds: size of the time steps in seconds for the resampling \
+                in the database (None: no resampling)
+            - excluded_range: start (included) and end (excluded) of a time range \
+                within the time bounds, which is not queried (None: no time range)
 
         Return:
             - dataframe with time index in utc and attributes as columns
         """
 
-        attributes_db = self.query_existing_attributes(
-            service=service, entity_type=entity.type, attributes=attributes
+        return self._retry_on_schema_change(
+            self._get_data,
+            service=service,
+            entity=entity,
+            attributes=attributes,
+            from_date=from_date,
+            to_date=to_date,
+            limit=limit,
+            resample_seconds=resample_seconds,
+            excluded_range=excluded_range,
         )
 
-        connection = self.get_database_connection()
-        cursor = connection.cursor()
+    def _retry_on_schema_change(
+        self,
+        query_function: Callable[..., pd.DataFrame],
+        service: str,
+        entity: ContextEntity,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Function to run a query with the cached columns of the table. \
+            If a column or the table is unknown, the cache of the table is cleared \
+            and the query is run again.
+
+        Args:
+            - query_function: function to query the data
+            - service: Name of the Fiware Service
+            - entity (ContextEntity): Fiware Entity
+            - kwargs: further arguments of the query function
 
-        # query existing columns
-        attrs = ""
-        attrs_not_null = ""
-        for attribute in attributes_db:
-            if attribute == attributes_db[-1]:
-                attrs += '"' + str(attribute) + '"'
+        Return:
+            - result of the query function
+        """
+        try:
+            return query_function(service=service, entity=entity, **kwargs)
+        except crate.client.exceptions.ProgrammingError as err:
+            if not any(error in str(err) for error in SCHEMA_CHANGE_ERRORS):
+                raise
+            logger.debug(
+                f"Schema of the table et{entity.type} has changed, "
+                f"the columns are queried again: {err}"
+            )
+            self.invalidate_schema_cache(service=service, entity_type=entity.type)
 
-            else:
-                attrs += '"' + str(attribute) + '", '
-
-            if attribute != "time_index" and attrs_not_null != "":
-                attrs_not_null += ' OR "' + str(attribute) + '" IS NOT NULL'
-            elif attribute != "time_index":
-                attrs_not_null += '"' + str(attribute) + '" IS NOT NULL'
-
-        cursor.execute(
-            f"SELECT {attrs} FROM mt{service}.et{entity.type} "
-            f"WHERE entity_id = '{entity.id}' "
-            f"AND time_index > '{from_date}' AND time_index < '{to_date}' "
-            f"AND ({attrs_not_null}) "
-            f"limit {limit}"
+        return query_function(service=service, entity=entity, **kwargs)
+
+    def _get_data(
+        self,
+        service: str,
+        entity: ContextEntity,
+        attributes: list,
+        from_date: str,
+        to_date: str,
+        limit: int,
+        resample_seconds: Optional[int],
+        excluded_range: Optional[tuple[str, str]],
+    ) -> pd.DataFrame:
+        """
+        Function to query data from cratedb with the (cached) existing columns, \
+            see `get_data`
+        """
+        columns = self.get_table_columns(service=service, entity_type=entity.type)
+        attributes_db = self._get_existing_attributes(
+            columns=columns, attributes=attributes
+        )
+
+        if resample_seconds is not None:
+            statement = self._get_resampling_statement(
+                service=service,
+                entity=entity,
+                columns=columns,
+                attributes_db=attributes_db,
+                resample_seconds=resample_seconds,
+                with_excluded_range=excluded_range is not None,
+            )
+        else:
+            statement = self.query_builder.select(
+                service=service,
+                entity_type=entity.type,
+                attributes=tuple(attributes_db),
+                with_excluded_range=excluded_range is not None,
+            )
+        if statement is None:
+            return pd.DataFrame()
+
+        return self._query_dataframe(
+            statement,
+            parameters=(entity.id, from_date, to_date)
+            + (tuple(excluded_range) if excluded_range is not None else ())
+            + (limit,),
         )
-        results = cursor.fetchall()
+
+    def _get_resampling_statement(
+        self,
+        service: str,
+        entity: ContextEntity,
+        columns: dict[str, str],
+        attributes_db: list,
+        resample_seconds: int,
+        with_excluded_range: bool = False,
+    ) -> Optional[str]:
+        """
+        Function to get the statement to query the mean values of the numeric \
+            attributes for each time step
+
+        Args:
+            - service: Name of the Fiware Service
+            - entity (ContextEntity): Fiware Entity
+            - columns: names of the columns of the table with their data types
+            - attributes_db: list of the existing attribute names
+            - resample_seconds: size of the time steps in seconds
+            - with_excluded_range: if true, the statement has parameters \
+                for a time range, which is not queried
+
+        Return:
+            - statement or None, if there are no numeric attributes to query
+        """
+        attributes_numeric = self._get_numeric_attributes(
+            columns=columns, attributes_db=attributes_db
+        )
+        if attributes_numeric is None:
+            return None
+
+        return self.query_builder.select_resampled(
+            service=service,
+            entity_type=entity.type,
+            attributes=attributes_numeric,
+            resample_seconds=resample_seconds,
+            with_excluded_range=with_excluded_range,
+        )
+
+    @staticmethod
+    def _get_numeric_attributes(
+        columns: dict[str, str],
+        attributes_db: list,
+    ) -> Optional[tuple[str, ...]]:
+        """
+        Function to get the numeric attributes of the existing attributes
+
+        Args:
+            - columns: names of the columns of the table with their data types
+            - attributes_db: list of the existing attribute names
+
+        Return:
+            - names of the numeric attributes or None, if there are no numeric attributes \
+                or no time index
+        """
+        attributes_numeric = tuple(
+            attribute
+            for attribute in attributes_db
+            if attribute != "time_index"
+            and columns.get(attribute) in NUMERIC_DATA_TYPES
+        )
+        if "time_index" not in attributes_db or len(attributes_numeric) == 0:
+            return None
+        return attributes_numeric
+
+    def _query_dataframe(self, statement: str, parameters: tuple) -> pd.DataFrame:
+        """
+        Function to query a statement and convert the result to a dataframe
+
+        Args:
+            - statement: SQL statement with the column `time_index`
+            - parameters: values of the bound parameters of the statement
+
+        Return:
+            - dataframe with time index in utc and the other columns
+        """
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(statement, parameters)
+            results = cursor.fetchall()
+            columns = [desc[0] for desc in cursor.description]
+            cursor.close()
+        METRICS.inc(CRATEDB_ROWS_FETCHED, len(results))
 
         if len(results) > 0:
             df = pd.DataFrame(results)
 
-            df.columns = [desc[0] for desc in cursor.description]
+            df.columns = columns
 
             df.time_index = pd.to_datetime(df.time_index, unit="ms").dt.tz_localize(
                 "UTC"
@@ -157,7 +728,168 @@ class CrateDBConnection:
         else:
             df = pd.DataFrame()
 
-        cursor.close()
-        connection.close()
-
         return df
+
+    def iter_data_chunks(
+        self,
+        service: str,
+        entity: ContextEntity,
+        attributes: list,
+        from_date: str,
+        to_date: str,
+        chunk_size: int,
+        limit: int = 100000,
+        excluded_range: Optional[tuple[str, str]] = None,
+    ) -> Iterator[tuple[np.ndarray, dict[str, np.ndarray]]]:
+        """
+        Function to query the numeric attributes of an entity in chunks \
+            (keyset pagination over the time index)
+
+        Each chunk is queried with an own request, so only one chunk of data \
+            is in memory at the same time. Values with the same timestamp \
+            are always in the same chunk (unless there are more than `chunk_size`).
+
+        Args:
+            - service: Name of the Fiware Service
+            - entity (ContextEntity): Fiware Entity
+            - attributes: list of attribute names
+            - from_date: timestamp from which data is to be retrieved\
+                (Milliseconds or Datetime (%Y-%m-%dT%H:%M:%S%z))
+            - to_date: timestamp up to which data is to be retrieved\
+                (Milliseconds or Datetime (%Y-%m-%dT%H:%M:%S%z))
+            - chunk_size: maximal number of datapoints of a chunk
+            - limit: maximal number of datapoints over all chunks
+            - excluded_range: start (included) and end (excluded) of a time range \
+                within the time bounds, which is not queried (None: no time range)
+
+        Yields:
+            - timestamps of the chunk in milliseconds and the values of the numeric \
+                attributes as arrays (missing values as NaN)
+        """
+        columns = self.get_table_columns(service=service, entity_type=entity.type)
+        attributes_numeric = self._get_numeric_attributes(
+            columns=columns,
+            attributes_db=self._get_existing_attributes(
+                columns=columns, attributes=attributes
+            ),
+        )
+        if attributes_numeric is None:
+            return
+
+        last_timestamp = None
+        number_of_values = 0
+        while number_of_values < limit:
+            size = min(chunk_size, limit - number_of_values)
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(
+                    self.query_builder.select_chunk(
+                        service=service,
+                        entity_type=entity.type,
+                        attributes=attributes_numeric,
+                        with_start=last_timestamp is not None,
+                        with_excluded_range=excluded_range is not None,
+                    ),
+                    (entity.id, from_date, to_date)
+                    + (tuple(excluded_range) if excluded_range is not None else ())
+                    + ((last_timestamp,) if last_timestamp is not None else ())
+                    + (size,),
+                )
+                results = cursor.fetchall()
+                cursor.close()
+            METRICS.inc(CRATEDB_ROWS_FETCHED, len(results))
+
+            if len(results) == 0:
+                return
+
+            time_index = np.fromiter((row[0] for row in results), dtype=np.int64)
+            if len(results) == size and time_index[0] != time_index[-1]:
+                # values of the last timestamp could be incomplete, \
+                # they are queried with the next chunk
+                complete = time_index < time_index[-1]
+                results = [row for row, keep in zip(results, complete) if keep]
+                time_index = time_index[complete]
+                last_timestamp = int(time_index[-1]) + 1
+            elif len(results) == size:
+                last_timestamp = int(time_index[-1]) + 1
+            else:
+                last_timestamp = None
+
+            values = {
+                attribute: np.array(
+                    [row[position] for row in results], dtype=np.float64
+                )
+                for position, attribute in enumerate(attributes_numeric, start=1)
+            }
+            number_of_values += len(results)
+            yield time_index, values
+
+            if last_timestamp is None:
+                return
+
+    def get_resampled_data(
+        self,
+        service: str,
+        entity: ContextEntity,
+        attributes: list,
+        from_date: str,
+        to_date: str,
+        resample_seconds: int,
+        chunk_size: int,
+        limit: int = 100000,
+        excluded_range: Optional[tuple[str, str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Function to query data from cratedb in chunks and to resample it incrementally \
+            (mean of the numeric attributes for each time step)
+
+        The result is the same as the resampling with pandas of the data from `get_data`, \
+            but the raw data is never completely in memory.
+
+        Args:
+            - service: Name of the Fiware Service
+            - entity (ContextEntity): Fiware Entity
+            - attributes: list of attribute names
+            - from_date: timestamp from which data is to be retrieved\
+                (Milliseconds or Datetime (%Y-%m-%dT%H:%M:%S%z))
+            - to_date: timestamp up to which data is to be retrieved\
+                (Milliseconds or Datetime (%Y-%m-%dT%H:%M:%S%z))
+            - resample_seconds: size of the time steps in seconds
+            - chunk_size: maximal number of datapoints of a chunk
+            - limit: maximal number of datapoints
+            - excluded_range: start (included) and end (excluded) of a time range \
+                within the time bounds, which is not queried (None: no time range)
+
+        Return:
+            - dataframe with time index in utc and attributes as columns
+        """
+
+        def query_resampled_data(service: str, entity: ContextEntity) -> pd.DataFrame:
+            resampler = None
+            for time_index, values in self.iter_data_chunks(
+                service=service,
+                entity=entity,
+                attributes=attributes,
+                from_date=from_date,
+                to_date=to_date,
+                chunk_size=chunk_size,
+                limit=limit,
+                excluded_range=excluded_range,
+            ):
+                if resampler is None:
+                    resampler = IncrementalMeanResampler(
+                        step_seconds=resample_seconds, columns=list(values)
+                    )
+                resampler.add(time_index_ms=time_index, values=values)
+
+            return resampler.result() if resampler is not None else pd.DataFrame()
+
+        return self._retry_on_schema_change(
+            query_resampled_data, service=service, entity=entity
+        )
+
+    def close(self) -> None:
+        """
+        Function to close the connections to the CrateDB
+        """
+        self.pool.close()
@@ -0,0 +1,109 @@
+"""
+Description: This file contains the class OutputDeduplicator,\
+    which filters output values that have not changed since they were last sent.
+Author: Martin Altenburger
+"""
+
+import time
+from typing import Any, Hashable
+import pandas as pd
+
+
+class OutputDeduplicator:
+    """
+    Remembers the last sent value of each output (entity, attribute, interface) \
+        and checks if a new value has to be sent.
+
+    A value is sent if it is not sent before, if it changed beyond the deadband \
+        (numbers) or at all (other values), if the unit changed \
+        or if the maximum silence interval is up. A value is only remembered \
+        with `commit` after it was sent, so a value which could not be sent \
+        is compared with the last delivered value.
+
+    Args:
+        deadband (float): Maximum absolute change of a numeric value \
+            which is not sent (0: every change is sent)
+        max_silence (float): Time in seconds after which a value is sent again, \
+            even if it did not change (0: unchanged values are not sent again)
+    """
+
+    def __init__(self, deadband: float = 0.0, max_silence: float = 0.0) -> None:
+        self.deadband = deadband
+        self.max_silence = max_silence
+        self._sent: dict[tuple[str, str, str], tuple[Any, Hashable, float]] = {}
+
+    def _is_value_changed(self, last_value: Any, value: Any) -> bool:
+        """
+        Function to compare a value with the last sent value
+
+        Args:
+            last_value (Any): Last sent value
+            value (Any): New value
+
+        Returns:
+            bool: True, if the value changed (beyond the deadband)
+        """
+        if isinstance(value, pd.DataFrame) or isinstance(last_value, pd.DataFrame):
+            return not (
+                isinstance(value, pd.DataFrame)
+                and isinstance(last_value, pd.DataFrame)
+                and value.equals(last_value)
+            )
+        if (
+            isinstance(value, (int, float))
+            and isinstance(last_value, (int, float))
+            and not isinstance(value, bool)
+            and not isinstance(last_value, bool)
+        ):
+            return not abs(value - last_value) <= self.deadband
+        try:
+            return bool(value != last_value)
+        except (TypeError, ValueError):
+            return True
+
+    def check(
+        self,
+        key: tuple[str, str, str],
+        value: Any,
+        unit: Hashable = None,
+    ) -> bool:
+        """
+        Function to check if a value has to be sent. The value is only remembered \
+            as sent value with `commit`, after it was sent.
+
+        Args:
+            key (tuple[str, str, str]): ID of the output entity, ID of the attribute \
+                or command and the interface
+            value (Any): Value to send
+            unit (Hashable): Unit of the value
+
+        Returns:
+            bool: True, if the value has to be sent
+        """
+        last = self._sent.get(key)
+        return not (
+            last is not None
+            and last[1] == unit
+            and not self._is_value_changed(last_value=last[0], value=value)
+            and (self.max_silence <= 0 or time.monotonic() - last[2] < self.max_silence)
+        )
+
+    def commit(
+        self,
+        key: tuple[str, str, str],
+        value: Any,
+        unit: Hashable = None,
+    ) -> None:
+        """
+        Function to remember a value as sent value, after it was sent
+
+        Args:
+            key (tuple[str, str, str]): ID of the output entity, ID of the attribute \
+                or command and the interface
+            value (Any): Sent value
+            unit (Hashable): Unit of the value
+        """
+        if isinstance(value, pd.DataFrame):
+            # a dataframe could be changed in place and sent again
+            value = value.copy()
+        self._sent[key] = (value, unit, time.monotonic())
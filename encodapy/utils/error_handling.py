@@ -60,3 +60,18 @@ class InterfaceNotActive(Exception):
     ):
         self.message = message
         super().__init__(self.message)
+
+
+class OutputSendingError(Exception):
+    """Exception raised if the output data could not be sent via an interface.
+
+    Attributes:
+        message -- explanation of the error
+    """
+
+    def __init__(
+        self,
+        message: str = "The output data could not be sent",
+    ):
+        self.message = message
+        super().__init__(self.message)
@@ -4,9 +4,12 @@ Description: This file contains the class BaererToken,\
 Author: Martin Altenburger
 """
 
-from typing import Union
+import threading
+import time
+from typing import Callable, Optional, Union
 import requests
-from oauthlib.oauth2 import BackendApplicationClient
+from loguru import logger
+from oauthlib.oauth2 import BackendApplicationClient, OAuth2Error
 from requests_oauthlib import OAuth2Session
 
 
@@ -14,8 +17,20 @@ class BaererToken:
     """
     Checks if an OAuth2 bearer token is valid.
 
-    Returns:
-        bool: True, if token is valid
+    The expiry of a token is tracked locally with the `expires_in` of the token response, \
+        so that no request to the token endpoint is needed to check the token. \
+        With `start_refresh`, the token is refreshed in the background \
+        shortly before it expires (`refresh_margin`).
+
+    Args:
+        client_id (str): ID of the client
+        client_secret (str): Secret of the client
+        token_url (str): URL of the token endpoint of the OAuth2 provider
+        token (Union[str, None]): Static token (no refresh)
+        refresh_margin (float): Time in seconds before the expiry \
+            at which the token is refreshed
+        retry_interval (float): Time in seconds to wait after a failed refresh \
+            in the background
     """
 
     def __init__(
@@ -24,6 +39,8 @@ class BaererToken:
         client_secret: str = None,
         token_url: str = None,
         token: Union[str, None] = None,
+        refresh_margin: float = 30.0,
+        retry_interval: float = 5.0,
     ) -> None:
         self.client_id = client_id
         self.client_secret = client_secret
@@ -33,34 +50,43 @@ class BaererToken:
             self.token_typ = "static"
         else:
             self.token_typ = "limited"
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.expires_at: Optional[float] = None
+        self._refresh_at: Optional[float] = None
+        self._valid_until: Optional[float] = None
+
+        self._token_lock = threading.Lock()
+        self._stop_refresh = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
 
     def _is_token_valid(
         self,
+        for_refresh: bool = False,
     ) -> bool:
         """
-        Checks if an OAuth2 bearer token is valid.
+        Checks if an OAuth2 bearer token is valid (with the locally tracked expiry).
+
+        The background refresh gets a new token from the time of the refresh, \
+            the check of the token only shortly before the expiry, \
+            if the background refresh failed or is not running.
+
+        Args:
+            for_refresh (bool): Check for the background refresh
 
         Returns:
             bool: True, if token is valid
         """
         if self.token_typ == "static":
             return True
+        if self.token is None:
+            return False
+        valid_until = self._refresh_at if for_refresh else self._valid_until
+        if valid_until is None:
+            # no expiry in the token response
+            return True
 
-        response = requests.get(
-            url=f"""{self.token_url}/tokeninfo""",
-            params={"access_token": self.token},
-            timeout=10,
-        )
-
-        if response.status_code == 200:
-
-            token_info = response.json()
-            expires_in = token_info.get("expires_in")
-
-            if expires_in is None or expires_in > 10:
-                return True
-
-        return False
+        return time.monotonic() < valid_until
 
     def _get_new_token(self) -> None:
         """
@@ -68,18 +94,110 @@ class BaererToken:
         """
         client = BackendApplicationClient(client_id=self.client_id)
         oauth = OAuth2Session(client=client)
-        self.token = oauth.fetch_token(
+        requested_at = time.monotonic()
+        token_response = oauth.fetch_token(
             token_url=self.token_url,
             client_id=self.client_id,
             client_secret=self.client_secret,
-        )["access_token"]
+        )
+
+        self.token = token_response["access_token"]
+        expires_in = token_response.get("expires_in")
+        if expires_in is None:
+            self.expires_at = None
+            self._refresh_at = None
+            self._valid_until = None
+        else:
+            expires_in = float(expires_in)
+            # refresh the token before the expiry, but not in the first half of its lifetime
+            refresh_after = max(expires_in - self.refresh_margin, expires_in / 2)
+            self.expires_at = requested_at + expires_in
+            self._refresh_at = requested_at + refresh_after
+            self._valid_until = requested_at + (refresh_after + expires_in) / 2
+
+    def _refresh_token(self, for_refresh: bool = False) -> bool:
+        """
+        Function to get a new token, if the actual token is not valid anymore. \
+            The lock prevents parallel requests of the background refresh \
+            and the check of the token.
+
+        Args:
+            for_refresh (bool): Refresh of the token in the background
+
+        Returns:
+            bool: True if old token is valid, false if new token has been received
+        """
+        with self._token_lock:
+            if self._is_token_valid(for_refresh=for_refresh):
+                return True
+            self._get_new_token()
+            return False
+
+    def _run_refresh(self, on_refresh: Optional[Callable[[str], None]]) -> None:
+        """
+        Function to refresh the token in the background before it expires
+
+        Args:
+            on_refresh (Optional[Callable[[str], None]]): Function which is called \
+                with the new baerer-token after each refresh
+        """
+        while not self._stop_refresh.is_set():
+            if self._refresh_at is None and self.token is not None:
+                # the token has no expiry
+                return
+            wait_time = (
+                max(self._refresh_at - time.monotonic(), 0.0)
+                if self._refresh_at is not None
+                else 0.0
+            )
+            if self._stop_refresh.wait(timeout=wait_time):
+                return
+
+            try:
+                token_refreshed = not self._refresh_token(for_refresh=True)
+            except (requests.exceptions.RequestException, OAuth2Error) as err:
+                logger.warning(f"Could not refresh the baerer-token: {err}")
+                self._stop_refresh.wait(timeout=self.retry_interval)
+                continue
+
+            if token_refreshed and on_refresh is not None:
+                on_refresh(self.baerer_token)
+
+    def start_refresh(self, on_refresh: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Function to start the refresh of the token in a background thread
+
+        Args:
+            on_refresh (Optional[Callable[[str], None]]): Function which is called \
+                with the new baerer-token after each refresh
+        """
+        if self.token_typ == "static" or self._refresh_thread is not None:
+            return
+        self._stop_refresh.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._run_refresh,
+            args=(on_refresh,),
+            name="baerer-token-refresh",
+            daemon=True,
+        )
+        self._refresh_thread.start()
+
+    def stop_refresh(self) -> None:
+        """
+        Function to stop the refresh of the token in the background
+        """
+        if self._refresh_thread is None:
+            return
+        self._stop_refresh.set()
+        self._refresh_thread.join(timeout=5)
+        self._refresh_thread = None
 
     @property
     def token_type(self) -> str:
         """
         Returns the token type
         """
-        return self.token_type
+        return self.token_typ
 
     @property
     def baerer_token(self) -> str:
@@ -93,10 +211,12 @@ class BaererToken:
         Function to check if the actual baerer-token is valid and if not,\
             get a new baerer-token from oauth2-provider
 
+        The check uses the locally tracked expiry of the token, \
+            the token endpoint is only requested if a new token is needed.
+
         Returns:
             bool: True if old token is valid, false if new token has been received
         """
         if self._is_token_valid():
             return True
-        self._get_new_token()
-        return False
+        return self._refresh_token()
@@ -0,0 +1,299 @@
+"""
+Description: This file contains the class AsyncContextBrokerClient,\
+    which is used for a non-blocking communication with a FIWARE Context Broker (NGSI v2).
+Author: Martin Altenburger
+"""
+
+from typing import Any, Optional, Union
+import httpx
+from filip.clients.exceptions import BaseHttpClientException
+from filip.models.base import FiwareHeader
+from filip.models.ngsi_v2.context import (
+    ActionType,
+    ContextAttribute,
+    ContextEntity,
+    NamedCommand,
+    NamedContextAttribute,
+    Query,
+)
+
+# Maximum number of entities in a response of the Context Broker (Orion)
+MAX_PAGE_SIZE = 1000
+
+
+class AsyncContextBrokerClient:
+    """
+    Asynchronous client for the NGSI v2 API of a FIWARE Context Broker (e.g. Orion).
+
+    The client uses a pool of keep-alive connections and a timeout for each request, \
+        so that a slow response of the Context Broker does not block the event loop.
+    The FIWARE headers are read for each request, so that an updated authorization \
+        of the header is used directly.
+
+    Args:
+        url (str): URL of the Context Broker
+        fiware_header (FiwareHeader): FIWARE header (service, service path, authorization)
+        timeout (float): Timeout of a request in seconds
+        max_connections (int): Maximum number of connections in the pool
+    """
+
+    def __init__(
+        self,
+        url: str,
+        fiware_header: FiwareHeader,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+    ) -> None:
+        self.base_url = url.rstrip("/")
+        self.fiware_header = fiware_header
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """
+        Returns the actual FIWARE headers for a request
+        """
+        return self.fiware_header.model_dump(by_alias=True)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        error_message: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Function to send a request to the Context Broker
+
+        Args:
+            method (str): HTTP method of the request
+            path (str): Path of the request (relative to the URL of the Context Broker)
+            error_message (str): Message of the exception, if the request fails
+            **kwargs: Keyword arguments for the request (params, json, ...)
+
+        Raises:
+            BaseHttpClientException: If the request fails or the response is not ok
+
+        Returns:
+            httpx.Response: Response of the Context Broker
+        """
+        try:
+            response = await self._client.request(
+                method, path, headers=self.headers, **kwargs
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as err:
+            raise BaseHttpClientException(
+                message=f"{error_message}: {err}", response=None
+            ) from err
+
+        return response
+
+    @staticmethod
+    def _attributes_to_payload(
+        attrs: Union[list[Union[NamedContextAttribute, NamedCommand]], dict[str, dict]],
+    ) -> dict[str, dict]:
+        """
+        Function to convert the attributes to the payload of an update request
+
+        Args:
+            attrs (Union[list[Union[NamedContextAttribute, NamedCommand]], dict[str, dict]]): \
+                Attributes to send, or an already prepared payload
+
+        Returns:
+            dict[str, dict]: Payload with the attribute names as keys
+        """
+        if isinstance(attrs, dict):
+            return attrs
+        return {
+            attr.name: attr.model_dump(mode="json", exclude={"name"}, exclude_none=True)
+            for attr in attrs
+        }
+
+    async def get_entity(
+        self,
+        entity_id: str,
+        entity_type: Optional[str] = None,
+        attrs: Optional[list[str]] = None,
+    ) -> ContextEntity:
+        """
+        Function to get an entity from the Context Broker
+
+        Args:
+            entity_id (str): ID of the entity
+            entity_type (Optional[str]): Type of the entity
+            attrs (Optional[list[str]]): Names of the attributes to retrieve (default: all)
+
+        Returns:
+            ContextEntity: The entity
+        """
+        params = {}
+        if entity_type:
+            params["type"] = entity_type
+        if attrs:
+            params["attrs"] = ",".join(attrs)
+
+        response = await self._request(
+            "GET",
+            f"/v2/entities/{entity_id}",
+            error_message=f"Could not load entity {entity_id}",
+            params=params,
+        )
+        return ContextEntity(**response.json())
+
+    async def get_entity_attributes(
+        self,
+        entity_id: str,
+        entity_type: Optional[str] = None,
+        attrs: Optional[list[str]] = None,
+    ) -> dict[str, ContextAttribute]:
+        """
+        Function to get the attributes of an entity from the Context Broker
+
+        Args:
+            entity_id (str): ID of the entity
+            entity_type (Optional[str]): Type of the entity
+            attrs (Optional[list[str]]): Names of the attributes to retrieve (default: all)
+
+        Returns:
+            dict[str, ContextAttribute]: Attributes of the entity with the names as keys
+        """
+        params = {}
+        if entity_type:
+            params["type"] = entity_type
+        if attrs:
+            params["attrs"] = ",".join(attrs)
+
+        response = await self._request(
+            "GET",
+            f"/v2/entities/{entity_id}/attrs",
+            error_message=f"Could not load attributes from entity {entity_id}",
+            params=params,
+        )
+        return {
+            key: ContextAttribute(**values) for key, values in response.json().items()
+        }
+
+    async def update_or_append_entity_attributes(
+        self,
+        entity_id: str,
+        entity_type: Optional[str],
+        attrs: Union[list[NamedContextAttribute], dict[str, dict]],
+    ) -> None:
+        """
+        Function to update or append attributes of an entity (POST /v2/entities/{id}/attrs)
+
+        Args:
+            entity_id (str): ID of the entity
+            entity_type (Optional[str]): Type of the entity
+            attrs (Union[list[NamedContextAttribute], dict[str, dict]]): \
+                Attributes to update or append, or an already prepared payload
+        """
+        await self._request(
+            "POST",
+            f"/v2/entities/{entity_id}/attrs",
+            error_message=f"Could not update or append attributes of entity {entity_id}",
+            params={"type": entity_type} if entity_type else None,
+            json=self._attributes_to_payload(attrs),
+        )
+
+    async def update_existing_entity_attributes(
+        self,
+        entity_id: str,
+        entity_type: Optional[str],
+        attrs: list[Union[NamedContextAttribute, NamedCommand]],
+    ) -> None:
+        """
+        Function to update existing attributes or commands of an entity \
+            (PATCH /v2/entities/{id}/attrs)
+
+        Args:
+            entity_id (str): ID of the entity
+            entity_type (Optional[str]): Type of the entity
+            attrs (list[Union[NamedContextAttribute, NamedCommand]]): Attributes to update
+        """
+        await self._request(
+            "PATCH",
+            f"/v2/entities/{entity_id}/attrs",
+            error_message=f"Could not update attributes of entity {entity_id}",
+            params={"type": entity_type} if entity_type else None,
+            json=self._attributes_to_payload(attrs),
+        )
+
+    async def update(
+        self,
+        entities: list[Union[ContextEntity, dict]],
+        action_type: Union[ActionType, str] = ActionType.APPEND,
+    ) -> None:
+        """
+        Function to create, update or delete several entities in a single batch operation \
+            (POST /v2/op/update)
+
+        Args:
+            entities (list[Union[ContextEntity, dict]]): Entities of the batch operation, \
+                as models or already prepared payloads
+            action_type (Union[ActionType, str]): Action of the batch operation
+        """
+        action_type = ActionType(action_type)
+        await self._request(
+            "POST",
+            "/v2/op/update",
+            error_message=f"Update operation '{action_type.value}' failed",
+            json={
+                "actionType": action_type.value,
+                "entities": [
+                    (
+                        entity
+                        if isinstance(entity, dict)
+                        else entity.model_dump(
+                            mode="json", by_alias=True, exclude_none=True
+                        )
+                    )
+                    for entity in entities
+                ],
+            },
+        )
+
+    async def query(self, query: Query) -> list[ContextEntity]:
+        """
+        Function to query several entities with a single operation \
+            (POST /v2/op/query, paginated with the maximum page size)
+
+        Args:
+            query (Query): Entities and attributes to query
+
+        Returns:
+            list[ContextEntity]: Entities matching the query
+        """
+        payload = query.model_dump(mode="json", exclude_none=True)
+        entities = []
+        while True:
+            response = await self._request(
+                "POST",
+                "/v2/op/query",
+                error_message="Query operation failed",
+                params={
+                    "options": "count",
+                    "limit": MAX_PAGE_SIZE,
+                    "offset": len(entities),
+                },
+                json=payload,
+            )
+            page = response.json()
+            entities.extend(ContextEntity(**entity) for entity in page)
+            total_count = int(response.headers.get("Fiware-Total-Count", len(entities)))
+            if len(page) == 0 or len(entities) >= total_count:
+                return entities
+
+    async def close(self) -> None:
+        """
+        Function to close the connections of the client
+        """
+        await self._client.aclose()
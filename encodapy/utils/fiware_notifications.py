@@ -0,0 +1,85 @@
+"""
+Description: This file contains the class FiwareNotificationReceiver,\
+    which receives the notifications of subscriptions of a FIWARE Context Broker (NGSI v2).
+Author: Martin Altenburger
+"""
+
+import json
+from http.server import BaseHTTPRequestHandler
+from typing import Callable
+from loguru import logger
+from encodapy.utils.http_server import BackgroundHTTPServer, LoggingRequestHandler
+
+
+class FiwareNotificationReceiver(BackgroundHTTPServer):
+    """
+    Small HTTP server to receive the notifications of a FIWARE Context Broker \
+        in a background thread.
+
+    The Context Broker sends the notifications of a subscription as POST requests \
+        (`{"subscriptionId": ..., "data": [entities]}`). The entities of each notification \
+        are passed to the callback. With the port 0, a free port is chosen, \
+        so that the receiver can also be used as a local stand-in server in tests.
+
+    Args:
+        callback (Callable[[list[dict]], None]): Function to handle the entities \
+            of a notification (called in the thread of the server)
+        host (str): Host (interface) of the server
+        port (int): Port of the server (0: a free port is chosen)
+    """
+
+    name = "Receiver for FIWARE notifications"
+
+    def __init__(
+        self,
+        callback: Callable[[list[dict]], None],
+        host: str = "127.0.0.1",
+        port: int = 8090,
+    ) -> None:
+        super().__init__(host=host, port=port)
+        self.callback = callback
+
+    def _get_request_handler(self) -> type[BaseHTTPRequestHandler]:
+        """
+        Function to create the request handler of the server
+
+        Returns:
+            type[BaseHTTPRequestHandler]: Request handler, which passes the entities \
+                of the notifications to the callback
+        """
+        callback = self.callback
+        server_name = self.name
+
+        class NotificationHandler(LoggingRequestHandler):
+            """
+            Request handler for the notifications of the Context Broker
+            """
+
+            log_name = server_name
+
+            def do_POST(self) -> None:  # pylint: disable=invalid-name
+                """
+                Function to handle a notification of the Context Broker
+                """
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    notification = json.loads(self.rfile.read(length) or b"{}")
+                    entities = notification["data"]
+                except (ValueError, KeyError, TypeError) as err:
+                    logger.warning(f"Invalid notification from the Context Broker: {err}")
+                    self.send_response(400)
+                    self.end_headers()
+                    return
+
+                try:
+                    callback(entities)
+                except (ValueError, TypeError) as err:
+                    logger.error(f"Could not handle notification: {err}")
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+
+                self.send_response(204)
+                self.end_headers()
+
+        return NotificationHandler
@@ -0,0 +1,95 @@
+"""
+Description: This file contains the base class BackgroundHTTPServer \
+    for the small HTTP servers of the service, which run in a background thread.
+Author: Martin Altenburger
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from loguru import logger
+
+
+class LoggingRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler, which writes the access log of the server to the trace log \
+        instead of stderr
+
+    Attributes:
+        log_name (str): Name of the server in the log
+    """
+
+    log_name = "HTTP server"
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+        logger.trace(f"{self.log_name}: {format % args}")
+
+
+class BackgroundHTTPServer:
+    """
+    Small HTTP server which handles the requests in a background thread. \
+        The subclasses provide the request handler with `_get_request_handler`.
+
+    Args:
+        host (str): Host (interface) of the server
+        port (int): Port of the server (0: a free port is chosen)
+
+    Attributes:
+        name (str): Name of the server in the log and of the thread
+    """
+
+    name = "HTTP server"
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _get_request_handler(self) -> type[BaseHTTPRequestHandler]:
+        """
+        Function to create the request handler of the server
+
+        Returns:
+            type[BaseHTTPRequestHandler]: Request handler of the server
+        """
+        raise NotImplementedError
+
+    @property
+    def server_port(self) -> Optional[int]:
+        """
+        Returns the port of the running server (None if the server is not running)
+        """
+        if self._server is None:
+            return None
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        """
+        Function to start the server in a background thread
+        """
+        if self._server is not None:
+            return
+        self._server = ThreadingHTTPServer(
+            (self.host, self.port), self._get_request_handler()
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name=self.name.lower().replace(" ", "-"),
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(f"{self.name} is listening on port {self.server_port}")
+
+    def stop(self) -> None:
+        """
+        Function to stop the server
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+        self._server = None
+        self._thread = None
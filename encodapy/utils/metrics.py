@@ -0,0 +1,305 @@
+"""
+Description: This file contains the registry of the runtime metrics of the service \
+    and the HTTP exporter with the Prometheus text exposition format.
+Author: Martin Altenburger
+"""
+
+import threading
+from enum import Enum
+from http.server import BaseHTTPRequestHandler
+from typing import Optional
+from loguru import logger
+from encodapy.utils.http_server import BackgroundHTTPServer, LoggingRequestHandler
+
+
+class MetricTypes(Enum):
+    """
+    Enum class for the types of the metrics
+
+    Attributes:
+        COUNTER (str): Value which only increases "counter"
+        GAUGE (str): Value which is set to the actual value "gauge"
+        SUMMARY (str): Sum and count of observed values (e.g. durations) "summary"
+    """
+
+    COUNTER = "counter"
+    GAUGE = "gauge"
+    SUMMARY = "summary"
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry for the runtime metrics of the service.
+
+    The metrics are registered with `describe` and updated with `inc`, `set` \
+        and `observe`. Each metric can have several series with different labels \
+        (e.g. `interface="fiware"`). `render` returns all series \
+        in the Prometheus text exposition format.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, tuple[MetricTypes, str]] = {}
+        self._values: dict[str, dict[tuple[tuple[str, str], ...], list[float]]] = {}
+
+    def describe(self, name: str, metric_type: MetricTypes, description: str) -> None:
+        """
+        Function to register a metric
+
+        Args:
+            name (str): Name of the metric
+            metric_type (MetricTypes): Type of the metric
+            description (str): Description of the metric (HELP)
+        """
+        with self._lock:
+            self._metrics[name] = (metric_type, description)
+            self._values.setdefault(name, {})
+
+    def _get_series(self, name: str, labels: dict[str, str]) -> list[float]:
+        """
+        Function to get the values of a series of a metric (the lock must be held)
+
+        Args:
+            name (str): Name of the metric
+            labels (dict[str, str]): Labels of the series
+
+        Raises:
+            KeyError: If the metric is not registered
+
+        Returns:
+            list[float]: Values of the series (`[value]` or `[sum, count]` for summaries)
+        """
+        series = self._values[name]
+        key = tuple(sorted((label, str(value)) for label, value in labels.items()))
+        if key not in series:
+            series[key] = [0.0, 0] if self._metrics[name][0] is MetricTypes.SUMMARY else [0.0]
+        return series[key]
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """
+        Function to increase a counter
+
+        Args:
+            name (str): Name of the metric
+            value (float): Value to add
+            **labels: Labels of the series
+        """
+        with self._lock:
+            self._get_series(name, labels)[0] += value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """
+        Function to set the value of a gauge
+
+        Args:
+            name (str): Name of the metric
+            value (float): Actual value
+            **labels: Labels of the series
+        """
+        with self._lock:
+            self._get_series(name, labels)[0] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """
+        Function to add an observed value (e.g. a duration) to a summary
+
+        Args:
+            name (str): Name of the metric
+            value (float): Observed value
+            **labels: Labels of the series
+        """
+        with self._lock:
+            series = self._get_series(name, labels)
+            series[0] += value
+            series[1] += 1
+
+    @staticmethod
+    def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+        """
+        Function to format the labels of a series for the exposition format
+
+        Args:
+            labels (tuple[tuple[str, str], ...]): Labels of the series
+
+        Returns:
+            str: Formatted labels, e.g. `{interface="fiware"}` (empty without labels)
+        """
+        if len(labels) == 0:
+            return ""
+        formatted = ",".join(
+            f'{label}="'
+            + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            + '"'
+            for label, value in labels
+        )
+        return f"{{{formatted}}}"
+
+    def render(self) -> str:
+        """
+        Function to get all metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Metrics in the text exposition format (version 0.0.4)
+        """
+        lines = []
+        with self._lock:
+            for name, (metric_type, description) in self._metrics.items():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {metric_type.value}")
+                for labels, values in self._values[name].items():
+                    formatted_labels = self._format_labels(labels)
+                    if metric_type is MetricTypes.SUMMARY:
+                        lines.append(f"{name}_sum{formatted_labels} {values[0]}")
+                        lines.append(f"{name}_count{formatted_labels} {values[1]}")
+                    else:
+                        lines.append(f"{name}{formatted_labels} {values[0]}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+CYCLE_DURATION = "encodapy_cycle_duration_seconds"
+CYCLE_PHASE_DURATION = "encodapy_cycle_phase_duration_seconds"
+CYCLE_OVERRUNS = "encodapy_cycle_overruns_total"
+CYCLE_MISSED_TICKS = "encodapy_cycle_missed_ticks_total"
+INTERFACE_REQUESTS = "encodapy_interface_requests_total"
+INTERFACE_REQUEST_ERRORS = "encodapy_interface_request_errors_total"
+INTERFACE_REQUEST_DURATION = "encodapy_interface_request_duration_seconds"
+MQTT_MESSAGES_RECEIVED = "encodapy_mqtt_messages_received_total"
+CRATEDB_ROWS_FETCHED = "encodapy_cratedb_rows_fetched_total"
+COMPONENT_RUN_DURATION = "encodapy_component_run_duration_seconds"
+OUTPUT_QUEUE_DEPTH = "encodapy_output_queue_depth"
+OUTPUT_QUEUE_DROPPED = "encodapy_output_queue_dropped_total"
+
+METRICS.describe(
+    CYCLE_DURATION, MetricTypes.SUMMARY, "Duration of the calculation cycles"
+)
+METRICS.describe(
+    CYCLE_PHASE_DURATION,
+    MetricTypes.SUMMARY,
+    "Duration of the phases of the calculation cycles",
+)
+METRICS.describe(
+    CYCLE_OVERRUNS,
+    MetricTypes.COUNTER,
+    "Number of cycles which took longer than the sampling time",
+)
+METRICS.describe(
+    CYCLE_MISSED_TICKS,
+    MetricTypes.COUNTER,
+    "Number of ticks of the cycle scheduler which were skipped or coalesced",
+)
+METRICS.describe(
+    INTERFACE_REQUESTS, MetricTypes.COUNTER, "Number of requests to the interfaces"
+)
+METRICS.describe(
+    INTERFACE_REQUEST_ERRORS,
+    MetricTypes.COUNTER,
+    "Number of failed requests to the interfaces",
+)
+METRICS.describe(
+    INTERFACE_REQUEST_DURATION,
+    MetricTypes.SUMMARY,
+    "Duration of the requests to the interfaces",
+)
+METRICS.describe(
+    MQTT_MESSAGES_RECEIVED,
+    MetricTypes.COUNTER,
+    "Number of received MQTT messages",
+)
+METRICS.describe(
+    CRATEDB_ROWS_FETCHED, MetricTypes.COUNTER, "Number of rows fetched from the CrateDB"
+)
+METRICS.describe(
+    COMPONENT_RUN_DURATION,
+    MetricTypes.SUMMARY,
+    "Duration of the runs of the components",
+)
+METRICS.describe(
+    OUTPUT_QUEUE_DEPTH,
+    MetricTypes.GAUGE,
+    "Number of outputs in the output queues",
+)
+METRICS.describe(
+    OUTPUT_QUEUE_DROPPED,
+    MetricTypes.COUNTER,
+    "Number of outputs which were dropped or replaced in the output queues",
+)
+
+
+def record_interface_request(
+    interface: str, operation: str, duration: float, failed: bool = False
+) -> None:
+    """
+    Function to record a request to an interface in the metrics
+
+    Args:
+        interface (str): Name of the interface (e.g. `fiware`)
+        operation (str): Operation of the request (e.g. `input`, `send`)
+        duration (float): Duration of the request in seconds
+        failed (bool): True, if the request failed
+    """
+    METRICS.inc(INTERFACE_REQUESTS, interface=interface, operation=operation)
+    METRICS.observe(
+        INTERFACE_REQUEST_DURATION, duration, interface=interface, operation=operation
+    )
+    if failed:
+        METRICS.inc(INTERFACE_REQUEST_ERRORS, interface=interface, operation=operation)
+
+
+class MetricsExporter(BackgroundHTTPServer):
+    """
+    Small HTTP server which publishes the metrics of a registry \
+        in the Prometheus text exposition format (`GET /metrics`) in a background thread.
+
+    Args:
+        registry (MetricsRegistry): Registry with the metrics
+        host (str): Host (interface) of the server
+        port (int): Port of the server (0: a free port is chosen)
+    """
+
+    name = "Metrics exporter"
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = METRICS,
+        host: str = "0.0.0.0",
+        port: int = 9100,
+    ) -> None:
+        super().__init__(host=host, port=port)
+        self.registry = registry
+
+    def _get_request_handler(self) -> type[BaseHTTPRequestHandler]:
+        """
+        Function to create the request handler of the server
+
+        Returns:
+            type[BaseHTTPRequestHandler]: Request handler, which returns the metrics
+        """
+        registry = self.registry
+        server_name = self.name
+
+        class MetricsHandler(LoggingRequestHandler):
+            """
+            Request handler for the requests of the metrics
+            """
+
+            log_name = server_name
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                """
+                Function to return the metrics
+                """
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return MetricsHandler
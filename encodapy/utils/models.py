@@ -3,14 +3,16 @@ Description: This file contains the models for the use in the system controller
 Authors: Martin Altenburger
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 from pandas import DataFrame
 from pydantic import BaseModel, ConfigDict, field_validator
+from filip.models.base import DataType
 from filip.models.ngsi_v2.base import NamedMetadata
 from filip.models.ngsi_v2.context import ContextEntity
-from encodapy.config.models import AttributeModel, CommandModel
-from encodapy.config.types import AttributeTypes
+from encodapy.config.models import AttributeModel, CommandModel, MQTTTemplateConfig
+from encodapy.config.types import AttributeTypes, MQTTFormatTypes
 from encodapy.utils.units import DataUnits
 
 
@@ -80,6 +82,79 @@ class OutputDataAttributeModel(BaseModel):
     latest_timestamp_output: Optional[Union[datetime, None]] = None
 
 
+@dataclass(frozen=True, slots=True)
+class OutputAttributeRecord:
+    """
+    Lightweight record of the value of an output attribute for the interfaces.
+
+    The record is not validated and refers to the configuration of the attribute \
+        without changing it, so that the output values of different cycles \
+        or concurrent sendings do not affect each other. The fields of the configuration \
+        are available as properties, like in the AttributeModel.
+
+    Attributes:
+        config (AttributeModel): The configuration of the output attribute
+        value (Any): The value of the output attribute
+        unit (Optional[DataUnits]): The unit of the value
+        timestamp (Optional[datetime]): The timestamp of the value
+    """
+
+    config: AttributeModel
+    value: Any = None
+    unit: Optional[DataUnits] = None
+    timestamp: Optional[datetime] = None
+
+    @property
+    def id(self) -> str:  # pylint: disable=invalid-name
+        """Returns the id of the attribute"""
+        return self.config.id
+
+    @property
+    def id_interface(self) -> str:
+        """Returns the id of the attribute on the interface"""
+        return self.config.id_interface
+
+    @property
+    def type(self) -> AttributeTypes:
+        """Returns the type of the attribute"""
+        return self.config.type
+
+    @property
+    def datatype(self) -> DataType:
+        """Returns the data type of the attribute"""
+        return self.config.datatype
+
+    @property
+    def mqtt_format(self) -> Union[MQTTFormatTypes, MQTTTemplateConfig]:
+        """Returns the format of the attribute for MQTT"""
+        return self.config.mqtt_format
+
+
+@dataclass(frozen=True, slots=True)
+class OutputCommandRecord:
+    """
+    Lightweight record of the value of an output command for the interfaces \
+        (see OutputAttributeRecord).
+
+    Attributes:
+        config (CommandModel): The configuration of the output command
+        value (Any): The value of the output command
+    """
+
+    config: CommandModel
+    value: Any = None
+
+    @property
+    def id(self) -> str:  # pylint: disable=invalid-name
+        """Returns the id of the command"""
+        return self.config.id
+
+    @property
+    def id_interface(self) -> str:
+        """Returns the id of the command on the interface"""
+        return self.config.id_interface
+
+
 class OutputDataEntityModel(BaseModel):
     """
     Model for the status of the output data of the system controller.
@@ -198,12 +273,13 @@ class FiwareDatapointParameter(BaseModel):
 
     Attributes:
         entity (ContextEntity): The entity of the datapoint
-        attribute (AttributeModel): The attribute of the datapoint
+        attribute (Union[AttributeModel, OutputAttributeRecord]): \
+            The attribute of the datapoint
         metadata (list[NamedMetadata]): The metadata of the attribute
     """
 
     entity: ContextEntity
-    attribute: AttributeModel
+    attribute: Union[AttributeModel, OutputAttributeRecord]
     metadata: list[NamedMetadata]
 
 
@@ -233,12 +309,34 @@ class FiwareParameter(BaseModel):
         service (str): The service
         service_path (str): The service path
         authentication (Optional[Union[FiwareAuth, None]]): The authentication
+        async_client (bool): Use the asynchronous client for the context broker
+        timeout (float): The timeout of a request of the asynchronous client in seconds
+        max_connections (int): The maximum number of connections of the asynchronous client
+        timeseries_batch_size (int): The number of timeseries values in one batch request \
+            (0: one request for each value)
+        bulk_query (bool): Query all input entities together with paginated requests
+        output_timestamp_refresh_interval (float): The time in seconds for which \
+            the written timestamps of the outputs are used (0: read them in each cycle)
+        subscription (bool): Receive the input entities with notifications of a subscription
+        notification_url (Optional[str]): The URL of the service for the notifications
+        notification_host (str): The host of the local receiver for the notifications
+        notification_port (int): The port of the local receiver for the notifications
     """
 
     cb_url: str
     service: str
     service_path: str
     authentication: Optional[Union[FiwareAuth, None]] = None
+    async_client: bool = False
+    timeout: float = 10.0
+    max_connections: int = 10
+    timeseries_batch_size: int = 0
+    bulk_query: bool = False
+    output_timestamp_refresh_interval: float = 0.0
+    subscription: bool = False
+    notification_url: Optional[str] = None
+    notification_host: str = "127.0.0.1"
+    notification_port: int = 8090
 
 
 class DatabaseParameter(BaseModel):
@@ -250,12 +348,31 @@ class DatabaseParameter(BaseModel):
         crate_db_user (Optional[str]): The CrateDB user
         crate_db_pw (Optional[str]): The CrateDB password
         crate_db_ssl (Optional[bool]): The CrateDB ssl
+        crate_db_pool_size (int): The maximum number of connections to the CrateDB
+        crate_db_idle_timeout (float): The time in seconds after which an idle connection \
+            is closed
+        crate_db_health_check_interval (float): The time in seconds after which an idle \
+            connection is checked before it is reused
+        crate_db_schema_cache_ttl (float): The time in seconds for which the columns \
+            of a table are cached
+        crate_db_resampling (bool): Resample the timeseries in the CrateDB
+        crate_db_chunk_size (int): The maximum number of rows of a query \
+            (0: all rows at once)
+        crate_db_window_cache (bool): Cache the timeseries for an absolute timerange \
+            and query only the new data
     """
 
     crate_db_url: str
     crate_db_user: Optional[Union[str, None]] = None
     crate_db_pw: Optional[str] = ""
     crate_db_ssl: Optional[bool] = True
+    crate_db_pool_size: int = 5
+    crate_db_idle_timeout: float = 300.0
+    crate_db_health_check_interval: float = 30.0
+    crate_db_schema_cache_ttl: float = 300.0
+    crate_db_resampling: bool = False
+    crate_db_chunk_size: int = 0
+    crate_db_window_cache: bool = False
 
 
 class FiwareConnectionParameter(BaseModel):
@@ -269,3 +386,20 @@ class FiwareConnectionParameter(BaseModel):
 
     fiware_params: FiwareParameter
     database_params: DatabaseParameter
+
+
+class PhaseTimingModel(BaseModel):
+    """
+    Model for the summary of the durations of a phase of the service cycles.
+
+    Attributes:
+        count (int): The number of cycles with the phase in the ring buffer
+        p50 (float): The median of the duration in seconds
+        p95 (float): The 95th percentile of the duration in seconds
+        max (float): The maximum of the duration in seconds
+    """
+
+    count: int
+    p50: float
+    p95: float
+    max: float
@@ -0,0 +1,149 @@
+"""
+Description: This file contains the class OutputQueue,\
+    a bounded queue for the outputs which are sent in the background.
+Author: Martin Altenburger
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Callable, Hashable, Optional
+from loguru import logger
+from encodapy.config.types import QueuePolicies
+from encodapy.utils.metrics import (
+    METRICS,
+    OUTPUT_QUEUE_DEPTH,
+    OUTPUT_QUEUE_DROPPED,
+)
+
+
+class OutputQueue:
+    """
+    Bounded queue for the outputs of an interface, which are sent by a background writer.
+
+    The outputs are stored with a key (e.g. the ID of the output entity). \
+        If the queue is full, the policy (see `QueuePolicies`) decides \
+        if the service waits, the oldest output is dropped or the output \
+        of the same key is replaced.
+
+    Args:
+        maxsize (int): Maximum number of outputs in the queue
+        policy (QueuePolicies): Handling of a full queue
+        name (str): Name of the queue for the log and the metrics (e.g. the interface)
+        merge (Optional[Callable[[Any, Any], Any]]): Function to merge a queued output \
+            with a new output of the same key for the policy `coalesce` \
+            (None: the queued output is replaced)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10,
+        policy: QueuePolicies = QueuePolicies.BLOCK,
+        name: str = "output",
+        merge: Optional[Callable[[Any, Any], Any]] = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name
+        self.merge = merge
+        self.dropped = 0
+        self.coalesced = 0
+        self._items: deque[tuple[Hashable, Any]] = deque()
+        self._unfinished = 0
+        self._changed = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _update_depth(self) -> None:
+        """
+        Function to update the metric of the depth of the queue
+        """
+        METRICS.set(OUTPUT_QUEUE_DEPTH, len(self._items), queue=self.name)
+
+    def _coalesce(self, key: Hashable, item: Any) -> bool:
+        """
+        Function to replace a queued output with the same key \
+            or to merge the outputs (the lock must be held)
+
+        Args:
+            key (Hashable): Key of the output
+            item (Any): New output
+
+        Returns:
+            bool: True, if a queued output was replaced
+        """
+        for index, (queued_key, queued_item) in enumerate(self._items):
+            if queued_key == key:
+                # the output keeps its position in the queue
+                self._items[index] = (
+                    key,
+                    item if self.merge is None else self.merge(queued_item, item),
+                )
+                self.coalesced += 1
+                METRICS.inc(OUTPUT_QUEUE_DROPPED, queue=self.name, reason="coalesced")
+                return True
+        return False
+
+    async def put(self, key: Hashable, item: Any) -> None:
+        """
+        Function to add an output to the queue. If the queue is full, \
+            the output is handled with the policy of the queue.
+
+        Args:
+            key (Hashable): Key of the output (e.g. the ID of the output entity)
+            item (Any): Output to send
+        """
+        async with self._changed:
+            if self.policy is QueuePolicies.COALESCE and self._coalesce(key, item):
+                return
+
+            if len(self._items) >= self.maxsize:
+                if self.policy is QueuePolicies.DROP_OLDEST:
+                    dropped_key, _ = self._items.popleft()
+                    self._unfinished -= 1
+                    self.dropped += 1
+                    METRICS.inc(OUTPUT_QUEUE_DROPPED, queue=self.name, reason="dropped")
+                    logger.warning(
+                        f"Output queue {self.name} is full, "
+                        f"the oldest output ({dropped_key}) is dropped"
+                    )
+                else:
+                    logger.debug(f"Output queue {self.name} is full, waiting for space")
+                    await self._changed.wait_for(lambda: len(self._items) < self.maxsize)
+                    if self.policy is QueuePolicies.COALESCE and self._coalesce(key, item):
+                        return
+
+            self._items.append((key, item))
+            self._unfinished += 1
+            self._update_depth()
+            self._changed.notify_all()
+
+    async def get(self) -> tuple[Hashable, Any]:
+        """
+        Function to get the oldest output of the queue, \
+            waits until an output is available
+
+        Returns:
+            tuple[Hashable, Any]: Key and output
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: len(self._items) > 0)
+            key, item = self._items.popleft()
+            self._update_depth()
+            self._changed.notify_all()
+            return key, item
+
+    async def task_done(self) -> None:
+        """
+        Function to mark an output from `get` as sent
+        """
+        async with self._changed:
+            self._unfinished -= 1
+            self._changed.notify_all()
+
+    async def join(self) -> None:
+        """
+        Function to wait until all outputs of the queue are sent
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._unfinished <= 0)
@@ -0,0 +1,114 @@
+"""
+Description: Class to resample timeseries incrementally from chunks of data
+Author: Martin Altenburger
+"""
+
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+MILLISECONDS_PER_DAY = 86_400_000
+
+
+class IncrementalMeanResampler:
+    """
+    Class to calculate the mean values of timeseries for fixed time steps \
+        from chunks of data, without keeping the raw data in memory
+
+    Only the sum and the number of values of each time step are stored. \
+        The result is the same as `df.resample(f"{step_seconds}s").mean()` of pandas \
+        for a timeseries in UTC (time steps from the start of the first day).
+
+    Args:
+        - step_seconds: size of the time steps in seconds
+        - columns: names of the columns to resample
+    """
+
+    def __init__(self, step_seconds: int, columns: list[str]) -> None:
+        self.step_ms = int(step_seconds * 1000)
+        self.columns = columns
+
+        self._origin_ms: Optional[int] = None
+        self._first_step = 0
+        self._last_step = -1
+        self._sums = {column: np.zeros(0, dtype=np.float64) for column in columns}
+        self._counts = {column: np.zeros(0, dtype=np.int64) for column in columns}
+
+    def _grow(self, size: int) -> None:
+        """
+        Function to enlarge the arrays of sums and counts to the given number of time steps
+        """
+        for column in self.columns:
+            missing = size - len(self._sums[column])
+            if missing > 0:
+                self._sums[column] = np.concatenate(
+                    [self._sums[column], np.zeros(missing, dtype=np.float64)]
+                )
+                self._counts[column] = np.concatenate(
+                    [self._counts[column], np.zeros(missing, dtype=np.int64)]
+                )
+
+    def add(self, time_index_ms: np.ndarray, values: dict[str, np.ndarray]) -> None:
+        """
+        Function to add a chunk of data to the resampler
+
+        The chunks have to be added in chronological order.
+
+        Args:
+            - time_index_ms: timestamps of the chunk in milliseconds (UTC)
+            - values: values of the chunk for each column (missing values as NaN)
+        """
+        if len(time_index_ms) == 0:
+            return
+
+        if self._origin_ms is None:
+            first_timestamp = int(time_index_ms[0])
+            self._origin_ms = first_timestamp - first_timestamp % MILLISECONDS_PER_DAY
+            self._first_step = (first_timestamp - self._origin_ms) // self.step_ms
+
+        steps = (
+            time_index_ms.astype(np.int64) - self._origin_ms
+        ) // self.step_ms - self._first_step
+        if steps.min() < 0:
+            raise ValueError("The chunks of data have to be in chronological order")
+        self._last_step = max(self._last_step, self._first_step + int(steps.max()))
+        self._grow(self._last_step - self._first_step + 1)
+
+        for column in self.columns:
+            column_values = values[column]
+            valid = ~np.isnan(column_values)
+            self._sums[column] += np.bincount(
+                steps[valid],
+                weights=column_values[valid],
+                minlength=len(self._sums[column]),
+            )
+            self._counts[column] += np.bincount(
+                steps[valid], minlength=len(self._counts[column])
+            )
+
+    def result(self) -> pd.DataFrame:
+        """
+        Function to get the mean values of all time steps from the first to the last value
+
+        Returns:
+            pd.DataFrame: mean values with a time index in UTC \
+                (NaN for time steps without values)
+        """
+        if self._origin_ms is None:
+            return pd.DataFrame()
+
+        data = {}
+        for column in self.columns:
+            counts = self._counts[column]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                data[column] = np.where(counts > 0, self._sums[column] / counts, np.nan)
+
+        index = pd.date_range(
+            start=pd.Timestamp(
+                self._origin_ms + self._first_step * self.step_ms, unit="ms", tz="UTC"
+            ),
+            periods=self._last_step - self._first_step + 1,
+            freq=f"{self.step_ms // 1000}s",
+            name="datetime",
+        )
+        return pd.DataFrame(data, index=index)
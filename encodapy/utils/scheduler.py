@@ -0,0 +1,114 @@
+"""
+Description: This file contains the class CycleScheduler,\
+    which schedules the cycles of the loops of the service.
+Author: Martin Altenburger
+"""
+
+import asyncio
+import math
+import time
+from typing import Optional, Union
+from loguru import logger
+from encodapy.config.types import OverrunPolicies
+from encodapy.utils.metrics import CYCLE_MISSED_TICKS, CYCLE_OVERRUNS, METRICS
+
+
+class CycleScheduler:
+    """
+    Schedules the cycles of a loop on absolute ticks (`start_time + n * period`) \
+        of the monotonic clock, so that the cycles do not drift \
+        and are not affected by changes of the system time.
+
+    If a cycle takes longer than the period, the missed ticks are handled \
+        with the overrun policy (see `OverrunPolicies`). The overruns \
+        and the missed ticks are counted.
+
+    Args:
+        period (Union[int, float]): Time between the ticks in seconds
+        policy (OverrunPolicies): Handling of the missed ticks
+        start_time (Optional[float]): Time of the first tick (`time.monotonic()`), \
+            default is the actual time
+        name (str): Name of the loop for the log and the metrics
+    """
+
+    def __init__(
+        self,
+        period: Union[int, float],
+        policy: OverrunPolicies = OverrunPolicies.COALESCE,
+        start_time: Optional[float] = None,
+        name: str = "calculation",
+    ) -> None:
+        self.period = period
+        self.policy = policy
+        self.name = name
+        self.next_tick = time.monotonic() if start_time is None else start_time
+        self.ticks = 0
+        self.overruns = 0
+        self.missed_ticks = 0
+        self._catching_up = False
+
+    def _handle_overrun(self, now: float) -> float:
+        """
+        Function to handle the missed ticks after an overrun with the overrun policy
+
+        Args:
+            now (float): Actual time (`time.monotonic()`)
+
+        Returns:
+            float: Start time of the next cycle
+        """
+        # number of ticks which are completely passed after the due tick
+        passed_ticks = math.floor((now - self.next_tick) / self.period)
+
+        if not self._catching_up:
+            self.overruns += 1
+            METRICS.inc(CYCLE_OVERRUNS, loop=self.name)
+            logger.warning(
+                f"The processing time of the {self.name} is longer than the sampling time "
+                f"({passed_ticks + 1} tick(s) late, policy: {self.policy.value})."
+                " The sampling time must be increased!"
+            )
+
+        if self.policy is OverrunPolicies.IMMEDIATE:
+            # the following ticks are run one after another until the schedule is caught up
+            self._catching_up = True
+            return now
+
+        if self.policy is OverrunPolicies.SKIP:
+            missed_ticks = passed_ticks + 1
+            start_time = self.next_tick + missed_ticks * self.period
+        else:
+            missed_ticks = passed_ticks
+            start_time = now
+
+        self.missed_ticks += missed_ticks
+        METRICS.inc(CYCLE_MISSED_TICKS, missed_ticks, loop=self.name)
+        self.next_tick += missed_ticks * self.period
+        return start_time
+
+    async def wait_for_tick(self, stop_event: asyncio.Event) -> bool:
+        """
+        Function to wait until the next cycle should start (without polling)
+
+        Args:
+            stop_event (asyncio.Event): Event to stop the wait (e.g. the shutdown of the service)
+
+        Returns:
+            bool: True, if the stop event is set
+        """
+        now = time.monotonic()
+        start_time = self.next_tick
+        if self.ticks > 0 and now > self.next_tick:
+            start_time = self._handle_overrun(now=now)
+        else:
+            self._catching_up = False
+
+        if start_time > now:
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=start_time - now)
+            except asyncio.TimeoutError:
+                pass
+
+        self.ticks += 1
+        self.next_tick += self.period
+        return stop_event.is_set()
@@ -0,0 +1,38 @@
+"""
+Description: Functions to parse timestamps of the interfaces
+Author: Martin Altenburger
+"""
+
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Optional
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(
+    timestamp: str,
+    default_timezone: Optional[tzinfo] = None,
+) -> datetime:
+    """
+    Function to parse an ISO 8601 timestamp, \
+        e.g. `2025-01-01T00:00:00.000Z`, `2025-01-01T00:00:00+0100` or `2025-01-01 00:00`
+
+    The fractional seconds and the timezone are optional. \
+        The results are cached, because the same timestamps \
+        (e.g. of attributes which are not updated) are parsed in each cycle.
+
+    Args:
+        timestamp (str): Timestamp in ISO 8601 format
+        default_timezone (Optional[tzinfo]): Timezone for timestamps without timezone \
+            (None: the timestamp stays without timezone)
+
+    Raises:
+        ValueError: If the timestamp is not in ISO 8601 format
+
+    Returns:
+        datetime: The parsed timestamp
+    """
+    parsed_timestamp = datetime.fromisoformat(timestamp)
+    if parsed_timestamp.tzinfo is None and default_timezone is not None:
+        parsed_timestamp = parsed_timestamp.replace(tzinfo=default_timezone)
+    return parsed_timestamp
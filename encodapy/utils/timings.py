@@ -0,0 +1,139 @@
+"""
+Description: This file contains the class CycleTimings,\
+    which records the durations of the phases of the service cycles.
+Author: Martin Altenburger
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+import numpy as np
+from loguru import logger
+from encodapy.utils.models import PhaseTimingModel
+
+
+class CycleTimings:
+    """
+    Records the durations of the phases (e.g. `calculation`) of each cycle \
+        in a ring buffer with the last cycles.
+
+    A phase which runs several times in a cycle (e.g. the sending via an interface) \
+        is summed up. The total duration of each cycle is recorded as phase `cycle`.
+
+    Args:
+        size (int): Number of cycles in the ring buffer
+        log_interval (float): Time in seconds between the summaries in the log \
+            (0: no summaries in the log)
+    """
+
+    def __init__(self, size: int = 100, log_interval: float = 0.0) -> None:
+        self.log_interval = log_interval
+        self._cycles: deque[dict[str, float]] = deque(maxlen=size)
+        self._current: Optional[dict[str, float]] = None
+        self._cycle_start: Optional[float] = None
+        self._last_log = time.monotonic()
+
+    def start_cycle(self) -> None:
+        """
+        Function to start the recording of a new cycle
+        """
+        self._current = {}
+        self._cycle_start = time.perf_counter()
+
+    def record(self, phase: str, duration: float) -> None:
+        """
+        Function to add the duration of a phase to the current cycle \
+            (no recording if no cycle is started)
+
+        Args:
+            phase (str): Name of the phase
+            duration (float): Duration in seconds
+        """
+        if self._current is None:
+            return
+        self._current[phase] = self._current.get(phase, 0.0) + duration
+
+    @contextmanager
+    def phase(self, name: str, enabled: bool = True) -> Iterator[None]:
+        """
+        Context manager to record the duration of a phase of the current cycle
+
+        Args:
+            name (str): Name of the phase
+            enabled (bool): Record the duration (e.g. only for the calculation, \
+                not for the calibration)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if enabled:
+                self.record(phase=name, duration=time.perf_counter() - start)
+
+    def end_cycle(self) -> dict[str, float]:
+        """
+        Function to finish the recording of the current cycle \
+            and to log the summary, if the log interval is up
+
+        Returns:
+            dict[str, float]: Durations of the phases of the cycle in seconds \
+                (empty if no cycle is started)
+        """
+        if self._current is None:
+            return {}
+        cycle = self._current
+        cycle["cycle"] = time.perf_counter() - self._cycle_start
+        self._cycles.append(cycle)
+        self._current = None
+
+        if (
+            self.log_interval > 0
+            and time.monotonic() - self._last_log >= self.log_interval
+        ):
+            self._last_log = time.monotonic()
+            logger.info(f"Cycle timings: {self.format_summary()}")
+
+        return cycle
+
+    def summary(self) -> dict[str, PhaseTimingModel]:
+        """
+        Function to get the summary of the durations of all phases in the ring buffer
+
+        Returns:
+            dict[str, PhaseTimingModel]: Summary (count, p50, p95, max) \
+                with the name of the phase as key
+        """
+        cycles = list(self._cycles)
+        phases = dict.fromkeys(phase for cycle in cycles for phase in cycle)
+
+        summary = {}
+        for phase in phases:
+            durations = np.array([cycle[phase] for cycle in cycles if phase in cycle])
+            p50, p95 = np.percentile(durations, [50, 95])
+            summary[phase] = PhaseTimingModel(
+                count=len(durations),
+                p50=float(p50),
+                p95=float(p95),
+                max=float(durations.max()),
+            )
+        return summary
+
+    def format_summary(self) -> str:
+        """
+        Function to format the summary of the durations for the log
+
+        Returns:
+            str: Summary with the durations in milliseconds
+        """
+        return "; ".join(
+            f"{phase}: p50={timing.p50 * 1000:.1f}ms p95={timing.p95 * 1000:.1f}ms "
+            f"max={timing.max * 1000:.1f}ms (n={timing.count})"
+            for phase, timing in self.summary().items()
+        )
+
+    def clear(self) -> None:
+        """
+        Function to remove all recorded cycles
+        """
+        self._cycles.clear()
@@ -0,0 +1,69 @@
+"""
+Shared fixtures of the tests
+"""
+
+import json
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from encodapy.service.basic_service import ControllerBasicService
+
+SERVICE_CONFIG = {
+    "name": "test_service",
+    "interfaces": {"mqtt": False, "fiware": False, "file": True},
+    "inputs": [],
+    "outputs": [
+        {
+            "id": "storage",
+            "interface": "file",
+            "id_interface": "storage_results",
+            "attributes": [
+                {"id": "temperature", "id_interface": "temperature", "type": "value"},
+                {"id": "power", "id_interface": "power", "type": "value"},
+            ],
+            "commands": [{"id": "charge", "id_interface": "charge_cmd"}],
+        }
+    ],
+    "staticdata": [],
+    "controller_components": [],
+    "controller_settings": {
+        "time_settings": {
+            "calculation": {
+                "timerange": 1,
+                "timerange_unit": "hour",
+                "sampling_time": 1,
+                "sampling_time_unit": "second",
+            },
+            "calibration": {
+                "timerange": 1,
+                "timerange_unit": "hour",
+                "sampling_time": 1,
+                "sampling_time_unit": "minute",
+            },
+        }
+    },
+}
+
+
+@pytest.fixture(name="create_service")
+def fixture_create_service(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Callable[..., ControllerBasicService]:
+    """
+    Fixture to create a service with a file interface for the outputs \
+        and the given environment variables
+    """
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(SERVICE_CONFIG), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("CONFIG_PATH", str(config_path))
+    monkeypatch.setenv("FILE_PATH_OF_RESULTS", str(tmp_path / "results"))
+
+    def create_service(**env_values) -> ControllerBasicService:
+        for name, value in env_values.items():
+            monkeypatch.setenv(name.upper(), str(value))
+        return ControllerBasicService()
+
+    return create_service
@@ -0,0 +1,205 @@
+"""
+Tests for the pool of connections to the CrateDB
+"""
+
+import threading
+
+import pytest
+from crate.client.exceptions import ConnectionError as CrateDBConnectionError
+from crate.client.exceptions import ProgrammingError
+
+from encodapy.utils.cratedb import CrateDBConnectionPool
+
+
+class FakeCursor:
+    """
+    Cursor of a fake connection
+    """
+
+    def __init__(self, connection: "FakeConnection") -> None:
+        self.connection = connection
+
+    def execute(self, statement, parameters=None):
+        """
+        Function to execute a statement
+        """
+        self.connection.statements.append(statement)
+        if not self.connection.usable:
+            raise ProgrammingError("connection is broken")
+
+    def close(self):
+        """
+        Function to close the cursor
+        """
+
+
+class FakeConnection:
+    """
+    Fake connection to the CrateDB
+    """
+
+    def __init__(self) -> None:
+        self.closed = False
+        self.usable = True
+        self.statements: list[str] = []
+
+    def cursor(self) -> FakeCursor:
+        """
+        Function to get a cursor
+        """
+        return FakeCursor(self)
+
+    def close(self):
+        """
+        Function to close the connection
+        """
+        self.closed = True
+
+
+class FakeClock:
+    """
+    Fake monotonic clock of the pool
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch) -> FakeClock:
+    """
+    Fixture for a fake clock of the pool
+    """
+    clock = FakeClock()
+    monkeypatch.setattr("encodapy.utils.cratedb.time.monotonic", clock)
+    return clock
+
+
+def _get_pool(**kwargs) -> tuple[CrateDBConnectionPool, list[FakeConnection]]:
+    """
+    Function to get a pool with fake connections
+    """
+    connections: list[FakeConnection] = []
+
+    def connection_factory() -> FakeConnection:
+        connection = FakeConnection()
+        connections.append(connection)
+        return connection
+
+    return CrateDBConnectionPool(connection_factory=connection_factory, **kwargs), connections
+
+
+def test_idle_connection_is_reused():
+    """
+    A connection is only created once and reused for the following queries
+    """
+    pool, connections = _get_pool()
+
+    for _ in range(3):
+        with pool.connection() as connection:
+            assert connection is connections[0]
+
+    assert len(connections) == 1
+
+
+def test_pool_size_limits_the_connections():
+    """
+    Not more connections than the size of the pool are used at the same time
+    """
+    pool, connections = _get_pool(pool_size=2)
+    borrowed = threading.Event()
+    release = threading.Event()
+
+    def borrow():
+        with pool.connection():
+            borrowed.set()
+            release.wait(timeout=5)
+
+    threads = [threading.Thread(target=borrow) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    borrowed.wait(timeout=5)
+
+    waiting = threading.Thread(target=borrow)
+    waiting.start()
+    waiting.join(timeout=0.2)
+    assert waiting.is_alive()
+    assert len(connections) == 2
+
+    release.set()
+    for thread in [*threads, waiting]:
+        thread.join(timeout=5)
+    assert not waiting.is_alive()
+    assert len(connections) == 2
+
+
+def test_connection_error_closes_the_connection():
+    """
+    A connection with an error of the connection is closed and not reused
+    """
+    pool, connections = _get_pool()
+
+    with pytest.raises(CrateDBConnectionError):
+        with pool.connection():
+            raise CrateDBConnectionError("connection lost")
+    with pool.connection() as connection:
+        assert connection is connections[1]
+
+    assert connections[0].closed
+    assert len(connections) == 2
+
+
+def test_idle_timeout_closes_the_connection(clock):
+    """
+    A connection which was idle for longer than the idle timeout is replaced
+    """
+    pool, connections = _get_pool(idle_timeout=60.0, health_check_interval=30.0)
+    with pool.connection():
+        pass
+
+    clock.now += 61.0
+    with pool.connection() as connection:
+        assert connection is connections[1]
+
+    assert connections[0].closed
+    assert connections[0].statements == []
+
+
+def test_health_check_replaces_broken_connection(clock):
+    """
+    A connection which was idle for longer than the health check interval \
+        is checked and replaced, if it is not usable
+    """
+    pool, connections = _get_pool(idle_timeout=300.0, health_check_interval=30.0)
+    with pool.connection():
+        pass
+
+    clock.now += 10.0
+    with pool.connection() as connection:
+        assert connection is connections[0]
+    assert connections[0].statements == []
+
+    clock.now += 31.0
+    connections[0].usable = False
+    with pool.connection() as connection:
+        assert connection is connections[1]
+    assert connections[0].statements == ["SELECT 1"]
+    assert connections[0].closed
+
+
+def test_close_closes_the_idle_connections():
+    """
+    All idle connections are closed with the pool
+    """
+    pool, connections = _get_pool()
+    with pool.connection():
+        with pool.connection():
+            pass
+
+    pool.close()
+
+    assert len(connections) == 2
+    assert all(connection.closed for connection in connections)
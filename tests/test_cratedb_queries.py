@@ -0,0 +1,319 @@
+"""
+Tests for the statements of the CrateDB queries and the retry on schema changes
+"""
+
+from typing import Optional
+
+import pytest
+from crate.client.exceptions import ProgrammingError
+from filip.models.ngsi_v2.context import ContextEntity
+
+from encodapy.utils.cratedb import CrateDBConnection, CrateDBQueryBuilder
+
+COLUMNS = {
+    "time_index": "timestamp with time zone",
+    "entity_id": "text",
+    "temperature": "double precision",
+    "state": "text",
+}
+ENTITY = ContextEntity(id="sensor1", type="Sensor")
+FROM_DATE = "2025-01-01T00:00:00+0000"
+TO_DATE = "2025-01-01T01:00:00+0000"
+
+
+class FakeDatabase:
+    """
+    Fake CrateDB, which records the executed statements with their parameters
+    """
+
+    def __init__(self) -> None:
+        self.columns = dict(COLUMNS)
+        self.executed: list[tuple[str, Optional[tuple]]] = []
+        self.errors: list[Exception] = []
+        self.rows = [[1735689600000, 20.5], [1735689660000, 21.0]]
+
+    def connect(self) -> "FakeDatabase":
+        """
+        Function to get a connection
+        """
+        return self
+
+    def cursor(self) -> "FakeDatabase":
+        """
+        Function to get a cursor
+        """
+        return self
+
+    def execute(self, statement: str, parameters: Optional[tuple] = None) -> None:
+        """
+        Function to execute a statement
+        """
+        self.executed.append((statement, parameters))
+        if statement != CrateDBQueryBuilder.COLUMNS_STATEMENT and self.errors:
+            raise self.errors.pop(0)
+
+    def fetchall(self) -> list:
+        """
+        Function to get the result of the last statement
+        """
+        statement, _ = self.executed[-1]
+        if statement == CrateDBQueryBuilder.COLUMNS_STATEMENT:
+            return [list(column) for column in self.columns.items()]
+        return self.rows
+
+    @property
+    def description(self) -> list[tuple[str]]:
+        """
+        Returns the columns of the result
+        """
+        return [("time_index",), ("temperature",)]
+
+    def close(self) -> None:
+        """
+        Function to close the cursor or the connection
+        """
+
+    def data_queries(self) -> list[tuple[str, Optional[tuple]]]:
+        """
+        Function to get the executed statements without the queries of the columns
+        """
+        return [
+            query
+            for query in self.executed
+            if query[0] != CrateDBQueryBuilder.COLUMNS_STATEMENT
+        ]
+
+    def column_queries(self) -> int:
+        """
+        Function to get the number of the queries of the columns
+        """
+        return len(self.executed) - len(self.data_queries())
+
+
+@pytest.fixture(name="database")
+def fixture_database() -> FakeDatabase:
+    """
+    Fixture for a fake CrateDB
+    """
+    return FakeDatabase()
+
+
+def _get_connection(database: FakeDatabase, **kwargs) -> CrateDBConnection:
+    """
+    Function to get a connection to the fake CrateDB
+    """
+    connection = CrateDBConnection(crate_db_url="http://localhost:4200", **kwargs)
+    connection.pool.connection_factory = database.connect
+    return connection
+
+
+def test_select_statement():
+    """
+    The statement of the values uses bound parameters and is cached
+    """
+    builder = CrateDBQueryBuilder()
+    statement = builder.select(
+        service="smoke",
+        entity_type="Sensor",
+        attributes=("time_index", "temperature", "state"),
+    )
+
+    assert statement == (
+        'SELECT "time_index", "temperature", "state" FROM mtsmoke.etSensor '
+        "WHERE entity_id = ? AND time_index > ? AND time_index < ? "
+        'AND ("temperature" IS NOT NULL OR "state" IS NOT NULL) limit ?'
+    )
+    assert (
+        builder.select(
+            service="smoke",
+            entity_type="Sensor",
+            attributes=("time_index", "temperature", "state"),
+        )
+        is statement
+    )
+
+
+def test_select_resampled_statement():
+    """
+    The statement of the resampled values calculates the mean for each time step
+    """
+    statement = CrateDBQueryBuilder().select_resampled(
+        service="smoke",
+        entity_type="Sensor",
+        attributes=("temperature",),
+        resample_seconds=900,
+    )
+
+    assert statement == (
+        "SELECT DATE_BIN(INTERVAL '900 seconds', time_index, 0) AS time_index, "
+        'AVG("temperature") AS "temperature" FROM mtsmoke.etSensor '
+        "WHERE entity_id = ? AND time_index > ? AND time_index < ? "
+        'AND ("temperature" IS NOT NULL) GROUP BY 1 ORDER BY 1 limit ?'
+    )
+
+
+@pytest.mark.parametrize("with_start", [False, True])
+def test_select_chunk_statement(with_start):
+    """
+    The statement of a chunk has a parameter for the start of the chunk, if needed
+    """
+    statement = CrateDBQueryBuilder().select_chunk(
+        service="smoke",
+        entity_type="Sensor",
+        attributes=("temperature",),
+        with_start=with_start,
+    )
+
+    assert statement == (
+        'SELECT time_index, "temperature" FROM mtsmoke.etSensor '
+        "WHERE entity_id = ? AND time_index > ? AND time_index < ? "
+        'AND ("temperature" IS NOT NULL) '
+        + ("AND time_index >= ? " if with_start else "")
+        + "ORDER BY time_index limit ?"
+    )
+
+
+def test_get_data_binds_the_parameters(database):
+    """
+    The query of the values only selects the existing attributes \
+        and binds the entity id, the time bounds and the limit
+    """
+    connection = _get_connection(database)
+
+    df = connection.get_data(
+        service="smoke",
+        entity=ENTITY,
+        attributes=["temperature", "missing"],
+        from_date=FROM_DATE,
+        to_date=TO_DATE,
+        limit=100,
+    )
+
+    assert database.executed[0] == (
+        CrateDBQueryBuilder.COLUMNS_STATEMENT,
+        ("etSensor", "mtsmoke"),
+    )
+    assert database.data_queries() == [
+        (
+            'SELECT "time_index", "temperature" FROM mtsmoke.etSensor '
+            "WHERE entity_id = ? AND time_index > ? AND time_index < ? "
+            'AND ("temperature" IS NOT NULL) limit ?',
+            ("sensor1", FROM_DATE, TO_DATE, 100),
+        )
+    ]
+    assert df["temperature"].tolist() == [20.5, 21.0]
+    assert str(df.index.tz) == "UTC"
+
+
+def test_get_data_resampled_only_numeric_attributes(database):
+    """
+    The resampling in the database only uses the numeric attributes
+    """
+    connection = _get_connection(database)
+
+    connection.get_data(
+        service="smoke",
+        entity=ENTITY,
+        attributes=["temperature", "state"],
+        from_date=FROM_DATE,
+        to_date=TO_DATE,
+        limit=100,
+        resample_seconds=60,
+    )
+
+    ((statement, parameters),) = database.data_queries()
+    assert 'AVG("temperature")' in statement
+    assert '"state"' not in statement
+    assert parameters == ("sensor1", FROM_DATE, TO_DATE, 100)
+
+
+def test_schema_cache_and_invalidation(database):
+    """
+    The columns are queried once within the time of the cache \
+        and again after the cache was invalidated
+    """
+    connection = _get_connection(database, schema_cache_ttl=300.0)
+
+    for _ in range(3):
+        connection.get_table_columns(service="smoke", entity_type="Sensor")
+    assert database.column_queries() == 1
+
+    connection.invalidate_schema_cache(service="smoke", entity_type="Sensor")
+    connection.get_table_columns(service="smoke", entity_type="Sensor")
+    assert database.column_queries() == 2
+
+
+@pytest.mark.parametrize(
+    "error", ["ColumnUnknownException[Column temperature unknown]", "RelationUnknown"]
+)
+def test_retry_on_schema_change(database, error):
+    """
+    If a cached column or the table is unknown, the columns are queried again \
+        and the query is repeated once
+    """
+    connection = _get_connection(database, schema_cache_ttl=300.0)
+    connection.get_table_columns(service="smoke", entity_type="Sensor")
+    database.errors.append(ProgrammingError(error))
+    database.columns.pop("state")
+
+    df = connection.get_data(
+        service="smoke",
+        entity=ENTITY,
+        attributes=["temperature", "state"],
+        from_date=FROM_DATE,
+        to_date=TO_DATE,
+    )
+
+    assert database.column_queries() == 2
+    first_query, second_query = database.data_queries()
+    assert '"state"' in first_query[0]
+    assert '"state"' not in second_query[0]
+    assert len(df) == 2
+
+
+def test_no_retry_on_other_errors(database):
+    """
+    Other errors of the query are raised without a retry
+    """
+    connection = _get_connection(database)
+    database.errors.append(ProgrammingError("SQLParseException"))
+
+    with pytest.raises(ProgrammingError):
+        connection.get_data(
+            service="smoke",
+            entity=ENTITY,
+            attributes=["temperature"],
+            from_date=FROM_DATE,
+            to_date=TO_DATE,
+        )
+    assert len(database.data_queries()) == 1
+
+
+@pytest.mark.parametrize("resample_seconds", [None, 60])
+def test_columns_are_queried_once_per_query(database, resample_seconds):
+    """
+    Without the cache, the columns are queried once for each query of the values
+    """
+    connection = _get_connection(database, schema_cache_ttl=0.0)
+
+    connection.get_data(
+        service="smoke",
+        entity=ENTITY,
+        attributes=["temperature", "state"],
+        from_date=FROM_DATE,
+        to_date=TO_DATE,
+        resample_seconds=resample_seconds,
+    )
+    assert database.column_queries() == 1
+
+    list(
+        connection.iter_data_chunks(
+            service="smoke",
+            entity=ENTITY,
+            attributes=["temperature"],
+            from_date=FROM_DATE,
+            to_date=TO_DATE,
+            chunk_size=10,
+        )
+    )
+    assert database.column_queries() == 2
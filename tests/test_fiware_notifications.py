@@ -0,0 +1,161 @@
+"""
+Tests for the receiver of the FIWARE notifications with a local stand-in server
+"""
+
+import pytest
+import requests
+
+from encodapy.config import Interfaces
+from encodapy.config.models import InputModel
+from encodapy.service.communication import fiware_connection
+from encodapy.service.communication.fiware_connection import FiwareConnection
+from encodapy.utils.fiware_notifications import FiwareNotificationReceiver
+
+ENTITY = {
+    "id": "urn:ngsi-ld:Storage:001",
+    "type": "Storage",
+    "temperature": {"type": "Number", "value": 21.5, "metadata": {}},
+}
+
+
+class FakeMonotonic:
+    """
+    Fake monotonic clock
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        """
+        Function to get the time of the clock
+        """
+        return self.now
+
+
+def _notify(receiver: FiwareNotificationReceiver, body) -> int:
+    """
+    Function to send a notification to the receiver
+
+    Returns:
+        int: Status code of the response
+    """
+    response = requests.post(
+        f"http://127.0.0.1:{receiver.server_port}/notify",
+        json=body,
+        timeout=5,
+    )
+    return response.status_code
+
+
+@pytest.fixture(name="connection")
+def fixture_connection(monkeypatch):
+    """
+    Fixture for a FIWARE connection with a running receiver on a free local port
+    """
+    clock = FakeMonotonic()
+    monkeypatch.setattr(fiware_connection, "time", clock)
+    connection = FiwareConnection()
+    connection.clock = clock
+    connection.fiware_notification_receiver = FiwareNotificationReceiver(
+        callback=connection._handle_fiware_notification,
+        port=0,
+    )
+    connection.fiware_notification_receiver.start()
+    yield connection
+    connection.fiware_notification_receiver.stop()
+
+
+def test_receiver_listens_on_localhost_by_default():
+    """
+    The receiver is only reachable from the local host, if no host is configured
+    """
+    receiver = FiwareNotificationReceiver(callback=lambda entities: None, port=0)
+    receiver.start()
+    try:
+        assert receiver._server.server_address[0] == "127.0.0.1"
+    finally:
+        receiver.stop()
+    assert receiver.server_port is None
+
+
+def test_invalid_notification_is_rejected(connection):
+    """
+    A notification without entities is rejected and not stored
+    """
+    assert _notify(connection.fiware_notification_receiver, {"subscriptionId": "1"}) == 400
+    assert connection.fiware_notification_store == {}
+
+
+def test_notified_entity_is_read_from_the_store(connection):
+    """
+    The entities of a notification are stored and merged with the stored attributes
+    """
+    input_entity = InputModel(
+        id="storage",
+        interface=Interfaces.FIWARE,
+        id_interface=ENTITY["id"],
+        attributes=[],
+    )
+    receiver = connection.fiware_notification_receiver
+    assert _notify(receiver, {"subscriptionId": "1", "data": [ENTITY]}) == 204
+    assert (
+        _notify(
+            receiver,
+            {
+                "subscriptionId": "1",
+                "data": [
+                    {
+                        "id": ENTITY["id"],
+                        "type": "Storage",
+                        "power": {"type": "Number", "value": 2.0, "metadata": {}},
+                    }
+                ],
+            },
+        )
+        == 204
+    )
+
+    entities = connection.get_fiware_entities_from_notifications(
+        entities=[input_entity], max_age=60
+    )
+
+    entity_type, attributes = entities[ENTITY["id"]]
+    assert entity_type == "Storage"
+    assert attributes["temperature"].value == 21.5
+    assert attributes["power"].value == 2.0
+
+
+def test_outdated_notification_is_queried(connection):
+    """
+    An entity without a notification within the maximum age is not read from the store
+    """
+    input_entity = InputModel(
+        id="storage",
+        interface=Interfaces.FIWARE,
+        id_interface=ENTITY["id"],
+        attributes=[],
+    )
+    assert (
+        _notify(
+            connection.fiware_notification_receiver,
+            {"subscriptionId": "1", "data": [ENTITY]},
+        )
+        == 204
+    )
+
+    connection.clock.now = 60.0
+    assert ENTITY["id"] in connection.get_fiware_entities_from_notifications(
+        entities=[input_entity], max_age=60
+    )
+
+    connection.clock.now = 60.5
+    assert (
+        connection.get_fiware_entities_from_notifications(
+            entities=[input_entity], max_age=60
+        )
+        == {}
+    )
+    assert ENTITY["id"] in connection.get_fiware_entities_from_notifications(
+        entities=[input_entity]
+    )
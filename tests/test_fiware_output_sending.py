@@ -0,0 +1,191 @@
+"""
+Tests for the sending of the outputs to the FIWARE platform with the synchronous client
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+import requests
+from filip.clients.exceptions import BaseHttpClientException
+from filip.models.ngsi_v2.context import ContextEntity
+
+from encodapy.config import AttributeModel, CommandModel, Interfaces, OutputModel
+from encodapy.service.communication import fiware_connection
+from encodapy.utils.models import OutputAttributeRecord, OutputCommandRecord
+
+OUTPUT_ENTITY = OutputModel(
+    id="storage",
+    interface=Interfaces.FIWARE,
+    id_interface="urn:storage:01",
+    attributes=[AttributeModel(id="temperature", id_interface="temperature")],
+    commands=[CommandModel(id="charge", id_interface="charge_cmd")],
+)
+
+
+class FakeContextBrokerClient:
+    """
+    Fake synchronous client of the Context Broker, \
+        which records the requests with the thread of the request
+    """
+
+    base_url = "http://localhost:1026"
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.post_failures = 0
+        self.requests: list[tuple[str, str]] = []
+        self.threads: set[int] = set()
+        self._lock = threading.Lock()
+
+    def _request(self, name: str, entity_id: str) -> None:
+        self.threads.add(threading.get_ident())
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("The synchronous client is used in an event loop")
+        with self._lock:
+            self.requests.append((name, entity_id))
+
+    def get_entity(self, entity_id, entity_type=None, attrs=None):
+        """
+        Function to get an entity
+        """
+        self._request("get_entity", entity_id)
+        return ContextEntity(id=entity_id, type="Storage")
+
+    def update_or_append_entity_attributes(self, entity_id, entity_type, attrs):
+        """
+        Function to update the attributes of an entity
+        """
+        self._request("update_attributes", entity_id)
+        if self.failures > 0:
+            self.failures -= 1
+            raise BaseHttpClientException(message="Update failed", response=None)
+
+    def update_existing_entity_attributes(self, entity_id, entity_type, attrs):
+        """
+        Function to update the commands of an entity
+        """
+        self._request("update_commands", entity_id)
+
+    def post(self, url, params=None, json=None):
+        """
+        Function to send a POST request (timeseries values)
+        """
+        self._request("post", url)
+        with self._lock:
+            failed = self.post_failures > 0
+            self.post_failures -= 1
+        return SimpleNamespace(
+            raise_for_status=lambda: self._raise_for_status(failed=failed)
+        )
+
+    @staticmethod
+    def _raise_for_status(failed: bool) -> None:
+        if failed:
+            raise requests.HTTPError("Service unavailable", response=None)
+
+
+def _get_records() -> tuple[list[OutputAttributeRecord], list[OutputCommandRecord]]:
+    """
+    Function to get the output values of the output entity
+    """
+    return (
+        [
+            OutputAttributeRecord(
+                config=OUTPUT_ENTITY.attributes[0],
+                value=42.5,
+                timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            )
+        ],
+        [OutputCommandRecord(config=OUTPUT_ENTITY.commands[0], value=1)],
+    )
+
+
+@pytest.fixture(name="service")
+def fixture_service(create_service, monkeypatch):
+    """
+    Fixture for a service with a fake synchronous client of the Context Broker
+    """
+    monkeypatch.setattr(fiware_connection, "FIWARE_REQUEST_RETRY_DELAY", 0.0)
+    service = create_service()
+    service.cb_client = FakeContextBrokerClient()
+    return service
+
+
+def test_sync_client_runs_in_a_worker_thread(service):
+    """
+    The synchronous client is used in a worker thread without an own event loop
+    """
+    output_attributes, output_commands = _get_records()
+
+    sent = asyncio.run(
+        service._dispatch_output_entity(
+            output_entity=OUTPUT_ENTITY,
+            output_attributes=output_attributes,
+            output_commands=output_commands,
+            in_thread=True,
+        )
+    )
+
+    assert sent
+    assert service.cb_client.requests == [
+        ("get_entity", "urn:storage:01"),
+        ("update_attributes", "urn:storage:01"),
+        ("update_commands", "urn:storage:01"),
+    ]
+    assert threading.get_ident() not in service.cb_client.threads
+
+
+def test_sync_client_retries_and_reports_a_failure(service):
+    """
+    A failed request is repeated and reported as not sent after the last attempt
+    """
+    output_attributes, output_commands = _get_records()
+    service.cb_client.failures = 1
+    assert service._send_data_to_fiware_sync(
+        output_entity=OUTPUT_ENTITY,
+        output_attributes=output_attributes,
+        output_commands=output_commands,
+    )
+
+    service.cb_client.failures = fiware_connection.FIWARE_REQUEST_ATTEMPTS
+    assert not service._send_data_to_fiware_sync(
+        output_entity=OUTPUT_ENTITY,
+        output_attributes=output_attributes,
+        output_commands=output_commands,
+    )
+    assert [request[0] for request in service.cb_client.requests].count(
+        "update_attributes"
+    ) == 2 + fiware_connection.FIWARE_REQUEST_ATTEMPTS
+
+
+@pytest.mark.parametrize("batch_size", [0, 2])
+def test_failed_timeseries_values_are_reported(service, batch_size):
+    """
+    The output entity is not sent, if timeseries values could not be sent
+    """
+    service.fiware_conn_params = SimpleNamespace(
+        fiware_params=SimpleNamespace(timeseries_batch_size=batch_size)
+    )
+    timeseries = pd.DataFrame(
+        {"temperature": [20.0, 21.0, 22.0, 23.0]},
+        index=pd.date_range("2025-01-01", periods=4, freq="15min", tz="UTC"),
+    )
+    output_attributes = [
+        OutputAttributeRecord(config=OUTPUT_ENTITY.attributes[0], value=timeseries)
+    ]
+
+    assert service._send_data_to_fiware_sync(
+        output_entity=OUTPUT_ENTITY, output_attributes=output_attributes, output_commands=[]
+    )
+    service.cb_client.post_failures = 1
+    assert not service._send_data_to_fiware_sync(
+        output_entity=OUTPUT_ENTITY, output_attributes=output_attributes, output_commands=[]
+    )
@@ -0,0 +1,108 @@
+"""
+Tests for the conversion of timeseries to the payloads of NGSI v2 attributes
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from filip.models.base import DataType
+from filip.models.ngsi_v2.context import NamedContextAttribute
+from filip.models.ngsi_v2.base import NamedMetadata
+
+from encodapy.service.communication import FiwareConnection
+
+
+def _serialize_per_row(
+    timeseries: pd.Series,
+    datatype: DataType,
+    factor_unit_adjustment: float,
+    metadata: list[NamedMetadata],
+) -> list[dict]:
+    """
+    Function with the former conversion of each row to a `NamedContextAttribute`
+    """
+    payloads = []
+    for index, value in timeseries.items():
+        attribute = NamedContextAttribute(
+            name="attribute",
+            value=value * factor_unit_adjustment,
+            type=datatype,
+            metadata=metadata
+            + [
+                NamedMetadata(
+                    name="TimeInstant",
+                    type=DataType.DATETIME,
+                    value=index.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                )
+            ],
+        )
+        payloads.append(
+            attribute.model_dump(mode="json", exclude={"name"}, exclude_none=True)
+        )
+    return payloads
+
+
+def _to_json(payloads: list[dict]) -> list[dict]:
+    """
+    Function to get the payloads as they are sent to the Context Broker
+    """
+    return json.loads(json.dumps(payloads))
+
+
+@pytest.mark.parametrize("timezone", [None, "UTC", "Europe/Berlin"])
+@pytest.mark.parametrize("factor_unit_adjustment", [1.0, 0.001])
+def test_serialization_matches_per_row_conversion(timezone, factor_unit_adjustment):
+    """
+    The vectorized conversion gives the same payloads as the conversion of each row
+    """
+    index = pd.date_range("2025-03-30T00:00:00", periods=8, freq="30min", tz=timezone)
+    timeseries = pd.Series(np.linspace(1.5, 12.0, len(index)), index=index)
+    metadata = [NamedMetadata(name="unitCode", type=DataType.TEXT, value="KWT")]
+
+    payloads = FiwareConnection._serialize_timeseries_for_fiware(
+        timeseries=timeseries,
+        datatype=DataType.NUMBER,
+        factor_unit_adjustment=factor_unit_adjustment,
+        metadata=metadata,
+    )
+
+    assert _to_json(payloads) == _serialize_per_row(
+        timeseries=timeseries,
+        datatype=DataType.NUMBER,
+        factor_unit_adjustment=factor_unit_adjustment,
+        metadata=metadata,
+    )
+
+
+def test_serialization_sends_missing_values_as_null():
+    """
+    Missing values (NaN) are sent as null, the other values like the conversion of each row
+    """
+    index = pd.date_range("2025-01-01T00:00:00", periods=4, freq="15min", tz="UTC")
+    timeseries = pd.Series([1.0, np.nan, 3.0, np.nan], index=index)
+
+    payloads = _to_json(
+        FiwareConnection._serialize_timeseries_for_fiware(
+            timeseries=timeseries,
+            datatype=DataType.NUMBER,
+            factor_unit_adjustment=2.0,
+            metadata=[],
+        )
+    )
+
+    assert [payload["value"] for payload in payloads] == [2.0, None, 6.0, None]
+    valid = timeseries.notna().to_numpy()
+    assert [payload for payload, is_valid in zip(payloads, valid) if is_valid] == (
+        _serialize_per_row(
+            timeseries=timeseries[valid],
+            datatype=DataType.NUMBER,
+            factor_unit_adjustment=2.0,
+            metadata=[],
+        )
+    )
+    assert [payload["metadata"] for payload in payloads] == [
+        {"TimeInstant": {"type": "DateTime", "value": timestamp}}
+        for timestamp in index.strftime("%Y-%m-%dT%H:%M:%S%z")
+    ]
@@ -0,0 +1,88 @@
+"""
+Tests for the metrics of the interface requests and the metrics exporter
+"""
+
+import asyncio
+
+import pytest
+import requests
+
+from encodapy.config import Interfaces
+from encodapy.utils.metrics import (
+    INTERFACE_REQUEST_ERRORS,
+    INTERFACE_REQUESTS,
+    METRICS,
+    MetricsExporter,
+    MetricsRegistry,
+    MetricTypes,
+)
+
+
+def _get_counter(name: str, operation: str) -> float:
+    """
+    Function to get the value of a counter of the file interface from the exposition format
+    """
+    prefix = f'{name}{{interface="file",operation="{operation}"}} '
+    for line in METRICS.render().splitlines():
+        if line.startswith(prefix):
+            return float(line[len(prefix) :])
+    return 0.0
+
+
+def test_exporter_serves_the_metrics():
+    """
+    The exporter returns the metrics of the registry on `/metrics`
+    """
+    registry = MetricsRegistry()
+    registry.describe("test_total", MetricTypes.COUNTER, "Test counter")
+    registry.inc("test_total", interface="file")
+    exporter = MetricsExporter(registry=registry, host="127.0.0.1", port=0)
+    exporter.start()
+    try:
+        url = f"http://127.0.0.1:{exporter.server_port}"
+        response = requests.get(f"{url}/metrics", timeout=5)
+        assert response.status_code == 200
+        assert 'test_total{interface="file"} 1.0' in response.text
+        assert requests.get(f"{url}/other", timeout=5).status_code == 404
+    finally:
+        exporter.stop()
+    assert exporter.server_port is None
+
+
+@pytest.mark.parametrize(
+    ("result", "failed"), [({"temperature": 20.0}, False), (None, True)]
+)
+def test_query_without_result_is_failed(create_service, result, failed):
+    """
+    A query which returns no data is recorded as failed request
+    """
+    service = create_service()
+    operation = f"test_result_{failed}"
+
+    async def query():
+        return result
+
+    assert (
+        asyncio.run(
+            service._observe_query(query(), interface=Interfaces.FILE, operation=operation)
+        )
+        == result
+    )
+    assert _get_counter(INTERFACE_REQUESTS, operation) == 1
+    assert _get_counter(INTERFACE_REQUEST_ERRORS, operation) == (1 if failed else 0)
+
+
+def test_query_with_exception_is_failed(create_service):
+    """
+    A query which raises an exception is recorded as failed request
+    """
+    service = create_service()
+
+    async def query():
+        raise ConnectionError("no connection")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(
+            service._observe_query(query(), interface=Interfaces.FILE, operation="test_error")
+        )
+    assert _get_counter(INTERFACE_REQUEST_ERRORS, "test_error") == 1
@@ -0,0 +1,50 @@
+"""
+Tests for the extraction of the values and timestamps of MQTT payloads
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from encodapy.service.communication import MqttConnection
+from encodapy.utils.timestamps import parse_timestamp
+
+
+@pytest.fixture(name="connection")
+def fixture_connection() -> MqttConnection:
+    """
+    Fixture for a MQTT connection with the default parameters
+    """
+    connection = MqttConnection()
+    connection.load_mqtt_params()
+    return connection
+
+
+def test_payload_values_are_not_cached(connection):
+    """
+    Payloads, which are checked for a timestamp, do not fill the cache of the timestamps
+    """
+    parse_timestamp.cache_clear()
+
+    for number in range(100):
+        value, _ = connection._extract_payload_value_and_timestamp(str(number / 10))
+        assert value == number / 10
+    value, _ = connection._extract_payload_value_and_timestamp("2025-01-01T00:00:00")
+
+    assert value == "2025-01-01T00:00:00"
+    assert parse_timestamp.cache_info().currsize == 0
+
+
+def test_payload_timestamp_field(connection):
+    """
+    The timestamp of a JSON payload is taken from the configured field
+    """
+    payload = (
+        f'{{"value": 21.5, "{connection.mqtt_params.timestamp_key}": '
+        '"2025-01-01T00:00:00+00:00"}'
+    )
+
+    value, timestamp = connection._extract_payload_value_and_timestamp(payload)
+
+    assert value == 21.5
+    assert timestamp == datetime(2025, 1, 1, tzinfo=timezone.utc)
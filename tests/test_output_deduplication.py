@@ -0,0 +1,200 @@
+"""
+Tests for the change-only mode of the outputs
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from encodapy.config import DataQueryTypes
+from encodapy.utils import deduplication
+from encodapy.utils.deduplication import OutputDeduplicator
+from encodapy.utils.models import (
+    DataTransferComponentModel,
+    DataTransferModel,
+    OutputDataAttributeModel,
+    OutputDataEntityModel,
+)
+
+KEY = ("storage", "temperature", "fiware")
+
+
+class FakeMonotonic:
+    """
+    Fake monotonic clock
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        """
+        Function to get the time of the clock
+        """
+        return self.now
+
+
+def _send(deduplicator: OutputDeduplicator, value, unit=None) -> bool:
+    """
+    Function to check a value and to commit it, if it has to be sent
+    """
+    if not deduplicator.check(key=KEY, value=value, unit=unit):
+        return False
+    deduplicator.commit(key=KEY, value=value, unit=unit)
+    return True
+
+
+def test_deadband():
+    """
+    Numeric changes within the deadband are not sent, other changes are sent
+    """
+    deduplicator = OutputDeduplicator(deadband=0.5)
+
+    assert _send(deduplicator, 20.0)
+    assert not _send(deduplicator, 20.0)
+    assert not _send(deduplicator, 20.4)
+    assert _send(deduplicator, 20.6)
+    assert _send(deduplicator, 20.6, unit="CEL")
+    assert _send(deduplicator, True)
+    assert not _send(deduplicator, True)
+    assert _send(deduplicator, "on")
+
+
+def test_dataframes_are_compared_by_value():
+    """
+    A dataframe is sent again, if it changed (also in place after the sending)
+    """
+    deduplicator = OutputDeduplicator()
+    df = pd.DataFrame({"temperature": [20.0, 21.0]})
+
+    assert _send(deduplicator, df)
+    assert not _send(deduplicator, df.copy())
+    df.loc[1, "temperature"] = 22.0
+    assert _send(deduplicator, df)
+
+
+def test_max_silence(monkeypatch):
+    """
+    An unchanged value is sent again after the maximum silence interval
+    """
+    clock = FakeMonotonic()
+    monkeypatch.setattr(deduplication, "time", clock)
+    deduplicator = OutputDeduplicator(max_silence=60)
+
+    assert _send(deduplicator, 20.0)
+    clock.now = 59.0
+    assert not _send(deduplicator, 20.0)
+    clock.now = 60.0
+    assert _send(deduplicator, 20.0)
+    clock.now = 100.0
+    assert not _send(deduplicator, 20.0)
+
+
+def test_check_without_commit():
+    """
+    A value is only remembered after the commit, so a value which was not sent \
+        is checked against the last sent value
+    """
+    deduplicator = OutputDeduplicator()
+
+    assert deduplicator.check(key=KEY, value=20.0)
+    assert deduplicator.check(key=KEY, value=20.0)
+    deduplicator.commit(key=KEY, value=20.0)
+    assert not deduplicator.check(key=KEY, value=20.0)
+
+
+def _get_output(service, temperature: float, timestamp: datetime):
+    """
+    Function to prepare the outputs of a calculation
+    """
+    return service.prepare_output(
+        data_output=DataTransferModel(
+            components=[
+                DataTransferComponentModel(
+                    entity_id="storage",
+                    attribute_id="temperature",
+                    value=temperature,
+                    timestamp=timestamp,
+                )
+            ]
+        )
+    )
+
+
+@pytest.fixture(name="service")
+def fixture_service(create_service):
+    """
+    Fixture for a service in the change-only mode, which records the sent outputs
+    """
+    service = create_service(output_change_only=True, output_deadband=0.1)
+    service.sent_outputs = []
+    service.send_failures = 0
+
+    def send_data_to_json_file(output_entity, output_attributes, output_commands):
+        if service.send_failures > 0:
+            service.send_failures -= 1
+            return False
+        service.sent_outputs.append([attribute.value for attribute in output_attributes])
+        return True
+
+    service.send_data_to_json_file = send_data_to_json_file
+    return service
+
+
+def test_failed_output_is_sent_again(service):
+    """
+    An output which could not be sent is not suppressed in the next cycle
+    """
+    timestamp = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    service.send_failures = 1
+
+    for _ in range(3):
+        asyncio.run(
+            service.send_outputs(
+                data_output=_get_output(service, temperature=20.0, timestamp=timestamp)
+            )
+        )
+
+    assert service.sent_outputs == [[20.0]]
+
+
+def test_suppressed_outputs_move_the_timerange(service):
+    """
+    The timestamps of the suppressed outputs replace the older timestamps \
+        of the interface, so the timerange of the inputs moves on
+    """
+    sent_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    suppressed_at = sent_at + timedelta(minutes=15)
+
+    async def get_output_entity_timestamps(output_entity):
+        return (
+            OutputDataEntityModel(
+                id=output_entity.id,
+                attributes_status=[
+                    OutputDataAttributeModel(
+                        id="temperature", latest_timestamp_output=sent_at
+                    )
+                ],
+            ),
+            sent_at,
+        )
+
+    service._get_output_entity_timestamps = get_output_entity_timestamps
+    asyncio.run(
+        service.send_outputs(
+            data_output=_get_output(service, temperature=20.0, timestamp=sent_at)
+        )
+    )
+    asyncio.run(
+        service.send_outputs(
+            data_output=_get_output(service, temperature=20.05, timestamp=suppressed_at)
+        )
+    )
+    assert service.sent_outputs == [[20.0]]
+
+    data = asyncio.run(service.get_data(method=DataQueryTypes.CALCULATION))
+
+    (entity_timestamps,) = data.output_entities
+    assert entity_timestamps.attributes_status[0].latest_timestamp_output == suppressed_at
@@ -0,0 +1,80 @@
+"""
+Tests for the preparation of the outputs of the calculation
+"""
+
+import json
+from datetime import datetime, timezone
+
+from encodapy.utils.models import (
+    AttributeModel,
+    CommandModel,
+    DataTransferComponentModel,
+    DataTransferModel,
+)
+from encodapy.utils.units import DataUnits
+
+TIMESTAMP = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _get_data_transfer(temperature, charge) -> DataTransferModel:
+    """
+    Function to get the outputs of a calculation
+    """
+    return DataTransferModel(
+        components=[
+            DataTransferComponentModel(
+                entity_id="storage",
+                attribute_id="temperature",
+                value=temperature,
+                unit=DataUnits.DEGREECELSIUS,
+                timestamp=TIMESTAMP,
+            ),
+            DataTransferComponentModel(
+                entity_id="storage", attribute_id="charge", value=charge
+            ),
+        ]
+    )
+
+
+def test_prepared_output_is_a_validated_model(create_service):
+    """
+    The prepared output consists of validated models, which can be serialized
+    """
+    service = create_service()
+
+    output = service.prepare_output(
+        data_output=_get_data_transfer(temperature=42.5, charge=1)
+    )
+
+    (entity,) = output.entities
+    (attribute,) = entity.attributes
+    (command,) = entity.commands
+    assert isinstance(attribute, AttributeModel)
+    assert isinstance(command, CommandModel)
+    assert output.model_dump()["entities"][0]["attributes"][0]["value"] == 42.5
+    dumped = json.loads(output.model_dump_json())
+    assert dumped["entities"][0]["id"] == "storage"
+    assert dumped["entities"][0]["commands"][0]["value"] == 1
+
+
+def test_prepared_output_keeps_the_configuration(create_service):
+    """
+    The configuration is not changed, a missing value is replaced by the last value
+    """
+    service = create_service()
+    config_attribute = service._get_output_attribute_config("storage", "temperature")
+    config_value = config_attribute.value
+
+    service.prepare_output(data_output=_get_data_transfer(temperature=42.5, charge=1))
+    output = service.prepare_output(
+        data_output=_get_data_transfer(temperature=None, charge=0)
+    )
+
+    assert config_attribute.value == config_value
+    assert output.entities[0].attributes[0].value == 42.5
+    assert output.entities[0].commands[0].value == 0
+
+    attributes, commands = service._get_output_records(output=output.entities[0])
+    assert attributes[0].config is config_attribute
+    assert (attributes[0].value, attributes[0].unit) == (42.5, DataUnits.DEGREECELSIUS)
+    assert commands[0].value == 0
@@ -0,0 +1,190 @@
+"""
+Tests for the output queue and the background writers of the outputs
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from encodapy.config.types import QueuePolicies
+from encodapy.utils.models import DataTransferComponentModel, DataTransferModel
+from encodapy.utils.output_queue import OutputQueue
+
+
+async def _get_all(queue: OutputQueue) -> list:
+    """
+    Function to get all outputs of a queue
+    """
+    items = []
+    while len(queue) > 0:
+        items.append(await queue.get())
+        await queue.task_done()
+    return items
+
+
+def test_block_waits_for_space():
+    """
+    With the policy `block`, an output is only added after an output was taken
+    """
+
+    async def run():
+        queue = OutputQueue(maxsize=1, policy=QueuePolicies.BLOCK)
+        await queue.put(key="a", item=1)
+        put_task = asyncio.create_task(queue.put(key="b", item=2))
+        await asyncio.sleep(0.01)
+        assert not put_task.done()
+        assert len(queue) == 1
+
+        assert await queue.get() == ("a", 1)
+        await queue.task_done()
+        await asyncio.wait_for(put_task, timeout=1)
+        assert await _get_all(queue) == [("b", 2)]
+        assert queue.dropped == 0
+
+    asyncio.run(run())
+
+
+def test_drop_oldest_counts_dropped_outputs():
+    """
+    With the policy `drop_oldest`, the oldest outputs are dropped and counted
+    """
+
+    async def run():
+        queue = OutputQueue(maxsize=2, policy=QueuePolicies.DROP_OLDEST)
+        for index in range(5):
+            await queue.put(key=index, item=index)
+
+        assert queue.dropped == 3
+        assert await _get_all(queue) == [(3, 3), (4, 4)]
+        await asyncio.wait_for(queue.join(), timeout=1)
+
+    asyncio.run(run())
+
+
+def test_coalesce_merges_outputs_of_the_same_key():
+    """
+    With the policy `coalesce`, an output of a queued key is merged \
+        and keeps its position in the queue
+    """
+
+    async def run():
+        queue = OutputQueue(
+            maxsize=2,
+            policy=QueuePolicies.COALESCE,
+            merge=lambda queued, new: {**queued, **new},
+        )
+        await queue.put(key="a", item={"temperature": 20.0, "power": 1.0})
+        await queue.put(key="b", item={"temperature": 30.0})
+        await queue.put(key="a", item={"temperature": 21.0})
+
+        assert queue.coalesced == 1
+        assert queue.dropped == 0
+        assert await _get_all(queue) == [
+            ("a", {"temperature": 21.0, "power": 1.0}),
+            ("b", {"temperature": 30.0}),
+        ]
+        await asyncio.wait_for(queue.join(), timeout=1)
+
+    asyncio.run(run())
+
+
+def test_coalesce_without_merge_replaces_the_output():
+    """
+    Without a merge function, the queued output is replaced
+    """
+
+    async def run():
+        queue = OutputQueue(maxsize=2, policy=QueuePolicies.COALESCE)
+        await queue.put(key="a", item=1)
+        await queue.put(key="a", item=2)
+
+        assert queue.coalesced == 1
+        assert await _get_all(queue) == [("a", 2)]
+
+    asyncio.run(run())
+
+
+def _get_output(service, temperature: float):
+    """
+    Function to prepare the outputs of a calculation
+    """
+    return service.prepare_output(
+        data_output=DataTransferModel(
+            components=[
+                DataTransferComponentModel(
+                    entity_id="storage",
+                    attribute_id="temperature",
+                    value=temperature,
+                    timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+                )
+            ]
+        )
+    )
+
+
+def _record_sent_outputs(service) -> list:
+    """
+    Function to replace the file interface with a function, which records the sent values
+    """
+    sent_outputs = []
+
+    def send_data_to_json_file(output_entity, output_attributes, output_commands):
+        sent_outputs.append([attribute.value for attribute in output_attributes])
+        return True
+
+    service.send_data_to_json_file = send_data_to_json_file
+    return sent_outputs
+
+
+def test_stop_output_writers_sends_the_queued_outputs(create_service):
+    """
+    The outputs in the queue are sent before the writers are stopped
+    """
+    service = create_service(output_queue=True, output_queue_size=10)
+    sent_outputs = _record_sent_outputs(service)
+
+    async def run():
+        for temperature in (20.0, 21.0, 22.0):
+            await service.send_outputs(data_output=_get_output(service, temperature))
+        await service.stop_output_writers(timeout=5)
+
+    asyncio.run(run())
+
+    assert sent_outputs == [[20.0], [21.0], [22.0]]
+    assert service.output_writers == {}
+
+
+@pytest.mark.parametrize(
+    "policy", [QueuePolicies.COALESCE.value, QueuePolicies.DROP_OLDEST.value]
+)
+def test_change_only_compares_with_the_sent_output(create_service, policy):
+    """
+    In the change-only mode, an output which replaced a queued output \
+        is compared with the last sent value, not with the replaced value
+    """
+    service = create_service(
+        output_queue=True,
+        output_queue_size=1,
+        output_queue_policy=policy,
+        output_change_only=True,
+    )
+    sent_outputs = _record_sent_outputs(service)
+
+    async def run():
+        await service.send_outputs(data_output=_get_output(service, 20.0))
+        queue, _ = next(iter(service.output_writers.values()))
+        await queue.join()
+
+        # the writer does not run in between, so the second output replaces the first
+        await service.send_outputs(data_output=_get_output(service, 25.0))
+        await service.send_outputs(data_output=_get_output(service, 20.0))
+        assert queue.dropped + queue.coalesced == 1
+        await queue.join()
+
+        await service.send_outputs(data_output=_get_output(service, 21.0))
+        await service.stop_output_writers(timeout=5)
+
+    asyncio.run(run())
+
+    assert sent_outputs == [[20.0], [21.0]]
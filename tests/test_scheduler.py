@@ -0,0 +1,195 @@
+"""
+Tests for the scheduling of the cycles of the service with a fake monotonic clock
+"""
+
+import asyncio
+
+import pytest
+
+from encodapy.config.types import OverrunPolicies
+from encodapy.service import basic_service
+from encodapy.utils import scheduler as scheduler_module
+from encodapy.utils.scheduler import CycleScheduler
+
+
+class FakeClock:
+    """
+    Fake monotonic clock: waits do not sleep, but advance the time
+    """
+
+    TimeoutError = asyncio.TimeoutError
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+        self.waits: list[float] = []
+
+    def monotonic(self) -> float:
+        """
+        Function to get the time of the clock
+        """
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """
+        Function to advance the time, e.g. for the processing time of a cycle
+        """
+        self.now += seconds
+
+    async def wait_for(self, awaitable, timeout: float):
+        """
+        Function to wait for an event: the event is set or the timeout is up
+        """
+        self.waits.append(timeout)
+        task = asyncio.ensure_future(awaitable)
+        await asyncio.sleep(0)
+        if task.done():
+            return task.result()
+        task.cancel()
+        self.advance(timeout)
+        raise asyncio.TimeoutError
+
+    def __getattr__(self, name: str):
+        return getattr(asyncio, name)
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """
+    Fixture for a fake clock, which is used by the scheduler and the service
+    """
+    clock = FakeClock()
+    for module in (scheduler_module, basic_service):
+        monkeypatch.setattr(module, "time", clock)
+        monkeypatch.setattr(module, "asyncio", clock)
+    return clock
+
+
+def _run_cycles(
+    scheduler: CycleScheduler, clock: FakeClock, processing_times: list[float]
+) -> list[float]:
+    """
+    Function to run cycles with the given processing times
+
+    Returns:
+        list[float]: start times of the cycles
+    """
+
+    async def run() -> list[float]:
+        stop_event = asyncio.Event()
+        start_times = []
+        for processing_time in processing_times:
+            assert not await scheduler.wait_for_tick(stop_event=stop_event)
+            start_times.append(clock.now)
+            clock.advance(processing_time)
+        return start_times
+
+    return asyncio.run(run())
+
+
+def test_cycles_on_the_grid(clock):
+    """
+    The cycles start on the ticks, independent of the processing time
+    """
+    scheduler = CycleScheduler(period=10, start_time=5)
+
+    start_times = _run_cycles(scheduler, clock, [3, 9.5, 0, 7])
+
+    assert start_times == [5, 15, 25, 35]
+    assert clock.waits == [5, 7, 0.5, 10]
+    assert (scheduler.overruns, scheduler.missed_ticks) == (0, 0)
+
+
+def test_overrun_skip(clock):
+    """
+    With SKIP, the missed ticks are skipped and the next cycle starts on the grid
+    """
+    scheduler = CycleScheduler(period=10, policy=OverrunPolicies.SKIP, start_time=0)
+
+    start_times = _run_cycles(scheduler, clock, [25, 1, 1])
+
+    assert start_times == [0, 30, 40]
+    assert (scheduler.overruns, scheduler.missed_ticks) == (1, 2)
+
+
+def test_overrun_coalesce(clock):
+    """
+    With COALESCE, the missed ticks are combined into one cycle, which starts immediately
+    """
+    scheduler = CycleScheduler(period=10, policy=OverrunPolicies.COALESCE, start_time=0)
+
+    start_times = _run_cycles(scheduler, clock, [25, 1, 1])
+
+    assert start_times == [0, 25, 30]
+    assert (scheduler.overruns, scheduler.missed_ticks) == (1, 1)
+
+
+def test_overrun_immediate(clock):
+    """
+    With IMMEDIATE, each missed tick is run immediately until the schedule is caught up \
+        and the overrun is only counted once
+    """
+    scheduler = CycleScheduler(period=10, policy=OverrunPolicies.IMMEDIATE, start_time=0)
+
+    start_times = _run_cycles(scheduler, clock, [25, 1, 1, 1, 1])
+
+    assert start_times == [0, 25, 26, 30, 40]
+    assert (scheduler.overruns, scheduler.missed_ticks) == (1, 0)
+
+
+def test_stop_event_ends_the_wait(clock):
+    """
+    A set stop event ends the wait for the next tick
+    """
+    scheduler = CycleScheduler(period=10, start_time=100)
+
+    async def run() -> bool:
+        stop_event = asyncio.Event()
+        stop_event.set()
+        return await scheduler.wait_for_tick(stop_event=stop_event)
+
+    assert asyncio.run(run())
+    assert clock.now == 0
+
+
+def test_calibration_loop_timing(clock, create_service):
+    """
+    The calibration starts after the hold time and skips the ticks, \
+        which are missed by a long calibration
+    """
+    service = create_service(start_hold_time=5, overrun_policy="skip")
+    start_times = []
+
+    async def get_data(method):
+        start_times.append(clock.now)
+        if len(start_times) == 3:
+            service.shutdown_event.set()
+
+    async def calibration(data):
+        clock.advance(70 if len(start_times) == 1 else 10)
+
+    service.get_data = get_data
+    service.calibration = calibration
+    asyncio.run(service.start_calibration())
+
+    assert start_times == [5, 125, 185]
+    assert service.schedulers["calibration"].missed_ticks == 1
+
+
+def test_health_loop_timing(clock, create_service, monkeypatch):
+    """
+    The health check runs every 10 seconds, independent of its processing time
+    """
+    service = create_service()
+    start_times = []
+
+    async def update_health_file(**kwargs):
+        start_times.append(clock.now)
+        clock.advance(2)
+        if len(start_times) == 3:
+            service.shutdown_event.set()
+
+    monkeypatch.setattr(basic_service, "update_health_file", update_health_file)
+    asyncio.run(service.check_health_status())
+
+    assert start_times == [0, 10, 20]
+    assert clock.waits == [8, 8, 8]
@@ -0,0 +1,37 @@
+"""
+Tests for the handling of the shutdown signals of the service
+"""
+
+import asyncio
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from encodapy.service.service_main import register_shutdown_signals
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGTERM"), reason="SIGTERM is not supported")
+def test_sigterm_wakes_up_the_waiting_service():
+    """
+    A SIGTERM sets the shutdown event and wakes up a task, \\
+        which waits for the event with a long timeout
+    """
+
+    async def wait_for_sigterm() -> float:
+        shutdown_event = asyncio.Event()
+        register_shutdown_signals(shutdown_event=shutdown_event)
+        loop = asyncio.get_running_loop()
+        try:
+            # the signal is sent, while the event loop waits in the selector
+            threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGTERM)).start()
+            start = time.monotonic()
+            await asyncio.wait_for(shutdown_event.wait(), timeout=10.0)
+            return time.monotonic() - start
+        finally:
+            loop.remove_signal_handler(signal.SIGINT)
+            loop.remove_signal_handler(signal.SIGTERM)
+
+    assert asyncio.run(wait_for_sigterm()) < 1.0
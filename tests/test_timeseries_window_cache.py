@@ -0,0 +1,111 @@
+"""
+Tests for the cache of the rolling timeseries window of the FIWARE connection
+"""
+
+import pandas as pd
+import pandas.testing as pdt
+from filip.models.ngsi_v2.context import ContextEntity
+
+from encodapy.service.communication import FiwareConnection
+
+TIME_STEP_SECONDS = 60
+WINDOW = pd.Timedelta(minutes=10)
+
+
+def _get_connection(raw_data: pd.DataFrame) -> FiwareConnection:
+    """
+    Function to get a connection, which queries the timeseries from a dataframe \
+        instead of the database
+    """
+    connection = FiwareConnection()
+    connection.queries = []
+
+    def query_timeseries(
+        entity, attributes, from_date, to_date, time_step_seconds, excluded_range=None
+    ):
+        connection.queries.append((from_date, to_date, excluded_range))
+        selected = (raw_data.index >= pd.Timestamp(from_date)) & (
+            raw_data.index <= pd.Timestamp(to_date)
+        )
+        if excluded_range is not None:
+            selected &= ~(
+                (raw_data.index >= pd.Timestamp(excluded_range[0]))
+                & (raw_data.index < pd.Timestamp(excluded_range[1]))
+            )
+        df = raw_data.loc[selected, attributes]
+        if df.empty:
+            return pd.DataFrame()
+        return df.resample(f"{time_step_seconds}s").mean(numeric_only=True)
+
+    connection._query_timeseries_from_database = query_timeseries
+    return connection
+
+
+def _query_window(connection: FiwareConnection, now: pd.Timestamp, cached: bool):
+    """
+    Function to query the window before `now` with or without the cache
+    """
+    query = (
+        connection._query_timeseries_with_window_cache
+        if cached
+        else connection._query_timeseries_from_database
+    )
+    return query(
+        entity=ContextEntity(id="sensor", type="Sensor"),
+        attributes=["temperature"],
+        from_date=(now - WINDOW).strftime("%Y-%m-%dT%H:%M:%S%z"),
+        to_date=now.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        time_step_seconds=TIME_STEP_SECONDS,
+    )
+
+
+def test_window_cache_matches_full_query_for_quiet_sensor():
+    """
+    The sensor sends values for 15 minutes and is quiet afterwards, \
+        so that the last cached time step becomes the start of the window.
+    """
+    start = pd.Timestamp("2025-01-01T00:00:00Z")
+    index = pd.date_range(start, start + pd.Timedelta(minutes=15), freq="20s")
+    raw_data = pd.DataFrame(
+        {"temperature": [float(value) for value in range(len(index))]}, index=index
+    )
+    connection = _get_connection(raw_data=raw_data)
+
+    now = start + pd.Timedelta(minutes=5)
+    while now <= start + pd.Timedelta(minutes=40):
+        number_of_queries = len(connection.queries)
+        df_cached = _query_window(connection=connection, now=now, cached=True)
+        assert len(connection.queries) == number_of_queries + 1
+        df_full = _query_window(connection=connection, now=now, cached=False)
+        if df_full.empty or df_full.first_valid_index() is None:
+            assert df_cached.empty
+        else:
+            df_full = df_full.loc[df_full.first_valid_index() : df_full.last_valid_index()]
+            pdt.assert_frame_equal(df_cached, df_full, check_freq=False)
+        now += pd.Timedelta(seconds=30)
+
+
+def test_window_cache_excludes_the_cached_time_steps():
+    """
+    After the first query, only the first time step of the window \
+        and the time steps since the last cached one are queried.
+    """
+    start = pd.Timestamp("2025-01-01T00:00:00Z")
+    index = pd.date_range(start, start + pd.Timedelta(minutes=30), freq="10s")
+    raw_data = pd.DataFrame(
+        {"temperature": [float(value) for value in range(len(index))]}, index=index
+    )
+    connection = _get_connection(raw_data=raw_data)
+
+    now = start + pd.Timedelta(minutes=15, seconds=30)
+    _query_window(connection=connection, now=now, cached=True)
+    now += pd.Timedelta(minutes=2)
+    df_cached = _query_window(connection=connection, now=now, cached=True)
+
+    assert connection.queries[0][2] is None
+    assert connection.queries[1][2] == (
+        "2025-01-01T00:08:00+0000",
+        "2025-01-01T00:15:00+0000",
+    )
+    df_full = _query_window(connection=connection, now=now, cached=False)
+    pdt.assert_frame_equal(df_cached, df_full, check_freq=False)